@@ -1,6 +1,37 @@
+from collections import namedtuple
 from typing import Any
 
 
+class AssertionFailed(AssertionError):
+    """
+    An `AssertionError` that also carries the actual value that failed the assertion.
+    """
+
+    def __init__(self, message: str, actual: Any = None) -> None:
+        super().__init__(message)
+        self.actual = actual
+
+
+class AssertionFailure(namedtuple('AssertionFailure', ['assertion', 'json_path', 'expected', 'actual', 'message'])):
+    """
+    A failed assertion of a use case, it reads as its error message.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_error(cls, assertion: Any, error: AssertionError) -> 'AssertionFailure':
+        return cls(
+            type(assertion).__name__,
+            getattr(assertion, 'json_path', None),
+            getattr(assertion, 'expected', None),
+            getattr(error, 'actual', None),
+            str(error),
+        )
+
+    def __str__(self) -> str:
+        return self.message
+
+
 class Assertion:
 
     _name = 'Assertion'
@@ -9,6 +40,10 @@ class Assertion:
     def __call__(self, *args: Any, **kwds: Any) -> Any:
         pass
 
+    @property
+    def expected(self) -> Any:
+        return getattr(self, 'expected_value', None)
+
 
 class AssertEqual(Assertion):
 
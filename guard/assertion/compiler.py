@@ -0,0 +1,120 @@
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from requests.models import Response
+from jsonpath_rw import JSONPath
+from guard.assertion.bases import AssertionFailed, AssertionFailure
+from guard.assertion.http import AssertHttpResponseJsonPath, get_json_path_value
+
+
+# The compiled assertion lists in use, keyed by the ids of their assertions.
+# An entry lives as long as a use case holds its checker, the checker keeps the assertions, hence their ids, alive.
+_compiled_assertions: 'weakref.WeakValueDictionary[Tuple[int, ...], CompiledAssertions]' = weakref.WeakValueDictionary()
+_compiled_assertions_lock = threading.Lock()
+
+
+class CompiledAssertions:
+    """
+    A list of assertions merged into a single checker.
+
+    Assertions on the same JSONPath share one lookup per response, and the lookups
+    are only done when an assertion needs them. Every assertion is checked and
+    all the failures are collected as `AssertionFailure` records, not only the first one.
+
+    A response body can only be streamed once, so the assertions in stream mode are checked last,
+    and the body is only streamed when a single assertion reads it. Otherwise it is downloaded
+    and the assertions in stream mode read it from memory.
+
+    Args:
+        assertions (Iterable): The assertions, called in order.
+
+    Examples:
+        >>> from guard.assertion.compiler import compile_assertions
+        >>> from guard.assertion.http import AssertHttpStatusCodeEqual, AssertHttpResponseValue
+        >>> checker = compile_assertions([AssertHttpStatusCodeEqual(200), AssertHttpResponseValue('$.id', '==', 1)])
+        >>> [str(failure) for failure in checker(response)]
+        ['Assertion failed: invalid status code. Expected 200, but got 404.']
+    """
+
+    def __init__(self, assertions: Iterable[Any]) -> None:
+        self.assertions = tuple(assertions)
+        self.json_paths: Dict[str, JSONPath] = {}
+        self._steps: List[Tuple[Any, Optional[str], Callable]] = []
+        stream_steps = []
+        for assertion in self.assertions:
+            if getattr(assertion, 'stream', False):
+                stream_steps.append((assertion, None, _stream_check(assertion)))
+            elif isinstance(assertion, AssertHttpResponseJsonPath):
+                self.json_paths.setdefault(assertion.json_path, assertion.json_path_expr)
+                self._steps.append((assertion, assertion.json_path, assertion.check_value))
+            else:
+                self._steps.append((assertion, None, assertion))
+        self._steps.extend(stream_steps)
+
+        # Whether the response body is streamed to the assertions instead of being downloaded first.
+        self.stream = len(stream_steps) == 1 and not self.json_paths
+
+    def __call__(self, response: Response, fail_fast: bool = False) -> List[AssertionFailure]:
+        """
+        This method is used to check the response.
+
+        Args:
+            response (Response): The response.
+            fail_fast (bool, optional): Stop at the first failure. Defaults to False.
+
+        Returns:
+            list: The `AssertionFailure` of the failed assertions, empty if all of them passed.
+        """
+        failures = []
+        values: Dict[str, Any] = {}
+        invalid_json = False
+        for assertion, json_path, check in self._steps:
+            try:
+                if json_path is None:
+                    check(response)
+                    continue
+                # An invalid JSON body fails every lookup the same way, it is reported once.
+                if invalid_json:
+                    continue
+                if json_path not in values:
+                    try:
+                        values[json_path] = get_json_path_value(response, self.json_paths[json_path])
+                    except AssertionError:
+                        invalid_json = True
+                        raise
+                check(values[json_path], response)
+            except AssertionError as e:
+                failures.append(AssertionFailure.from_error(assertion, e))
+                if fail_fast:
+                    break
+        return failures
+
+
+def _stream_check(assertion: Any) -> Callable[[Response], Any]:
+    """
+    This function is used to check `assertion` in stream mode, a body that cannot be read is reported as a failure.
+    """
+    def check(response: Response) -> Any:
+        try:
+            return assertion(response)
+        except AssertionError:
+            raise
+        except (RuntimeError, ValueError, OSError) as e:
+            raise AssertionFailed(f'Assertion failed: the response body could not be streamed, {e}') from e
+    return check
+
+
+def compile_assertions(assertions: Iterable[Any]) -> CompiledAssertions:
+    """
+    This function is used to compile a list of assertions into a `CompiledAssertions`.
+
+    Use cases sharing the same assertion objects, e.g. the ones generated by `UseCaseFaker`,
+    share one compiled checker while any of them holds it. Assertions are compared by identity,
+    they do not have to be hashable.
+    """
+    assertions = tuple(assertions)
+    key = tuple(id(assertion) for assertion in assertions)
+    with _compiled_assertions_lock:
+        if (checker := _compiled_assertions.get(key)) is None:
+            checker = _compiled_assertions[key] = CompiledAssertions(assertions)
+    return checker
@@ -1,24 +1,63 @@
-from typing import Any
+from typing import Any, List, Union
 from requests.models import Response
-from guard.assertion.bases import Assertion
+from guard.assertion.bases import Assertion, AssertionFailed
 from requests.exceptions import JSONDecodeError
-from jsonpath_rw import parse
-from guard.assertion.operator import operator_map, operator_range_map
-from guard.http.hooks import show_response_table
+from jsonpath_rw import JSONPath
+from guard.assertion.operator import operator_map, operator_range_map, extract_column, find_failed_indices
+from guard.assertion.stream import JsonStreamReader, open_stream, parse_stream_path
 from guard.logger import logger
+from guard.utils import compile_json_path, show_data_table
 
 
-def get_json_path_value(response: Response, json_path: str) -> Any:
+# The number of failed items quoted in the error message of list assertions.
+MAX_QUOTED_ITEMS = 5
+
+
+def describe_failed_items(indices: List[int], values: List[Any], size: int) -> str:
+    quoted = ', '.join(f'[{index}] {values[index]!r}' for index in indices[:MAX_QUOTED_ITEMS])
+    more = ', ...' if len(indices) > MAX_QUOTED_ITEMS else ''
+    return f'{len(indices)} of {size} items failed: {quoted}{more}'
+
+
+def describe_streamed_failure(operator_range: str, index: int, reader: JsonStreamReader) -> str:
+    if operator_range == 'all':
+        return f'Item [{index}] failed: {reader.last!r}'
+    return f'All {reader.count} items failed'
+
+
+def get_json_path_value(response: Response, json_path: Union[str, JSONPath]) -> Any:
     try:
         data = response.json()
     except JSONDecodeError as e:
         raise AssertionError('Assertion failed: invalid JSON response.') from e
 
-    json_path_parser = parse(json_path)
+    json_path_parser = compile_json_path(json_path)
 
     return match[0].value if (match := json_path_parser.find(data)) else None
 
 
+class AssertHttpResponseJsonPath(Assertion):
+    """
+    The base of the assertions on the value found at a JSONPath of the response.
+
+    `__call__` looks the value up and passes it to `check_value`, so callers that have
+    looked it up already, e.g. `guard.assertion.compiler.CompiledAssertions`, call `check_value` directly.
+    Assertions in stream mode read the body themselves and have no `check_value`.
+    """
+
+    stream: bool = False
+
+    def __init__(self, json_path: str) -> None:
+        self.json_path = json_path
+        self.json_path_expr = compile_json_path(json_path)
+
+    def __call__(self, response: Response) -> Any:
+        return self.check_value(get_json_path_value(response, self.json_path_expr), response)
+
+    def check_value(self, value: Any, response: Response) -> Any:
+        raise NotImplementedError
+
+
 class AssertHttpStatusCodeEqual(Assertion):
     """
     Assert HTTP status code equal.
@@ -39,15 +78,19 @@ class AssertHttpStatusCodeEqual(Assertion):
     def __init__(self, expected_status_code: int) -> None:
         self.expected_status_code = expected_status_code
 
+    @property
+    def expected(self) -> int:
+        return self.expected_status_code
+
     def __call__(self, response) -> None:
         if response.status_code != self.expected_status_code:
-            raise AssertionError(self._error_message.format(
+            raise AssertionFailed(self._error_message.format(
                 expected_status_code=self.expected_status_code,
                 code=response.status_code
-            ))
+            ), response.status_code)
 
 
-class AssertHttpResponseValue(Assertion):
+class AssertHttpResponseValue(AssertHttpResponseJsonPath):
 
     """
     Assert HTTP response value.
@@ -71,20 +114,20 @@ class AssertHttpResponseValue(Assertion):
 
     """
     def __init__(self, json_path: str, operator, expected_value: Any) -> None:
-        self.json_path = json_path
+        super().__init__(json_path)
         self.expected_value = expected_value
         self.operator = operator
+        self.operator_func = operator_map.get(operator)
 
-    def __call__(self, response: Response) -> Any:
-        value = get_json_path_value(response, self.json_path)
-        if self.operator not in operator_map:
+    def check_value(self, value: Any, response: Response) -> Any:
+        if self.operator_func is None:
             raise KeyError(f'Operator {self.operator} is not supported.')
 
-        if not operator_map[self.operator](value, self.expected_value):
-            raise AssertionError(f'Assertion failed: {value} {self.operator} {self.expected_value} is False.')
+        if not self.operator_func(value, self.expected_value):
+            raise AssertionFailed(f'Assertion failed: {value} {self.operator} {self.expected_value} is False.', value)
 
 
-class AssertHttpResponseListItem(Assertion):
+class AssertHttpResponseListItem(AssertHttpResponseJsonPath):
 
     def __init__(
         self,
@@ -92,24 +135,42 @@ class AssertHttpResponseListItem(Assertion):
         operator_range: str,
         operator: str,
         expected_value: int,
+        stream: bool = False,
     ) -> None:
-        self.json_path = json_path
+        super().__init__(json_path)
         self.expected_value = expected_value
         assert operator_range in operator_range_map, f'Operator range {operator_range} is not supported.'
         self.operator_range = operator_range
         assert operator in operator_map, f'Operator {operator} is not supported.'
         self.operator = operator
+        self.stream = stream
+        self.stream_keys = parse_stream_path(json_path) if stream else None
 
     def __call__(self, response: Response) -> Any:
-        value = get_json_path_value(response, self.json_path)
-        if self.operator not in operator_map:
-            raise KeyError(f'Operator {self.operator} is not supported.')
-
-        if not operator_range_map[self.operator_range](self.expected_value, self.operator, value):
-            raise AssertionError(f'Assertion failed: {self.operator_range} {value} {self.operator} {self.expected_value} is False.')
-
-
-class AssertHttpResponseListDict(Assertion):
+        if self.stream:
+            return self._check_stream(response)
+        return super().__call__(response)
+
+    def check_value(self, value: Any, response: Response) -> Any:
+        if failed := find_failed_indices(self.operator_range, self.operator, self.expected_value, value):
+            raise AssertionFailed(
+                f'Assertion failed: {self.operator_range} {self.operator} {self.expected_value} is False, '
+                f'{describe_failed_items(failed, value, len(value))}.',
+                [value[index] for index in failed[:MAX_QUOTED_ITEMS]],
+            )
+
+    def _check_stream(self, response: Response) -> None:
+        with open_stream(response) as reader:
+            items = reader.iter_items(self.stream_keys)
+            if failed := find_failed_indices(self.operator_range, self.operator, self.expected_value, items, limit=1):
+                raise AssertionFailed(
+                    f'Assertion failed: {self.operator_range} {self.operator} {self.expected_value} is False. '
+                    f'{describe_streamed_failure(self.operator_range, failed[0], reader)}.',
+                    [reader.last],
+                )
+
+
+class AssertHttpResponseListDict(AssertHttpResponseJsonPath):
 
     def __init__(
         self,
@@ -121,11 +182,12 @@ class AssertHttpResponseListDict(Assertion):
         allow_empty: bool = True,
         show_table: bool = True,
         assert_value_hook: callable = None,
-        assert_value_hook_kwargs: dict = None
+        assert_value_hook_kwargs: dict = None,
+        stream: bool = False,
     ) -> None:
         if assert_value_hook_kwargs is None:
             assert_value_hook_kwargs = {}
-        self.json_path = json_path
+        super().__init__(json_path)
         self.expected_value = expected_value
         assert operator_range in operator_range_map, f'Operator range {operator_range} is not supported.'
         self.operator_range = operator_range
@@ -136,10 +198,20 @@ class AssertHttpResponseListDict(Assertion):
         self.allow_empty = allow_empty
         self.assert_value_hook = assert_value_hook
         self.assert_value_hook_kwargs = assert_value_hook_kwargs
+        self.stream = stream
+        self.stream_keys = parse_stream_path(json_path) if stream else None
+
+    @property
+    def error_message(self) -> str:
+        return f'Assertion failed: {self.operator_range} `{self.key}` {self.operator} `{self.expected_value}` is False.'
 
     def __call__(self, response: Response) -> Any:
-        data = get_json_path_value(response, self.json_path)
-        error_message = f'Assertion failed: {self.operator_range} `{self.key}` {self.operator} `{self.expected_value}` is False.'
+        if self.stream:
+            return self._check_stream(response)
+        return super().__call__(response)
+
+    def check_value(self, data: Any, response: Response) -> Any:
+        error_message = self.error_message
 
         if not data:
             if self.allow_empty:
@@ -147,15 +219,50 @@ class AssertHttpResponseListDict(Assertion):
             logger.error(error_message)
             logger.error(f'Response data is empty: {response.text}')
             print(response.url)
-            raise AssertionError(error_message)
+            raise AssertionFailed(error_message, data)
 
-        value = [item.get(self.key) for item in data]
+        value = extract_column(data, self.key, self.assert_value_hook, **self.assert_value_hook_kwargs)
 
-        if self.assert_value_hook:
-            value = [self.assert_value_hook(item, **self.assert_value_hook_kwargs) for item in value]
-
-        if not operator_range_map[self.operator_range](self.expected_value, self.operator, value):
+        # Without a table only the first failed item matters.
+        failed = find_failed_indices(
+            self.operator_range, self.operator, self.expected_value, value,
+            limit=None if self.show_table else 1,
+        )
+        if failed:
             if self.show_table:
                 logger.error(error_message)
-                show_response_table(response, self.json_path, only_keys=[self.key])
-            raise AssertionError(error_message)
+                # Only the offending items are shown.
+                show_data_table(
+                    [data[index] for index in failed],
+                    f'{response.request.method} {response.request.url}',
+                    only_keys=[self.key],
+                )
+                error_message = f'{error_message} {len(failed)} of {len(data)} items failed.'
+            raise AssertionFailed(error_message, [data[index].get(self.key) for index in failed[:MAX_QUOTED_ITEMS]])
+
+    def _check_stream(self, response: Response) -> None:
+        error_message = self.error_message
+        with open_stream(response) as reader:
+            value = extract_column(reader.iter_items(self.stream_keys), self.key, self.assert_value_hook, **self.assert_value_hook_kwargs)
+            # Stops reading the body at the first failed item.
+            failed = find_failed_indices(self.operator_range, self.operator, self.expected_value, value, limit=1)
+
+        if not reader.count:
+            if self.allow_empty:
+                return
+            logger.error(error_message)
+            logger.error(f'Response data is empty: {response.url}')
+            raise AssertionFailed(error_message, [])
+
+        if failed:
+            if self.show_table and self.operator_range == 'all':
+                logger.error(error_message)
+                show_data_table(
+                    [reader.last],
+                    f'{response.request.method} {response.request.url}',
+                    only_keys=[self.key],
+                )
+            raise AssertionFailed(
+                f'{error_message} {describe_streamed_failure(self.operator_range, failed[0], reader)}.',
+                [reader.last.get(self.key)],
+            )
@@ -1,3 +1,9 @@
+import operator as _operator
+from functools import partial
+from itertools import compress, count, islice, repeat
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+
 operator_map = {
     '==': lambda x, y: x == y,
     '!=': lambda x, y: x != y,
@@ -13,7 +19,84 @@ operator_map = {
     'contains': lambda x, y: y in x,
 }
 
+
+def _membership(values: Iterable[Any], expected: Any) -> Iterator[bool]:
+    return map(expected.__contains__, values)
+
+
+def _between(values: Iterable[Any], expected: Sequence[Any]) -> Iterator[bool]:
+    low, high = expected
+    return (low <= value <= high for value in values)
+
+
+# The batch counterparts of `operator_map`, they compare every value with the expected value.
+# The comparisons are mapped over the values with the C functions of the `operator` module,
+# without a Python call per value.
+batch_operator_map = {
+    '==': lambda values, expected: map(_operator.eq, values, repeat(expected)),
+    '!=': lambda values, expected: map(_operator.ne, values, repeat(expected)),
+    '>': lambda values, expected: map(_operator.gt, values, repeat(expected)),
+    '<': lambda values, expected: map(_operator.lt, values, repeat(expected)),
+    '>=': lambda values, expected: map(_operator.ge, values, repeat(expected)),
+    '<=': lambda values, expected: map(_operator.le, values, repeat(expected)),
+    'in': _membership,
+    'not in': lambda values, expected: map(_operator.not_, _membership(values, expected)),
+    'is': lambda values, expected: map(_operator.is_, values, repeat(expected)),
+    'is not': lambda values, expected: map(_operator.is_not, values, repeat(expected)),
+    'between': _between,
+    'contains': lambda values, expected: map(_operator.contains, values, repeat(expected)),
+}
+
+
+def extract_column(data: Iterable[Mapping], key: str, hook: Optional[Callable] = None, **hook_kwargs: Any) -> Iterator[Any]:
+    """
+    This function is used to lazily get the value of `key` in every item of `data`,
+    passed through `hook` if any. Values are only extracted as far as they are compared.
+    Items may be any `Mapping`, not only dicts.
+    """
+    values = map(_operator.methodcaller('get', key), data)
+    if hook is not None:
+        values = map(partial(hook, **hook_kwargs) if hook_kwargs else hook, values)
+    return values
+
+
+def find_failed_indices(
+    operator_range: str,
+    operator: str,
+    expected_value: Any,
+    values: Iterable[Any],
+    limit: Optional[int] = None,
+) -> List[int]:
+    """
+    This function is used to check `values` against the expected value in one batch.
+
+    Args:
+        operator_range (str): `all` or `any`.
+        operator (str): The operator, a key of `operator_map`.
+        expected_value (Any): The expected value.
+        values (Iterable): The values, e.g. from `extract_column`. Iterators are consumed
+            only as far as the check goes and are never turned into lists.
+        limit (int, optional): Stop after finding this many failed values. Defaults to None, find all of them.
+
+    Returns:
+        list: The indices of the failed values, empty if the check passed.
+            With `any`, every value failed or none did.
+    """
+    assert operator_range in operator_range_map, f'Operator range {operator_range} is not supported.'
+    assert operator in batch_operator_map, f'Operator {operator} is not supported.'
+    if operator_range == 'all':
+        results = batch_operator_map[operator](values, expected_value)
+        return list(islice(compress(count(), map(_operator.not_, results)), limit))
+
+    # Stops at the first passed value, `counter` ends up at the number of values read.
+    counter = count()
+    values = map(_operator.itemgetter(0), zip(values, counter))
+    if any(batch_operator_map[operator](values, expected_value)):
+        return []
+    return list(islice(range(next(counter)), limit))
+
+
 operator_range_map = {
-    'all': lambda x, operator, _list: all(operator_map[operator](y, x) for y in _list),
-    'any': lambda x, operator, _list: any(operator_map[operator](y, x) for y in _list),
+    'all': lambda x, operator, _list: not find_failed_indices('all', operator, x, _list, limit=1),
+    'any': lambda x, operator, _list: not find_failed_indices('any', operator, x, _list, limit=1),
 }
@@ -0,0 +1,228 @@
+import codecs
+import contextlib
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional
+from requests.models import Response
+
+
+# The size of the chunks read from streamed responses.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_CONTAINER_SPECIAL = re.compile(r'["\[\]{}]')
+_SCALAR_END = re.compile(r'[ \t\n\r,\]}]')
+_STREAM_PATH = re.compile(r'^\$((?:\.[A-Za-z_][\w-]*)*)(\[\*\])?$')
+
+
+def parse_stream_path(json_path: str) -> List[str]:
+    """
+    This function is used to get the keys leading to the list targeted by `json_path`.
+
+    Only paths made of plain keys are supported by streaming assertions,
+    e.g. `$`, `$.results`, `$.data.items[*]`.
+    """
+    if not (match := _STREAM_PATH.match(json_path)):
+        raise ValueError(f'JSONPath {json_path} is not supported in stream mode, only `$.key.key[*]` paths are.')
+    return [key for key in match.group(1).split('.') if key]
+
+
+class JsonStreamReader:
+    """
+    An incremental reader of the items of a list nested in a JSON document.
+
+    The document is read chunk by chunk and every item is decoded on its own as soon as
+    it is complete, so memory use is bounded by the size of the largest item, never the
+    whole document. Values of other keys on the way to the list are scanned and dropped
+    as they are read, without being decoded.
+
+    Args:
+        chunks (Iterable[bytes]): The chunks of the document.
+        encoding (str, optional): The encoding of the document. Defaults to utf-8.
+
+    Attributes:
+        count (int): The number of items read so far.
+        last (Any): The last item read.
+
+    Examples:
+        >>> from guard.assertion.stream import JsonStreamReader
+        >>> reader = JsonStreamReader([b'{"results": [{"id"', b': 1}, {"id": 2}]}'])
+        >>> list(reader.iter_items(['results']))
+        [{'id': 1}, {'id': 2}]
+    """
+
+    def __init__(self, chunks: Iterable[bytes], encoding: Optional[str] = None) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding or 'utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self.count = 0
+        self.last = None
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        # Drop what has been read already.
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        for chunk in self._chunks:
+            if text := self._decoder.decode(chunk):
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._eof = True
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f'Expecting one of {chars!r}', self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    def _more(self, index: int, skip: bool) -> Optional[int]:
+        """
+        Read the next chunk while scanning a value at `index` of the buffer, and return the index in the new buffer,
+        None at the end of the document. With `skip`, what has been scanned so far is dropped.
+        """
+        if skip:
+            self._pos = index
+        pos = self._pos
+        if not self._fill():
+            return None
+        return index - pos
+
+    def _scan_value(self, skip: bool) -> int:
+        """
+        Find the end of the value at the current position without decoding it, every char is looked at once.
+        """
+        if not self._peek():
+            raise json.JSONDecodeError('Expecting value', self._buffer, self._pos)
+
+        index = self._pos
+        if self._buffer[index] not in '{["':
+            # A scalar ends at the next delimiter, or with the document.
+            while (match := _SCALAR_END.search(self._buffer, index)) is None:
+                if (index := self._more(len(self._buffer), skip)) is None:
+                    return len(self._buffer)
+            return match.start()
+
+        depth = 0
+        in_string = False
+        while True:
+            match = (_STRING_SPECIAL if in_string else _CONTAINER_SPECIAL).search(self._buffer, index)
+            if match is None:
+                if (index := self._more(len(self._buffer), skip)) is None:
+                    raise json.JSONDecodeError('Unterminated value', self._buffer, self._pos)
+                continue
+
+            char = match.group()
+            index = match.end()
+            if in_string:
+                if char == '\\':
+                    # The escaped char may be in the next chunk.
+                    while index >= len(self._buffer):
+                        if (index := self._more(index, skip)) is None:
+                            raise json.JSONDecodeError('Unterminated string', self._buffer, self._pos)
+                    index += 1
+                    continue
+                in_string = False
+            elif char == '"':
+                in_string = True
+                continue
+            elif char in '[{':
+                depth += 1
+            else:
+                depth -= 1
+
+            if depth == 0:
+                return index
+
+    def _skip_value(self) -> None:
+        self._pos = self._scan_value(skip=True)
+
+    def _read_value(self) -> Any:
+        self._peek()
+        try:
+            value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            end = None
+        # A value cut by the end of the chunk, e.g. a number that could go on in the next one,
+        # is scanned to its end before being decoded again, so it is decoded twice at most.
+        if end is None or not (self._eof and end == len(self._buffer) or _SCALAR_END.match(self._buffer, end)):
+            self._scan_value(skip=False)
+            value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+        self._pos = end
+        return value
+
+    def _find(self, keys: List[str]) -> bool:
+        for key in keys:
+            if self._peek() != '{':
+                return False
+            self._expect('{')
+            while True:
+                if self._peek() == '}':
+                    return False
+                if self._read_value() == key:
+                    self._expect(':')
+                    break
+                self._expect(':')
+                self._skip_value()
+                if self._expect(',}') == '}':
+                    return False
+        return True
+
+    def iter_items(self, keys: List[str]) -> Iterator[Any]:
+        """
+        This method is used to iterate over the items of the list found under `keys`.
+        Nothing is yielded when there is no such list.
+        """
+        if not self._find(keys) or self._peek() != '[':
+            return
+
+        self._expect('[')
+        if self._peek() == ']':
+            return
+        while True:
+            self.last = self._read_value()
+            self.count += 1
+            yield self.last
+            if self._expect(',]') == ']':
+                return
+
+
+@contextlib.contextmanager
+def open_stream(response: Response):
+    """
+    A `JsonStreamReader` of the body of `response`.
+
+    The body of a response sent with `stream=True` is downloaded as it is read,
+    and what is left of it is dropped when the context exits, e.g. on the first failed item.
+    The body can only be streamed once, a body downloaded already is read from memory as many times as needed.
+    """
+    if getattr(response, '_streamed', False):
+        raise RuntimeError('The body of this response has already been streamed, it can only be streamed once.')
+
+    if response._content is not False:
+        yield JsonStreamReader(response.iter_content(STREAM_CHUNK_SIZE), response.encoding)
+        return
+
+    response._streamed = True
+    try:
+        yield JsonStreamReader(response.iter_content(STREAM_CHUNK_SIZE), response.encoding)
+    finally:
+        response.close()
+        if response._content is False:
+            # The body is gone, reports get an empty body rather than an error.
+            response._content = b''
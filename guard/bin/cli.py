@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import click
 import os
 from guard.bin.runner import Runner
+from guard.usecase.unit import RESPONSE_RETENTION_POLICIES
 
 
 @click.group()
@@ -9,15 +10,135 @@ def runner_cli():
     pass
 
 
+def parse_shard(ctx, param, value: Optional[str]) -> Optional[Tuple[int, int]]:
+    if value is None:
+        return None
+    try:
+        index, total = (int(item) for item in value.split('/'))
+    except ValueError as e:
+        raise click.BadParameter('shard must be `i/N`, e.g. `1/4`.') from e
+    if not 1 <= index <= total:
+        raise click.BadParameter('shard index must be between 1 and N.')
+    return index, total
+
+
+def parse_weights(ctx, param, values: Tuple[str, ...]) -> Dict[str, float]:
+    weights = {}
+    for value in values:
+        key, _, weight = value.rpartition('=')
+        try:
+            weights[key.strip()] = float(weight)
+        except ValueError as e:
+            raise click.BadParameter('weight must be `METHOD /endpoint=weight`, e.g. `GET /users/{id}=3`.') from e
+    return weights
+
+
 @runner_cli.command()
 @click.option('--root_path', '-d', help='Test root directory')
 @click.option('--exclude', '-e', help='Exclude test directory')
 @click.option('--prefix', '-p', help='Test case prefix')
+@click.option('--workers', '-w', type=click.IntRange(min=1), default=1, help='Number of cases executed concurrently')
+@click.option('--async', 'use_async', is_flag=True, help='Execute cases on an asyncio event loop')
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=100, help='Maximum requests in flight with --async')
+@click.option('--shard', callback=parse_shard, help='Only run the shard `i/N` of the cases, e.g. `1/4`')
+@click.option('--processes', '-P', type=click.IntRange(min=1), default=1, help='Number of worker processes')
+@click.option('--fail-fast', 'fail_fast', is_flag=True, help='Stop checking a case at its first failed assertion')
+@click.option('--exhaustive', 'exhaustive', is_flag=True, help='Check every assertion of a case and report all the failures')
+@click.option('--failures-file', 'failures_file', help='JSON Lines file failed cases are written to as they finish')
+@click.option(
+    '--keep-responses', 'keep_responses', type=click.Choice(RESPONSE_RETENTION_POLICIES),
+    help='What is kept of the responses once evaluated, defaults to `all`',
+)
+@click.option('--junit-xml', 'junit_xml', help='JUnit XML report every case is written to as it finishes')
+@click.option('--json-lines', 'json_lines', help='JSON Lines report every case is written to as it finishes')
 def run(
     root_path: Optional[str] = None,
     exclude: Optional[str] = None,
     prefix: Optional[str] = None,
+    workers: int = 1,
+    use_async: bool = False,
+    concurrency: int = 100,
+    shard: Optional[Tuple[int, int]] = None,
+    processes: int = 1,
+    fail_fast: bool = False,
+    exhaustive: bool = False,
+    failures_file: Optional[str] = None,
+    keep_responses: Optional[str] = None,
+    junit_xml: Optional[str] = None,
+    json_lines: Optional[str] = None,
 ):  # sourcery skip: avoid-builtin-shadow
     if root_path is None:
         root_path = os.getcwd()
-    Runner(root_path=root_path, prefix=prefix).run()
+    Runner(
+        root_path=root_path,
+        prefix=prefix,
+        workers=workers,
+        use_async=use_async,
+        concurrency=concurrency,
+        shard=shard,
+        processes=processes,
+        fail_fast=fail_fast,
+        exhaustive=exhaustive,
+        failures_file=failures_file,
+        keep_responses=keep_responses,
+        junit_xml=junit_xml,
+        json_lines=json_lines,
+    ).run()
+
+
+@runner_cli.command()
+@click.option('--root_path', '-d', help='Test root directory')
+@click.option('--prefix', '-p', help='Test case prefix')
+@click.option('--duration', '-t', type=click.FloatRange(min=0, min_open=True), default=60, help='Seconds recorded')
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=10, help='Number of workers sending requests')
+@click.option('--rps', type=click.FloatRange(min=0, min_open=True), help='Target requests per second, as fast as possible if not set')
+@click.option('--warmup', type=click.FloatRange(min=0), default=0, help='Seconds run before recording')
+@click.option('--ramp-up', 'ramp_up', type=click.FloatRange(min=0), default=0, help='Seconds the load grows for')
+@click.option(
+    '--weight', 'weights', multiple=True, callback=parse_weights,
+    help='Weight of an endpoint, e.g. `GET /users/{id}=3`, may be repeated',
+)
+@click.option('--sample-rate', 'sample_rate', type=click.FloatRange(0, 1), default=0, help='Fraction of the responses checked against the assertions')
+@click.option('--seed', type=int, help='Seed of the random picks')
+@click.option('--open-loop', 'open_loop', is_flag=True, help='Send on schedule regardless of the responses, requires --rps')
+@click.option(
+    '--arrival', type=click.Choice(('fixed', 'poisson')), default='fixed',
+    help='Schedule of the requests with --rps, defaults to `fixed`',
+)
+@click.option('--processes', '-P', type=click.IntRange(min=1), default=1, help='Number of processes sending requests')
+def load(
+    root_path: Optional[str] = None,
+    prefix: Optional[str] = None,
+    duration: float = 60,
+    concurrency: int = 10,
+    rps: Optional[float] = None,
+    warmup: float = 0,
+    ramp_up: float = 0,
+    weights: Optional[Dict[str, float]] = None,
+    sample_rate: float = 0,
+    seed: Optional[int] = None,
+    open_loop: bool = False,
+    arrival: str = 'fixed',
+    processes: int = 1,
+):
+    from guard.bin.load import LoadRunner
+
+    if open_loop and rps is None:
+        raise click.UsageError('--open-loop requires --rps.')
+    if root_path is None:
+        root_path = os.getcwd()
+    LoadRunner(
+        root_path=root_path,
+        prefix=prefix,
+        duration=duration,
+        concurrency=concurrency,
+        rps=rps,
+        warmup=warmup,
+        ramp_up=ramp_up,
+        weights=weights,
+        sample_rate=sample_rate,
+        seed=seed,
+        open_loop=open_loop,
+        arrival=arrival,
+        processes=processes,
+    ).run()
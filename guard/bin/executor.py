@@ -0,0 +1,158 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+from guard.http.client import HttpClient
+from guard.http.registry import session_registry
+from guard.usecase.bases import UseCase
+from guard.usecase.scheduler import CaseScheduler
+from guard.usecase.suitus import LazyUseCaseSuite
+
+
+class CaseExecutor:
+    """
+    A class to execute test cases with a bounded pool of worker threads.
+
+    Cases are put on the work queue of the pool as soon as all the cases
+    they depend on have finished, and are picked up by the first free worker.
+    Every worker gets its own HTTP session configured like `client` from the
+    session registry, so connection pools and cookies are never shared between
+    threads, while the authentication is.
+    The executed cases are returned in the order they were submitted,
+    whatever order they finished in.
+
+    The cases of a `LazyUseCaseSuite` are generated as workers become free and are
+    never more than the workers, they are passed to `on_done` one by one instead of the suite.
+
+    Args:
+        client (HttpClient): The client used as a template for the worker sessions.
+        workers (int, optional): The number of worker threads. Defaults to 1.
+        on_done (callable, optional): Called with every case as soon as it has finished,
+            always from the thread calling `execute`.
+        exhaustive (bool, optional): Whether to check every assertion of the cases that do not set it,
+            see `UnitUseCase.check_assertions`. Defaults to None.
+
+    Examples:
+        >>> from guard.bin.executor import CaseExecutor
+        >>> from guard.http.client import HttpClient
+        >>> cases = CaseExecutor(HttpClient(), workers=8).execute(cases)
+    """
+
+    def __init__(
+        self,
+        client: HttpClient,
+        workers: int = 1,
+        on_done: Optional[Callable[[UseCase], None]] = None,
+        exhaustive: Optional[bool] = None,
+    ) -> None:
+        assert workers >= 1, '`workers` must be greater than or equal to 1.'
+        self.client = client
+        self.workers = workers
+        self.on_done = on_done
+        self.exhaustive = exhaustive
+        self._lock = threading.Lock()
+        self._workers: Set[int] = set()
+
+    def get_client(self) -> HttpClient:
+        """
+        This method is used to get the session of the current worker.
+        """
+        if self.workers == 1:
+            return self.client
+
+        worker = threading.get_ident()
+        with self._lock:
+            self._workers.add(worker)
+        return session_registry.get_worker_session(self.client, worker)
+
+    def execute_case(self, case: UseCase) -> UseCase:
+        """
+        This method is used to execute a single case with the session of the current worker.
+        """
+        case.execute(self.get_client(), self.exhaustive)
+        return case
+
+    def execute(self, cases: Iterable[UseCase]) -> List[UseCase]:
+        """
+        This method is used to execute the cases and return them in submission order.
+        """
+        cases = list(cases)
+        scheduler = CaseScheduler(cases)
+        if self.workers == 1:
+            for index in scheduler.static_order():
+                if isinstance(cases[index], LazyUseCaseSuite):
+                    self.execute_lazy_suite(cases[index])
+                    continue
+                self.execute_case(cases[index])
+                self._done(cases[index])
+            return cases
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='guard-worker')
+        pending = {}
+        # The expanded lazy suites by index, with their cases still to generate and their cases in flight.
+        streams: Dict[int, Optional[Iterator[UseCase]]] = {}
+        running: Dict[int, int] = {}
+        try:
+            scheduler.prepare()
+            while scheduler.is_active():
+                for index in scheduler.get_ready():
+                    if isinstance(cases[index], LazyUseCaseSuite):
+                        cases[index].execute_pre_hooks()
+                        streams[index] = cases[index].iter_cases()
+                        running[index] = 0
+                    else:
+                        pending[pool.submit(self.execute_case, cases[index])] = (index, cases[index])
+
+                for index in list(streams):
+                    limit = 1 if cases[index].ordered else self.workers
+                    while streams[index] is not None and running[index] < limit and len(pending) < self.workers:
+                        if (case := next(streams[index], None)) is None:
+                            streams[index] = None
+                            break
+                        pending[pool.submit(self.execute_case, case)] = (index, case)
+                        running[index] += 1
+                    if streams[index] is None and not running[index]:
+                        del streams[index], running[index]
+                        cases[index].execute_post_hooks()
+                        scheduler.done(index)
+                if not pending:
+                    continue
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, case = pending.pop(future)
+                    future.result()
+                    self._done(case)
+                    if index in running:
+                        running[index] -= 1
+                    else:
+                        scheduler.done(index)
+            return cases
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            pool.shutdown(wait=True)
+            self.close()
+
+    def execute_lazy_suite(self, suite: LazyUseCaseSuite) -> None:
+        """
+        This method is used to execute the cases of a lazy suite one after another, as they are generated.
+        """
+        suite.execute_pre_hooks()
+        for case in suite.iter_cases():
+            self.execute_case(case)
+            self._done(case)
+        suite.execute_post_hooks()
+
+    def _done(self, case: UseCase) -> None:
+        if self.on_done is not None:
+            self.on_done(case)
+
+    def close(self) -> None:
+        """
+        This method is used to close the worker sessions.
+        """
+        with self._lock:
+            workers, self._workers = self._workers, set()
+        for worker in workers:
+            session_registry.close(worker)
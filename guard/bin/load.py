@@ -0,0 +1,406 @@
+import copy
+import multiprocessing
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from prettytable import PrettyTable
+from guard.bin.runner import Runner
+from guard.http.registry import session_registry
+from guard.logger import logger
+from guard.stats import LatencyHistogram
+from guard.usecase.evaluator import PERCENTILES, get_endpoint
+from guard.usecase.scheduler import iter_usecases
+from guard.usecase.unit import UnitUseCase
+
+
+ARRIVAL_SCHEDULES = ('fixed', 'poisson')
+
+
+class EndpointStats:
+    """
+    The requests sent to an endpoint during a load run.
+
+    Attributes:
+        latencies (LatencyHistogram): The latencies of the requests, errors included.
+        requests (int): The number of requests sent.
+        errors (int): The number of requests that raised or got a 5xx response.
+        sampled (int): The number of responses checked against the assertions of their case.
+        failed (int): The number of checked responses that failed an assertion.
+        late (int): The number of requests sent `LATE_AFTER` seconds or more after their scheduled time.
+    """
+
+    # Open loop, a request sent this many seconds after its scheduled time waited for a free worker.
+    LATE_AFTER = 0.01
+
+    def __init__(self) -> None:
+        self.latencies = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.sampled = 0
+        self.failed = 0
+        self.late = 0
+
+    def merge(self, other: 'EndpointStats') -> 'EndpointStats':
+        self.latencies.merge(other.latencies)
+        self.requests += other.requests
+        self.errors += other.errors
+        self.sampled += other.sampled
+        self.failed += other.failed
+        self.late += other.late
+        return self
+
+
+class RatePacer:
+    """
+    A pacer scheduling the requests of all the workers at `rps` requests per second,
+    the rate growing linearly from zero during the first `ramp_up` seconds.
+
+    With the `fixed` arrival, requests are spread evenly, with `poisson` the intervals between
+    them are drawn from an exponential distribution, as the arrivals of independent users.
+
+    Closed loop, a slot missed because every worker was busy is dropped, the schedule resumes
+    from now. Open loop, the schedule never waits for the workers: missed slots are kept and
+    handed out as soon as a worker is free, so a server stall shows in the latencies
+    measured from the scheduled time instead of silently lowering the rate.
+    """
+
+    # The lowest rate during the ramp-up, so the first requests are not delayed forever.
+    MIN_RATE = 1.0
+
+    def __init__(
+        self,
+        rps: float,
+        ramp_up: float = 0,
+        start: Optional[float] = None,
+        arrival: str = 'fixed',
+        open_loop: bool = False,
+        seed: Optional[int] = None,
+    ) -> None:
+        assert arrival in ARRIVAL_SCHEDULES, f'Arrival schedule {arrival} is not supported.'
+        self.rps = rps
+        self.ramp_up = ramp_up
+        self.start = time.perf_counter() if start is None else start
+        self.arrival = arrival
+        self.open_loop = open_loop
+        self._rng = random.Random(seed)
+        self._next = self.start
+        self._lock = threading.Lock()
+
+    def get_rate(self, now: float) -> float:
+        if self.ramp_up <= 0 or now - self.start >= self.ramp_up:
+            return self.rps
+        return max(self.rps * (now - self.start) / self.ramp_up, self.MIN_RATE)
+
+    def get_interval(self, slot: float) -> float:
+        rate = self.get_rate(slot)
+        return self._rng.expovariate(rate) if self.arrival == 'poisson' else 1 / rate
+
+    def wait(self) -> float:
+        """
+        This method is used to wait for the next free slot.
+
+        Returns:
+            float: The scheduled time of the slot, in `time.perf_counter()` seconds, it is in the past
+                when the slot was missed open loop.
+        """
+        with self._lock:
+            slot = self._next if self.open_loop else max(self._next, time.perf_counter())
+            self._next = slot + self.get_interval(slot)
+        if (delay := slot - time.perf_counter()) > 0:
+            time.sleep(delay)
+        return slot
+
+
+class LoadRunner:
+    """
+    A class to replay the discovered use cases as load.
+
+    Every worker thread picks a unit use case at random, weighted by its endpoint,
+    sends its request and starts over, until the run is over. Only the requests are
+    replayed, the hooks of the cases are not executed and the responses are not logged.
+    With `rps`, the workers share a pace of `rps` requests per second, otherwise
+    every worker sends its next request as soon as it has a response.
+
+    Such a closed loop hides server stalls: while the workers wait, no request is sent and none
+    is measured as slow. With `open_loop`, requests are scheduled at `rps` whether or not
+    the previous ones got a response, and latencies are measured from the scheduled time,
+    the time spent waiting for a free worker included. `concurrency` is then the maximum number
+    of requests in flight, requests sent late because every worker was busy are counted.
+    With `processes`, every process runs `concurrency` workers at its share of `rps`,
+    and their histograms are merged.
+
+    The run lasts `warmup + duration` seconds, the requests of the warm-up are not recorded.
+    The load grows during the first `ramp_up` seconds, by starting the workers one after
+    another, or by raising the rate with `rps`.
+
+    Args:
+        root_path (str): The root path of the test cases.
+        client_path (str, optional): The path to the client. Defaults to None.
+        prefix (str, optional): The prefix of the test cases. Defaults to None.
+        duration (float, optional): The number of seconds recorded. Defaults to 60.
+        concurrency (int, optional): The number of worker threads. Defaults to 10.
+        rps (float, optional): The target number of requests per second. Defaults to None, as fast as possible.
+        warmup (float, optional): The number of seconds run before recording. Defaults to 0.
+        ramp_up (float, optional): The number of seconds the load grows for. Defaults to 0.
+        weights (dict, optional): The weight of the endpoints, keyed by `METHOD /endpoint`,
+            e.g. `{'GET /users/{id}': 5}`. Endpoints not listed weigh 1, 0 skips them.
+        sample_rate (float, optional): The fraction of the responses checked against
+            the assertions of their case. Defaults to 0.
+        seed (int, optional): The seed of the random picks.
+        open_loop (bool, optional): Send the requests on schedule, regardless of the responses. Requires `rps`.
+        arrival (str, optional): The schedule of the requests with `rps`, one of `ARRIVAL_SCHEDULES`. Defaults to `fixed`.
+        processes (int, optional): The number of processes sending requests. Defaults to 1.
+
+    Examples:
+        >>> from guard.bin.load import LoadRunner
+        >>> LoadRunner('tests', duration=30, rps=200, ramp_up=10, weights={'GET /users': 3}).run()
+        >>> LoadRunner('tests', duration=30, rps=500, open_loop=True, arrival='poisson', concurrency=100).run()
+    """
+
+    def __init__(
+        self,
+        root_path: str,
+        client_path: Optional[str] = None,
+        prefix: Optional[str] = None,
+        duration: float = 60,
+        concurrency: int = 10,
+        rps: Optional[float] = None,
+        warmup: float = 0,
+        ramp_up: float = 0,
+        weights: Optional[Dict[str, float]] = None,
+        sample_rate: float = 0,
+        seed: Optional[int] = None,
+        open_loop: bool = False,
+        arrival: str = 'fixed',
+        processes: int = 1,
+    ) -> None:
+        assert concurrency >= 1, '`concurrency` must be greater than or equal to 1.'
+        assert rps is None or rps > 0, '`rps` must be greater than 0.'
+        assert rps is not None or not open_loop, '`open_loop` requires `rps`.'
+        assert arrival in ARRIVAL_SCHEDULES, f'Arrival schedule {arrival} is not supported.'
+        assert processes >= 1, '`processes` must be greater than or equal to 1.'
+        self.root_path = root_path
+        self.client_path = client_path
+        self.prefix = prefix
+        self.runner = Runner(root_path, client_path=client_path, prefix=prefix)
+        self.client = self.runner.client
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rps = rps
+        self.warmup = warmup
+        self.ramp_up = ramp_up
+        self.weights = weights or {}
+        self.sample_rate = sample_rate
+        self.seed = seed
+        self.open_loop = open_loop
+        self.arrival = arrival
+        self.processes = processes
+        self.cases: List[UnitUseCase] = []
+        self.case_weights: List[float] = []
+        self.stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self.elapsed = 0.0
+
+    @staticmethod
+    def get_key(case: UnitUseCase) -> Tuple[str, str]:
+        return case.request.method, get_endpoint(case.request.url)
+
+    def discover(self) -> None:
+        """
+        Discover the use cases and keep the unit use cases with a weight.
+        """
+        self.runner.auto_discover()
+        for case in self.runner.cases:
+            for member in iter_usecases(case, expand_lazy=True):
+                if not isinstance(member, UnitUseCase):
+                    continue
+                method, endpoint = self.get_key(member)
+                weight = self.weights.get(f'{method} {endpoint}', 1)
+                if weight > 0:
+                    self.cases.append(member)
+                    self.case_weights.append(weight)
+        logger.info(f'Replaying {len(self.cases)} cases.')
+
+    def run(self) -> None:
+        if self.processes > 1:
+            self.execute_processes()
+        else:
+            self.discover()
+            if not self.cases:
+                logger.warning('No use case to replay.')
+                return
+            self.execute()
+        self.show_result()
+
+    def execute(self) -> None:
+        """
+        Send the requests from the worker threads, the stats of every worker are merged at the end.
+        """
+        start = time.perf_counter()
+        record_from = start + self.warmup
+        deadline = record_from + self.duration
+        pacer = None
+        if self.rps:
+            pacer = RatePacer(self.rps, self.ramp_up, start, self.arrival, self.open_loop, self.seed)
+        results: List[Dict[Tuple[str, str], EndpointStats]] = []
+        threads = []
+        # Logging every response would slow the workers down.
+        logger.disable('guard.http.hooks')
+        for index in range(self.concurrency):
+            # Without a rate, the ramp-up starts the workers one after another.
+            delay = 0 if pacer else self.ramp_up * index / self.concurrency
+            stats: Dict[Tuple[str, str], EndpointStats] = {}
+            results.append(stats)
+            thread = threading.Thread(
+                target=self._work,
+                args=(index, start + delay, record_from, deadline, pacer, stats),
+                name=f'guard-load-{index}',
+            )
+            threads.append(thread)
+            thread.start()
+
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            logger.enable('guard.http.hooks')
+            for index in range(self.concurrency):
+                session_registry.close(('load', index))
+
+        self.elapsed = time.perf_counter() - record_from
+        for stats in results:
+            self.merge_stats(stats)
+
+    def merge_stats(self, stats: Dict[Tuple[str, str], EndpointStats]) -> None:
+        for key, endpoint_stats in stats.items():
+            self.stats.setdefault(key, EndpointStats()).merge(endpoint_stats)
+
+    def execute_processes(self) -> None:
+        """
+        Split the rate across worker processes, the stats of every process are merged at the end.
+        """
+        options = {
+            'root_path': self.root_path,
+            'client_path': self.client_path,
+            'prefix': self.prefix,
+            'duration': self.duration,
+            'concurrency': self.concurrency,
+            'rps': self.rps and self.rps / self.processes,
+            'warmup': self.warmup,
+            'ramp_up': self.ramp_up,
+            'weights': self.weights,
+            'sample_rate': self.sample_rate,
+            'open_loop': self.open_loop,
+            'arrival': self.arrival,
+        }
+        logger.info(f'Sending requests from {self.processes} processes...')
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.processes, mp_context=context) as pool:
+            futures = [
+                pool.submit(_execute_process_load, {
+                    **options,
+                    # Every process draws its own sequence, still reproducible with a seed.
+                    'seed': None if self.seed is None else self.seed + index * self.concurrency,
+                })
+                for index in range(self.processes)
+            ]
+            for future in futures:
+                stats, elapsed = future.result()
+                self.merge_stats(stats)
+                self.elapsed = max(self.elapsed, elapsed)
+
+    def _work(
+        self,
+        index: int,
+        begin: float,
+        record_from: float,
+        deadline: float,
+        pacer: Optional[RatePacer],
+        stats: Dict[Tuple[str, str], EndpointStats],
+    ) -> None:
+        # Every worker has its own random generator and stats, nothing is shared but the pacer.
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        client = session_registry.get_worker_session(self.client, ('load', index))
+        if (delay := begin - time.perf_counter()) > 0:
+            time.sleep(delay)
+
+        while True:
+            slot = pacer.wait() if pacer is not None else None
+            if (slot if self.open_loop else time.perf_counter()) >= deadline:
+                return
+            case = rng.choices(self.cases, self.case_weights)[0]
+            sent = time.perf_counter()
+            response, error = self._send(client, case)
+            # Open loop, the latency runs from the scheduled time, the wait for a free worker included.
+            if self.open_loop:
+                sent, lag = slot, sent - slot
+            latency = time.perf_counter() - sent
+            if sent < record_from:
+                if response is not None:
+                    response.close()
+                continue
+
+            endpoint_stats = stats.get(key := self.get_key(case))
+            if endpoint_stats is None:
+                endpoint_stats = stats[key] = EndpointStats()
+            endpoint_stats.requests += 1
+            endpoint_stats.latencies.record(latency)
+            if self.open_loop and lag >= EndpointStats.LATE_AFTER:
+                endpoint_stats.late += 1
+            if error or response.status_code >= 500:
+                endpoint_stats.errors += 1
+            elif self.sample_rate and rng.random() < self.sample_rate:
+                endpoint_stats.sampled += 1
+                if case.get_checker()(response, fail_fast=True):
+                    endpoint_stats.failed += 1
+            if response is not None:
+                response.close()
+
+    @staticmethod
+    def _send(client, case: UnitUseCase):
+        # Requests are updated while sent, e.g. with the authentication, every send gets its own copy.
+        request = copy.copy(case.request)
+        request.headers = dict(request.headers or {})
+        try:
+            return client.send_request(request), None
+        except Exception as e:
+            return None, e
+
+    def show_result(self) -> None:
+        percentiles = [f'p{percent} (ms)' for percent in PERCENTILES]
+        table = PrettyTable()
+        table.field_names = ['method', 'endpoint', 'requests', 'rps', 'errors', 'failed', *percentiles, 'max (ms)']
+        total = EndpointStats()
+        rows = sorted(self.stats.items(), key=lambda item: item[0][1])
+        for (method, endpoint), stats in rows:
+            table.add_row([method, endpoint, *self._row(stats)])
+            total.merge(stats)
+        if total.requests:
+            table.add_row(['', 'TOTAL', *self._row(total)])
+        print(table)
+        logger.info(f'Recorded {total.requests} requests in {self.elapsed:.2f}s.')
+        if total.late:
+            logger.warning(
+                f'{total.late} requests were sent late, every worker was busy. '
+                f'Their latencies include the wait, raise the concurrency to measure the server alone.'
+            )
+
+    def _row(self, stats: EndpointStats) -> list:
+        latencies = stats.latencies
+        return [
+            stats.requests,
+            f'{stats.requests / self.elapsed:.1f}' if self.elapsed > 0 else '-',
+            f'{stats.errors / stats.requests * 100:.2f}%' if stats.requests else '-',
+            f'{stats.failed}/{stats.sampled}' if stats.sampled else '-',
+            *(f'{latencies.percentile(percent) * 1000:.1f}' for percent in PERCENTILES),
+            f'{latencies.max * 1000:.1f}',
+        ]
+
+
+def _execute_process_load(options: Dict[str, Any]) -> Tuple[Dict[Tuple[str, str], EndpointStats], float]:
+    runner = LoadRunner(**options)
+    runner.discover()
+    if runner.cases:
+        runner.execute()
+    return runner.stats, runner.elapsed
@@ -1,15 +1,28 @@
 import os
 import sys
+import asyncio
 import time
-import threading
 import importlib.util
-from typing import Any, Dict, Optional, List
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, List, Tuple
 from guard.http.client import HttpClient
+from guard.bin.executor import CaseExecutor
 from guard.logger import logger
 from guard.usecase.loader import UseCaseLoader
 from guard.usecase.evaluator import TestEvaluator
 from guard.usecase.registry import registry
-from guard.usecase.unit import UseCase
+from guard.usecase.result import collect_results
+from guard.usecase.scheduler import CaseScheduler, iter_usecases
+from guard.usecase.suitus import LazyUseCaseSuite
+from guard.usecase.sink import FailureFileSink, JsonLinesSink, JUnitXmlSink
+from guard.usecase.unit import UseCase, UnitUseCase
+from guard.utils import stable_hash
+
+
+# The number of seconds the main process waits for results before checking whether a worker process failed.
+RESULT_QUEUE_TIMEOUT = 0.5
 
 
 class Runner:
@@ -21,6 +34,26 @@ class Runner:
         root_path (str): The root path of the test cases.
         client_path (str, optional): The path to the client. Defaults to None.
         prefix (str, optional): The prefix of the test cases. Defaults to None.
+        workers (int, optional): The number of cases executed concurrently. Defaults to 1.
+        use_async (bool, optional): Whether to execute the cases on an asyncio event loop. Defaults to False.
+        concurrency (int, optional): The maximum number of requests in flight
+            when `use_async` is True. Defaults to 100.
+        shard (tuple, optional): Only run the shard `(index, total)` of the cases,
+            `index` starting at 1. Defaults to None.
+        processes (int, optional): The number of worker processes the cases are split across.
+            Defaults to 1.
+        fail_fast (bool, optional): Stop checking a case at its first failed assertion
+            instead of recording all of them, whatever `app_settings.EXHAUSTIVE_ASSERTIONS`. Defaults to False.
+        exhaustive (bool, optional): Check every assertion of a case and record all the failures,
+            whatever `app_settings.EXHAUSTIVE_ASSERTIONS`. Defaults to False.
+        failures_file (str, optional): The path of a JSON Lines file every failed case
+            is written to as soon as it has finished. Defaults to None.
+        keep_responses (str, optional): What is kept of the responses once evaluated,
+            see `UnitUseCase.release_response`. Defaults to `app_settings.RESPONSE_RETENTION`.
+        junit_xml (str, optional): The path of a JUnit XML report every case is written to
+            as soon as it has finished. Defaults to None.
+        json_lines (str, optional): The path of a JSON Lines report every case is written to
+            as soon as it has finished. Defaults to None.
 
     """
 
@@ -29,12 +62,46 @@ class Runner:
         root_path: str,
         client_path: Optional[str] = None,
         prefix: str | None = None,
+        workers: int = 1,
+        use_async: bool = False,
+        concurrency: int = 100,
+        shard: Optional[Tuple[int, int]] = None,
+        processes: int = 1,
+        fail_fast: bool = False,
+        exhaustive: bool = False,
+        failures_file: Optional[str] = None,
+        keep_responses: Optional[str] = None,
+        junit_xml: Optional[str] = None,
+        json_lines: Optional[str] = None,
     ) -> None:
         self.root_path = root_path
+        self.client_path = client_path
         self.client = self._get_or_create_client(client_path)
         self.cases: List[UseCase] = []
+        # The position of every case in the discovered cases, before sharding.
+        self.positions: List[int] = []
+        # The source of every discovered case by id, the path of its file relative to `root_path` or its module.
+        self.sources: Dict[int, str] = {}
         self.evaluator = None
+        # The queue the results of the finished cases are sent to instead of being evaluated, in worker processes.
+        self.result_queue: Optional[multiprocessing.Queue] = None
         self.prefix = prefix
+        self.workers = workers
+        self.use_async = use_async
+        self.concurrency = concurrency
+        self.shard = shard
+        self.processes = processes
+        self.fail_fast = fail_fast
+        self.failures_file = failures_file
+        self.keep_responses = keep_responses
+        self.junit_xml = junit_xml
+        self.json_lines = json_lines
+        # The number of unfinished cases depending on every case, and the finished cases they keep from being released.
+        self._dependents: Dict[int, int] = {}
+        self._dependencies: Dict[int, List[UseCase]] = {}
+        self._held: Dict[int, UseCase] = {}
+        # Whether to check every assertion of the cases that do not set it, None for the setting.
+        self.exhaustive = False if fail_fast else (True if exhaustive else None)
 
     def _get_or_create_client(self, client_path: Optional[str] = None) -> HttpClient:
         if client_path is None:
@@ -89,8 +156,10 @@ class Runner:
         if not os.path.exists(self.root_path):
             raise FileNotFoundError(f'No such directory: {self.root_path}')
 
-        for root, _, files in os.walk(self.root_path):
-            for file_name in files:
+        # Walked in sorted order, every machine discovers the cases in the same order.
+        for root, dirs, files in os.walk(self.root_path):
+            dirs.sort()
+            for file_name in sorted(files):
 
                 if self.prefix is not None and not file_name.startswith(self.prefix):
                     continue
@@ -103,35 +172,288 @@ class Runner:
                     if loader is None:
                         continue
                     loader.load(self.client)
+                    source = os.path.relpath(file_path, self.root_path).replace(os.sep, '/')
+                    for case in loader.usecases:
+                        self.sources[id(case)] = source
                     self.extend_cases(loader.usecases)
 
-        self.extend_cases(registry.get_usecases())
+        for source, cases in registry.get_named_usecases():
+            for case in cases:
+                self.sources[id(case)] = source or ''
+            self.extend_cases(cases)
         logger.info(f'Auto discovering test cases in {self.root_path} finished.')
 
     def run(self) -> None:
-        self.auto_discover()
+        total = None
+        if self.processes == 1:
+            self.auto_discover()
+            if self.shard is not None:
+                self.select_shard(*self.shard)
+            members = [member for case in self.cases for member in iter_usecases(case)]
+            # The number of cases a lazy suite generates is only known once it has run.
+            if not any(isinstance(member, LazyUseCaseSuite) and not member.materialized for member in members):
+                total = sum(isinstance(member, UnitUseCase) for member in members)
+
+        self.evaluator = TestEvaluator(total=total, sinks=self.get_sinks())
         start_time = time.time()
-        # self.execute_cases()
-        for case in self.cases:
-            case.execute(self.client)
+        try:
+            if self.processes > 1:
+                self.execute_processes()
+            else:
+                self.execute()
+        finally:
+            self.evaluator.close()
         end_time = time.time()
-        self.evaluator = TestEvaluator(self.cases)
         self.evaluator.show_test_result()
         logger.info(f'Total time: {end_time - start_time:.2f}s')
 
-    def _execute_cases(self, cases):
-        for case in cases:
-            case.execute(self.client)
-
-    def execute_cases(self):
-        cases = self.cases
-        n_workers = 10
-        threads = [
-            threading.Thread(target=self._execute_cases, args=(cases[i::n_workers],))
-            for i in range(n_workers)
+    def get_sinks(self) -> list:
+        """
+        Create the sinks of the reports written while the cases run.
+        """
+        sinks = []
+        if self.failures_file:
+            sinks.append(FailureFileSink(self.failures_file))
+        if self.json_lines:
+            sinks.append(JsonLinesSink(self.json_lines))
+        if self.junit_xml:
+            sinks.append(JUnitXmlSink(self.junit_xml))
+        return sinks
+
+    def evaluate_case(self, case: UseCase) -> None:
+        """
+        Pass the results of a finished case to the evaluator and release its responses.
+        Worker processes send the results to the main process instead, as soon as the case has finished.
+
+        The responses of a case are released once the cases depending on it have finished too,
+        their hooks may read them. The cases a lazy suite depends on are released at the end of the run.
+        """
+        if self.evaluator is not None:
+            self.evaluator.add_case(case)
+        elif self.result_queue is not None:
+            self.result_queue.put(collect_results([case]))
+        else:
+            return
+
+        if self._dependents.get(id(case)):
+            self._held[id(case)] = case
+        else:
+            self.release_case(case)
+
+        for dependency in self._dependencies.get(id(case), ()):
+            self._dependents[id(dependency)] -= 1
+            if not self._dependents[id(dependency)] and id(dependency) in self._held:
+                self.release_case(self._held.pop(id(dependency)))
+
+    def release_case(self, case: UseCase) -> None:
+        for member in iter_usecases(case):
+            if isinstance(member, UnitUseCase):
+                member.release_response(self.keep_responses)
+
+    def prepare_release(self) -> None:
+        """
+        Count the cases depending on every case, see `evaluate_case`.
+        """
+        graph = CaseScheduler(self.cases).graph
+        self._dependencies = {
+            id(self.cases[index]): [self.cases[dependency] for dependency in dependencies]
+            for index, dependencies in graph.items()
+            if dependencies
+        }
+        self._dependents = {}
+        for dependencies in graph.values():
+            for dependency in dependencies:
+                self._dependents[id(self.cases[dependency])] = self._dependents.get(id(self.cases[dependency]), 0) + 1
+        self._held = {}
+
+    def execute(self) -> None:
+        self.prepare_release()
+        try:
+            if self.use_async:
+                asyncio.run(self.aexecute_cases())
+            else:
+                self.execute_cases()
+        finally:
+            held, self._held = self._held, {}
+            for case in held.values():
+                self.release_case(case)
+
+    def select_shard(self, index: int, total: int, salt: str = '') -> None:
+        """
+        Keep only the cases of the shard `index` out of `total`, `index` starting at 1.
+
+        Cases are assigned to a shard by a stable hash of their identity, see `get_shard_key`,
+        so every process and every CI machine computes the same split, whatever order
+        the cases were discovered in. Cases linked by `depends_on` always land in the same shard,
+        the one of the smallest key among them.
+        """
+        assert 1 <= index <= total, f'Invalid shard {index}/{total}.'
+        if not self.positions:
+            self.positions = list(range(len(self.cases)))
+
+        graph = CaseScheduler(self.cases).graph
+        groups = list(range(len(self.cases)))
+
+        def find(node: int) -> int:
+            while groups[node] != node:
+                groups[node] = groups[groups[node]]
+                node = groups[node]
+            return node
+
+        for node, dependencies in graph.items():
+            for dependency in dependencies:
+                groups[find(node)] = find(dependency)
+
+        group_keys: Dict[int, str] = {}
+        for node, case in enumerate(self.cases):
+            key = self.get_shard_key(case)
+            group = find(node)
+            if group not in group_keys or key < group_keys[group]:
+                group_keys[group] = key
+
+        selected = [
+            node for node in range(len(self.cases))
+            if stable_hash(f'{salt}{group_keys[find(node)]}') % total == index - 1
         ]
-        for thread in threads:
-            thread.start()
 
-        for thread in threads:
-            thread.join()
+        logger.info(f'Shard {index}/{total}: {len(selected)} of {len(self.cases)} cases.')
+        self.cases = [self.cases[node] for node in selected]
+        self.positions = [self.positions[node] for node in selected]
+
+    def get_shard_key(self, case: UseCase) -> str:
+        """
+        The identity of `case` shards are computed from: its source, its name and its request.
+        Cases with the same identity always land in the same shard.
+        """
+        name = case.name or type(case).__name__
+        request = getattr(case, 'request', None)
+        target = f'{request.method} {request.url}' if request is not None else type(case).__qualname__
+        return f'{self.sources.get(id(case), "")}|{name}|{target}'
+
+    def execute_processes(self) -> None:
+        """
+        Split the cases across worker processes.
+
+        The worker processes send the results of their cases through a queue as soon as every case has finished,
+        so they are evaluated and reported while the cases run, and the results received are kept on interrupt.
+        """
+        options = {
+            'root_path': self.root_path,
+            'client_path': self.client_path,
+            'prefix': self.prefix,
+            'workers': self.workers,
+            'use_async': self.use_async,
+            'concurrency': self.concurrency,
+            'shard': self.shard,
+            'fail_fast': self.fail_fast,
+            'exhaustive': self.exhaustive is True,
+            'keep_responses': self.keep_responses,
+        }
+        logger.info(f'Executing cases in {self.processes} processes...')
+        context = multiprocessing.get_context('spawn')
+        result_queue = context.Queue()
+        pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=context,
+            initializer=_init_process,
+            initargs=(result_queue,),
+        )
+        try:
+            futures = [
+                pool.submit(_execute_process_shard, options, (index, self.processes))
+                for index in range(1, self.processes + 1)
+            ]
+            # Every process sends None once its cases have all finished.
+            remaining = len(futures)
+            while remaining:
+                try:
+                    results = result_queue.get(timeout=RESULT_QUEUE_TIMEOUT)
+                except queue.Empty:
+                    # A process that failed sends nothing more.
+                    for future in futures:
+                        if future.done() and future.exception() is not None:
+                            raise future.exception()
+                    continue
+                if results is None:
+                    remaining -= 1
+                else:
+                    self.evaluator.add_cases(results)
+            for future in futures:
+                future.result()
+        except BaseException:
+            # Keep the results that were sent already.
+            while True:
+                try:
+                    results = result_queue.get_nowait()
+                except (queue.Empty, OSError, ValueError):
+                    break
+                if results is not None:
+                    self.evaluator.add_cases(results)
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown(wait=True)
+
+    def execute_cases(self) -> None:
+        if self.workers > 1:
+            logger.info(f'Executing {len(self.cases)} cases with {self.workers} workers...')
+        CaseExecutor(self.client, self.workers, on_done=self.evaluate_case, exhaustive=self.exhaustive).execute(self.cases)
+
+    async def aexecute_cases(self) -> None:
+        from guard.http.aio import AsyncHttpClient
+
+        logger.info(f'Executing {len(self.cases)} cases with {self.concurrency} requests in flight...')
+        scheduler = CaseScheduler(self.cases)
+        async with AsyncHttpClient(self.client, self.concurrency) as client:
+            tasks = {}
+            for index in scheduler.static_order():
+                dependencies = [tasks[dependency] for dependency in scheduler.graph[index]]
+                tasks[index] = asyncio.ensure_future(
+                    self._aexecute_case(self.cases[index], client, dependencies)
+                )
+            await asyncio.gather(*tasks.values())
+
+    async def _aexecute_case(self, case: UseCase, client, dependencies: list) -> None:
+        if dependencies:
+            await asyncio.gather(*dependencies)
+        if isinstance(case, LazyUseCaseSuite):
+            await self._aexecute_lazy_suite(case, client)
+            return
+        await case.aexecute(client, self.exhaustive)
+        self.evaluate_case(case)
+
+    async def _aexecute_lazy_suite(self, suite: LazyUseCaseSuite, client) -> None:
+        # The cases are generated as requests finish, never more than `concurrency` of them are in flight.
+        await suite.aexecute_pre_hooks()
+        limit = 1 if suite.ordered else self.concurrency
+        tasks = set()
+        for case in suite.iter_cases():
+            if len(tasks) >= limit:
+                finished, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    task.result()
+            tasks.add(asyncio.ensure_future(self._aexecute_case(case, client, [])))
+        await asyncio.gather(*tasks)
+        await suite.aexecute_post_hooks()
+
+
+# The queue the worker processes send their results to, set when they start.
+_result_queue: Optional[multiprocessing.Queue] = None
+
+
+def _init_process(result_queue: multiprocessing.Queue) -> None:
+    global _result_queue
+    _result_queue = result_queue
+
+
+def _execute_process_shard(
+    options: Dict[str, Any],
+    process_shard: Tuple[int, int],
+) -> None:
+    runner = Runner(**options)
+    runner.auto_discover()
+    if runner.shard is not None:
+        runner.select_shard(*runner.shard)
+    runner.select_shard(*process_shard, salt='process:')
+    runner.result_queue = _result_queue
+    runner.execute()
+    _result_queue.put(None)
@@ -1,8 +1,9 @@
-from . import fields
+from . import fields, strategies
 from .bases import Faker, UseCaseFaker, RelationConstraint
 
 __all__ = (
     'fields',
+    'strategies',
     'Faker',
     'UseCaseFaker',
     'RelationConstraint'
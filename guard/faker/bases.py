@@ -1,16 +1,25 @@
 import inspect
-import copy
-from typing import List, Dict, Union, Any
+import itertools
+import json
+import os
+import random
+from enum import Enum
+from types import MappingProxyType
+from typing import Iterator, List, Dict, Optional, Union, Any
 from collections import namedtuple
 from guard.faker.fields import Field, DictField
-from guard.faker.enums import InvalidDataType
-from guard.faker.invalid import InvalidValue, InvalidDictValue
+from guard.faker.enums import InvalidDataType, InvalidStrategyType
+from guard.faker.invalid import PlannedInvalidValue
+from guard.faker.strategies import InvalidStrategy, Mutation
+from guard.http.payload import JsonOverlay, materialize
 from guard.assertion.bases import Assertion
 from guard.usecase.unit import UnitUseCase
-from guard.usecase.suitus import UseCaseSuite
+from guard.usecase.suitus import LazyUseCaseSuite, UseCaseSuite
 from guard.assertion.container import AssertDict
 from guard.logger import logger
 from guard.faker.assert_handler import handle_assertion
+from guard.settings.bases import app_settings
+from guard.utils import atomic_write_json, stable_hash
 
 
 class InvalidData(namedtuple('InvalidData', ['data', 'field_name', 'type', 'whold_field'])):
@@ -28,22 +37,38 @@ class RelationConstraint:
         self.constraints = constraints
 
 
+class SchemaPlan(namedtuple('SchemaPlan', ['fields', 'invalid_values', 'invalid_strategy', 'schema_hash'])):
+    """
+    Everything a `Faker` class generates its data from, built once per class by `Faker.get_schema_plan()`.
+
+    `fields` maps the field names to the fields and `invalid_values` maps them to the planned invalid values
+    of the fields, the missing value of a required field included, both read-only.
+    """
+    __slots__ = ()
+
+
 class RegisterFieldMetaclass(type):
     """
     This metaclass sets a dictionary named `_declared_fields` on the class.
     Any instances of `Field` included as attributes on either the class
     or on any of its superclasses will be included in the
-    `_declared_fields` dictionary.
+    `_declared_fields` dictionary, the fields of the class coming last.
+    A field of a superclass set to None on the class is removed.
     """
 
     def __new__(cls, name, bases, class_attrs, **kwargs):
         new_cls = super().__new__(cls, name, bases, class_attrs, **kwargs)
         if not inspect.isabstract(new_cls):
-            new_cls._declared_fields = {
-                field_name: field
-                for field_name, field in new_cls.__dict__.items()
-                if isinstance(field, Field)
-            }
+            declared_fields = {}
+            for base in reversed(new_cls.__mro__[1:]):
+                declared_fields.update(base.__dict__.get('_declared_fields', {}))
+
+            for field_name, field in class_attrs.items():
+                if isinstance(field, Field):
+                    declared_fields[field_name] = field
+                elif field is None:
+                    declared_fields.pop(field_name, None)
+            new_cls._declared_fields = declared_fields
         return new_cls
 
 
@@ -51,64 +76,265 @@ class Faker(metaclass=RegisterFieldMetaclass):
     """
     A generic virtual data generator class that generates valid and invalid data based on declared fields
     and handles relation constraints.
+
+    Invalid data is generated as `JsonOverlay` objects on the valid data: they share it
+    instead of copying it, so the valid data must not be modified once generated.
+
+    `Meta.invalid_strategy` combines the invalid values of the fields into invalid data,
+    an `InvalidStrategy` or the type of one, `InvalidStrategyType.ONE_AT_A_TIME` by default:
+        - `one_at_a_time`: one field invalid at a time.
+        - `n_wise`: `NWiseStrategy(n=2)`, every combination of invalid values of `n` fields covered.
+        - `random`: `RandomStrategy(budget=100, seed=None, max_fields=2)`, random combinations,
+          drawn with the seed of the faker.
+
+    Args:
+        seed (int, optional): The seed of the random generator of this faker, the same seed and schema
+            always generate the same data. Defaults to `app_settings.FAKER_SEED`.
+            Without a seed, fields draw from the `random` module and cache their valid value.
+        cache_dir (str, optional): The directory the valid and invalid data are cached in as JSON, keyed by
+            the schema hash of the faker and the seed, so later runs reuse them instead of generating them.
+            With a cache, the invalid data are all generated and cached before the first one is used.
+            Defaults to `app_settings.FAKER_CACHE_DIR`, an empty string to disable the cache.
     """
 
     _declared_fields: Dict[str, Field] = {}
 
     class Meta:
         relation_constraints: List[RelationConstraint] = []
+        invalid_strategy: Union[str, InvalidStrategy] = InvalidStrategyType.ONE_AT_A_TIME.value
 
-    def __init__(self, **kwargs):
+    def __init__(self, seed: Optional[int] = None, cache_dir: Optional[str] = None, **kwargs):
         self._valid_data: Dict[str, Any] = {}
         self._invalid_data: List[InvalidData] = []
         self._relation_invalid_data: List[InvalidData] = []
+        self.seed = app_settings.FAKER_SEED if seed is None else seed
+        self.rng = None if self.seed is None else random.Random(self.seed)
+        self.cache_dir = app_settings.FAKER_CACHE_DIR if cache_dir is None else cache_dir
+        # The invalid data loaded from the cache, None if they must be generated.
+        self._cached_invalid_data: Optional[List[InvalidData]] = None
+
+    def get_schema(self) -> Dict[str, Any]:
+        """
+        Describe everything the generated data depend on: the fields, the relation constraints and the invalid strategy.
+        """
+        strategy = self.get_invalid_strategy()
+        return {
+            'faker': f'{type(self).__module__}.{type(self).__qualname__}',
+            'fields': {field_name: field.describe() for field_name, field in self._declared_fields.items()},
+            'relation_constraints': [
+                [str(constraint.condition), [str(item) for item in constraint.constraints]]
+                for constraint in self.relation_constraints
+            ],
+            'invalid_strategy': [strategy.strategy_type, {key: repr(value) for key, value in vars(strategy).items()}],
+        }
+
+    def get_schema_hash(self) -> str:
+        return self.get_schema_plan().schema_hash
+
+    def get_schema_plan(self) -> SchemaPlan:
+        """
+        Get the schema plan of the class of this faker, built by the first of its instances.
+        """
+        # Looked up on the class itself, a subclass must not use the plan of its parent.
+        plan = type(self).__dict__.get('_schema_plan')
+        if plan is None:
+            plan = self.build_schema_plan()
+            type(self)._schema_plan = plan
+        return plan
+
+    def build_schema_plan(self) -> SchemaPlan:
+        invalid_values = {}
+        for field_name, field in self._declared_fields.items():
+            planned = []
+            if field.required:
+                planned.append(PlannedInvalidValue((), InvalidDataType.MISSING_REQUIRE.value, True, None, None))
+            planned.extend(field.get_invalid_plan())
+            invalid_values[field_name] = tuple(planned)
+
+        return SchemaPlan(
+            fields=MappingProxyType(dict(self._declared_fields)),
+            invalid_values=MappingProxyType(invalid_values),
+            invalid_strategy=self.get_invalid_strategy(),
+            schema_hash=f'{stable_hash(json.dumps(self.get_schema(), sort_keys=True)):016x}',
+        )
+
+    def get_cache_path(self) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f'{type(self).__name__}-{self.get_schema_hash()}-{self.seed}.json')
+
+    def _dump_invalid_data(self, invalid_data: InvalidData) -> Dict[str, Any]:
+        # The invalid data generated on the valid data are stored as their changes only.
+        if isinstance(invalid_data.data, JsonOverlay) and invalid_data.data.base is self._valid_data:
+            dumped = {'changes': invalid_data.data.dump_changes()}
+        else:
+            dumped = {'data': materialize(invalid_data.data)}
+        # The type of the missing sub fields of a dict is an `InvalidDataType`, not its value.
+        if isinstance(invalid_data.type, Enum):
+            dumped['invalid_data_type'] = invalid_data.type.value
+        return {**dumped, 'field_name': invalid_data.field_name, 'type': str(invalid_data.type), 'whold_field': invalid_data.whold_field}
+
+    def _load_invalid_data(self, dumped: Dict[str, Any]) -> InvalidData:
+        if 'changes' in dumped:
+            data = JsonOverlay.load_changes(self._valid_data, dumped['changes'])
+        else:
+            data = dumped['data']
+        invalid_data_type = dumped['type']
+        if 'invalid_data_type' in dumped:
+            invalid_data_type = InvalidDataType(dumped['invalid_data_type'])
+        return InvalidData(data, dumped['field_name'], invalid_data_type, dumped['whold_field'])
+
+    def _load_cache(self) -> bool:
+        """
+        Load the valid and invalid data from the cache, return whether they were found.
+        """
+        if (path := self.get_cache_path()) is None or not os.path.exists(path):
+            return False
+        try:
+            with open(path, encoding='utf-8') as f:
+                cached = json.load(f)
+            self._valid_data = cached['valid']
+            self._relation_invalid_data = [self._load_invalid_data(item) for item in cached['relation_invalid']]
+            self._cached_invalid_data = [self._load_invalid_data(item) for item in cached['invalid']]
+        except (OSError, ValueError, KeyError, TypeError, IndexError) as e:
+            logger.warning(f'Ignoring the fake data cache {path}: {e}')
+            self._valid_data, self._relation_invalid_data, self._cached_invalid_data = {}, [], None
+            return False
+        return True
+
+    def _save_cache(self, invalid_data: List[InvalidData]) -> None:
+        if (path := self.get_cache_path()) is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        atomic_write_json(path, {
+            'valid': self._valid_data,
+            'relation_invalid': [self._dump_invalid_data(item) for item in self._relation_invalid_data],
+            'invalid': [self._dump_invalid_data(item) for item in invalid_data],
+        })
+
+    def get_valid_value(self, field: Field) -> Any:
+        if self.rng is None:
+            return field.valid_value
+        return field.fake_valid(self.rng)
 
     def fake_valid(self):
         """
         Generate valid data.
         """
+        if self._load_cache():
+            return self._valid_data
+
         valid_data = {
-            field_name: field.valid_value
+            field_name: self.get_valid_value(field)
             for field_name, field in self._declared_fields.items()
         }
         valid_data = self.check_relation_constraint(valid_data)
         self._valid_data = valid_data
         return valid_data
 
+    def fake_valid_many(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Generate `count` valid data at once, the values of every field are drawn in bulk.
+        They are not kept by the faker, the invalid data are still generated from `fake_valid()`.
+        """
+        columns = {
+            field_name: field.fake_valid_values(count, self.rng)
+            for field_name, field in self._declared_fields.items()
+        }
+        relation_invalid_data, self._relation_invalid_data = self._relation_invalid_data, []
+        try:
+            return [
+                self.check_relation_constraint({field_name: column[index] for field_name, column in columns.items()})
+                for index in range(count)
+            ]
+        finally:
+            self._relation_invalid_data = relation_invalid_data
+
     def fake_invalid(self):
         """
         Generate invalid data.
         """
-        for field_name, field in self._declared_fields.items():
-
-            if field.required:
-                self._fake_missing_required_data(field_name)
+        for invalid_data in self.iter_invalid_data():
+            self.add_invalid_data(invalid_data)
 
-            invalid_values: List[Union[InvalidValue, InvalidDictValue]] = field.fake_invalid()
-            for invalid_value in invalid_values:
+    def add_invalid_data(self, invalid_data: InvalidData) -> None:
+        self._invalid_data.append(invalid_data)
 
-                valid = copy.deepcopy(self._valid_data)
-                valid[field_name] = invalid_value.value
-                whole_field = field_name
+    def get_invalid_strategy(self) -> InvalidStrategy:
+        strategy = getattr(getattr(self, 'Meta', None), 'invalid_strategy', None) or InvalidStrategyType.ONE_AT_A_TIME.value
+        if isinstance(strategy, InvalidStrategy):
+            return strategy
+        return InvalidStrategy.get_strategy(strategy)
 
-                if isinstance(invalid_value, InvalidDictValue):
-                    whole_field = f'{field_name}.{invalid_value.sub_field}'
+    def get_mutations(self) -> Dict[str, List[Mutation]]:
+        """
+        Get the ways every field can be made invalid, keyed by field name.
+        """
+        plan = self.get_schema_plan()
+        mutations = {}
+        for field_name, planned_values in plan.invalid_values.items():
+            field_mutations = mutations[field_name] = []
+            field_value = None
+
+            for planned in planned_values:
+                if not planned.path:
+                    value = None if planned.removed else planned.resolve(self.rng)
+                    field_mutations.append(Mutation(field_name, field_name, planned.type, value, planned.removed))
+                    continue
+
+                # The values of sub fields are overlays on the valid value of the field.
+                if field_value is None:
+                    valid_value = self._valid_data.get(field_name)
+                    if not isinstance(valid_value, dict):
+                        valid_value = plan.fields[field_name].valid_value
+                    field_value = JsonOverlay(valid_value)
+
+                if planned.removed:
+                    value = field_value.remove(planned.path)
+                else:
+                    value = field_value.replace(planned.path, planned.resolve(self.rng))
+                field_mutations.append(Mutation(field_name, f'{field_name}.{planned.path[0]}', planned.type, value, False))
+        return mutations
 
-                self.add_invalid_data(
-                    InvalidData(valid, field_name, invalid_value.type, whole_field)
+    def iter_invalid_data(self) -> Iterator[InvalidData]:
+        """
+        Generate invalid data one after another, as combined by the invalid strategy.
+        Data combining several fields lists them, and their invalid data types, separated by ` & `.
+        """
+        if self._cached_invalid_data is not None:
+            yield from self._cached_invalid_data
+            return
+
+        if not self.cache_dir:
+            yield from self._iter_invalid_data()
+            return
+
+        # All of them are generated before the first one is used, the cache is complete
+        # even if the caller stops early, e.g. at `max_invalid_cases` or on an interruption.
+        self._cached_invalid_data = list(self._iter_invalid_data())
+        self._save_cache(self._cached_invalid_data)
+        yield from self._cached_invalid_data
+
+    def _iter_invalid_data(self) -> Iterator[InvalidData]:
+        strategy = self.get_schema_plan().invalid_strategy.with_seed(self.seed)
+        for mutations in strategy.combine(self.get_mutations()):
+            data = JsonOverlay(self._valid_data)
+            for mutation in mutations:
+                if mutation.removed:
+                    data = data.remove((mutation.field_name,))
+                else:
+                    data = data.replace((mutation.field_name,), mutation.value)
+
+            if len(mutations) == 1:
+                yield InvalidData(data, mutations[0].field_name, mutations[0].type, mutations[0].whole_field)
+            else:
+                yield InvalidData(
+                    data,
+                    ' & '.join(mutation.field_name for mutation in mutations),
+                    ' & '.join(str(mutation.type) for mutation in mutations),
+                    ' & '.join(mutation.whole_field for mutation in mutations),
                 )
 
-    def add_invalid_data(self, invalid_data: InvalidData) -> None:
-        self._invalid_data.append(invalid_data)
-
-    def _fake_missing_required_data(self, field_name: str) -> InvalidData:
-        missing_require_data = copy.deepcopy(self._valid_data)
-        del missing_require_data[field_name]
-        self.add_invalid_data(
-            InvalidData(missing_require_data, field_name, InvalidDataType.MISSING_REQUIRE.value, field_name)
-        )
-        return missing_require_data
-
     def get_relation_constraints(self) -> List[RelationConstraint]:
         if not hasattr(self, 'Meta') or not getattr(self.Meta, 'relation_constraints', None):
             return []
@@ -142,13 +368,13 @@ class Faker(metaclass=RegisterFieldMetaclass):
                     logger.info(f'Constraint {constraint} is `False`. change valid value.')
 
                     if len(constraint.key) == 1:
-                        default_valid_data = self._declared_fields[constraint.key[0]].valid_value
+                        default_valid_data = self.get_valid_value(self._declared_fields[constraint.key[0]])
                     else:
                         field = self._declared_fields[constraint.key[0]]
                         for key in constraint.key[1:]:
                             if isinstance(field, DictField):
                                 field = field.fields[key]
-                        default_valid_data = field.valid_value
+                        default_valid_data = self.get_valid_value(field)
                     valid_data, invalid_data = handle_assertion(constraint, data=valid_data, default=default_valid_data)
 
                     # Generate invalid data
@@ -165,10 +391,25 @@ class UseCaseFaker(Faker):
         valid_assertions: List[Assertion] = []
         invalid_assertions: Dict[str, Dict[str, List[Assertion]]] = {}
         default_invalid_assertions: List[Assertion] = []
+        invalid_strategy: Union[str, InvalidStrategy] = InvalidStrategyType.ONE_AT_A_TIME.value
+        # The maximum number of invalid use cases generated per suite by the invalid strategy, None for no limit.
+        # The use cases of the relation constraints are not counted, they are always generated.
+        max_invalid_cases: Optional[int] = None
+
+    def fake_use_case(self, usecase) -> UseCaseSuite:
+        """
+        Generate the valid use case, the invalid ones are only generated when the suite is executed.
+        """
+        valid_usecases = self.faker_valid_use_case(usecase)
+        state = None if self.rng is None else self.rng.getstate()
+
+        def factory():
+            # Every pass over the suite of a seeded faker generates the same invalid use cases.
+            if state is not None:
+                self.rng.setstate(state)
+            return itertools.chain(valid_usecases, self.iter_invalid_use_cases(usecase))
 
-    def fake_use_case(self, usecase) -> str:
-        usecases = self.faker_valid_use_case(usecase) + self.faker_invalid_use_case(usecase)
-        return UseCaseSuite(usecases)
+        return LazyUseCaseSuite(factory)
 
     def get_default_invalid_assertions(self) -> List[Assertion]:
         if not hasattr(self, 'Meta') or not getattr(self.Meta, 'default_invalid_assertions', None):
@@ -180,6 +421,11 @@ class UseCaseFaker(Faker):
             return []
         return self.Meta.valid_assertions
 
+    def get_max_invalid_cases(self) -> Optional[int]:
+        if not hasattr(self, 'Meta'):
+            return None
+        return getattr(self.Meta, 'max_invalid_cases', None)
+
     def get_invalid_assertions(self) -> Dict[str, Dict[str, List[Assertion]]]:
         if not hasattr(self, 'Meta') or not getattr(self.Meta, 'invalid_assertions', None):
             return {}
@@ -206,40 +452,46 @@ class UseCaseFaker(Faker):
     def faker_invalid_use_case(
         self,
         use_case: UnitUseCase
-    ) -> UnitUseCase:
-
-        usecases = []
-
-        for field_name, field in self._declared_fields.items():
+    ) -> List[UnitUseCase]:
+        return list(self.iter_invalid_use_cases(use_case))
 
-            if field.required:
-                _case = use_case.copy()
-                _case.clear_assertions()
-                _case.set_request_json(self._fake_missing_required_data(field_name))
-                _case.extend_assertions(self.get_assertions_by_field_name(field_name, InvalidDataType.MISSING_REQUIRE.value))
-                _case.set_name(f'<{_case.request.method} {_case.request.url} | {field_name} | {InvalidDataType.MISSING_REQUIRE.value}>')
-                usecases.append(_case)
-
-            invalid_values: List[Union[InvalidValue, InvalidDictValue]] = field.fake_invalid()
-            for invalid_value in invalid_values:
-
-                valid = copy.deepcopy(self._valid_data)
-                valid[field_name] = invalid_value.value
-                whole_field = field_name
-
-                if isinstance(invalid_value, InvalidDictValue):
-                    whole_field = f'{field_name}.{invalid_value.sub_field}'
-
-                _case = use_case.copy()
-                _case.clear_assertions()
-                _case.set_request_json(valid)
-                if assertions := self.get_assertions_by_field_name(whole_field, invalid_value.type):
-                    _case.extend_assertions(assertions)
-                else:
-                    _case.extend_assertions(self.get_default_invalid_assertions())
-                _case.set_name(f'<{_case.request.method} {_case.request.url} | {whole_field} | {invalid_value.type}>')
-                usecases.append(_case)
+    def iter_invalid_use_cases(
+        self,
+        use_case: UnitUseCase
+    ) -> Iterator[UnitUseCase]:
+        """
+        Generate the invalid use cases one after another, at most `Meta.max_invalid_cases` of them
+        from the invalid strategy, followed by the ones of the relation constraints.
+        """
+        usecases = self._iter_invalid_use_cases(use_case)
+        if (max_invalid_cases := self.get_max_invalid_cases()) is not None:
+            usecases = itertools.islice(usecases, max_invalid_cases)
+        return itertools.chain(usecases, self._iter_relation_invalid_use_cases(use_case))
 
+    def _iter_invalid_use_cases(
+        self,
+        use_case: UnitUseCase
+    ) -> Iterator[UnitUseCase]:
+        for invalid_data in self.iter_invalid_data():
+            _case = use_case.copy()
+            _case.clear_assertions()
+            _case.set_request_json(invalid_data.data)
+
+            # Data combining several fields has no assertions of its own.
+            assertions = []
+            if ' & ' not in invalid_data.whold_field:
+                assertions = self.get_assertions_by_field_name(invalid_data.whold_field, invalid_data.type)
+            if assertions or invalid_data.type == InvalidDataType.MISSING_REQUIRE.value:
+                _case.extend_assertions(assertions)
+            else:
+                _case.extend_assertions(self.get_default_invalid_assertions())
+            _case.set_name(f'<{_case.request.method} {_case.request.url} | {invalid_data.whold_field} | {invalid_data.type}>')
+            yield _case
+
+    def _iter_relation_invalid_use_cases(
+        self,
+        use_case: UnitUseCase
+    ) -> Iterator[UnitUseCase]:
         for invalid_relation in self._relation_invalid_data:
             _case = use_case.copy()
             _case.set_request_json(invalid_relation.data)
@@ -248,6 +500,4 @@ class UseCaseFaker(Faker):
 
             # TODO Add assertion for relation invalid data.
             _case.extend_assertions(self.get_default_invalid_assertions())
-            usecases.append(_case)
-
-        return usecases
+            yield _case
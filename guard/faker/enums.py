@@ -36,3 +36,10 @@ class InvalidDataType(EnumWithChoices):
     EXCEED_MAX_LENGTH = 'exceed_max_length'
     EXCEED_MIN_LENGTH = 'exceed_min_length'
     INVALID_DICT = 'invalid_dict'
+
+
+class InvalidStrategyType(EnumWithChoices):
+
+    ONE_AT_A_TIME = 'one_at_a_time'
+    N_WISE = 'n_wise'
+    RANDOM = 'random'
@@ -1,9 +1,9 @@
 import inspect
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 import random
 import string
 from guard.faker.enums import FieldType, InvalidDataType
-from guard.faker.invalid import InvalidValueProvider, InvalidValue, InvalidDictValue
+from guard.faker.invalid import InvalidValueProvider, InvalidValue, InvalidDictValue, PlannedInvalidValue
 
 
 class Field:
@@ -36,6 +36,7 @@ class Field:
         self.allow_null = allow_null
 
         self._invalid_provider: List[InvalidValueProvider] = []
+        self._invalid_plan: Optional[Tuple[PlannedInvalidValue, ...]] = None
 
         self._valid: Any = ...
         self._invalid: List[InvalidValue | InvalidDictValue] = []
@@ -68,33 +69,77 @@ class Field:
             'provider must be an instance of InvalidValueProvider.'
         )
         self._invalid_provider.append(provider)
+        self._invalid_plan = None
 
-    def fake_valid(self):
+    def get_invalid_plan(self) -> Tuple[PlannedInvalidValue, ...]:
         """
-        Generate valid data.
+        Get the invalid values planned by the providers of the field.
+        The plan is built once, the fields of a faker class are shared by all its instances.
+        """
+        if self._invalid_plan is None:
+            self._invalid_plan = tuple(
+                item for provider in self._invalid_provider for item in provider.plan()
+            )
+        return self._invalid_plan
+
+    def fake_valid(self, rng=None):
+        """
+        Generate valid data, with the random generator `rng`, the `random` module by default.
         """
         raise NotImplementedError(
             'You must implement the generate_valid_value() method.'
         )
 
-    def fake_invalid(self):
+    def fake_valid_values(self, count: int, rng=None) -> List[Any]:
+        """
+        Generate `count` valid values at once, fields override it to draw them in bulk.
+        """
+        return [self.fake_valid(rng) for _ in range(count)]
+
+    def fake_invalid(self, rng=None):
         """
         Generate invalid data.
         """
+        # The fields are shared by the instances of a faker, the invalid data are generated anew on every call.
+        self._invalid = []
         for provider in self._invalid_provider:
-            # breakpoint()
             self._invalid.extend(
-                provider.provide()
+                provider.provide(rng)
             )
         return self._invalid
 
+    def describe(self) -> Dict[str, Any]:
+        """
+        Describe the field, its options and invalid value providers, e.g. to compute the schema hash of a `Faker`.
+        """
+        description: Dict[str, Any] = {
+            'type': type(self).__qualname__,
+            'providers': [type(provider).__qualname__ for provider in self._invalid_provider],
+        }
+        for key, value in vars(self).items():
+            if key.startswith('_'):
+                continue
+            if isinstance(value, Field):
+                value = value.describe()
+            elif isinstance(value, dict):
+                value = {name: item.describe() if isinstance(item, Field) else repr(item) for name, item in value.items()}
+            elif isinstance(value, (list, tuple)):
+                value = [item.describe() if isinstance(item, Field) else repr(item) for item in value]
+            else:
+                value = repr(value)
+            description[key] = value
+        return description
+
 
 class BooleanField(Field):
 
     field_type = FieldType.BOOLEAN.value
 
-    def fake_valid(self):
-        return random.choice([True, False])
+    def fake_valid(self, rng=None):
+        return (rng or random).choice([True, False])
+
+    def fake_valid_values(self, count: int, rng=None) -> List[Any]:
+        return (rng or random).choices([True, False], k=count)
 
 
 class CharField(Field):
@@ -156,16 +201,28 @@ class CharField(Field):
         if not self.allow_blank:
             self.register_invalid_provider(InvalidValueProvider.get_provider(InvalidDataType.BLANK.value, self))
 
-    def fake_valid(self):
-        allow_strings = ''.join(
+    def get_alphabet(self) -> str:
+        return ''.join(
             getattr(string, allow_string) for allow_string in self.allow_strings
         )
-        random_length = random.randint(1, 20)
-        random_string = ''.join(random.choice(allow_strings) for _ in range(random_length))
-        random_string = self.prefix + random_string + self.suffix
-        if self.allow_blank:
-            random_string = random.choice([random_string, ''])
-        return random_string
+
+    def fake_valid(self, rng=None):
+        return self.fake_valid_values(1, rng)[0]
+
+    def fake_valid_values(self, count: int, rng=None) -> List[Any]:
+        rng = rng or random
+        lengths = [rng.randint(1, 20) for _ in range(count)]
+        # The characters of all the strings are drawn in one call.
+        chars = ''.join(rng.choices(self.get_alphabet(), k=sum(lengths)))
+        values = []
+        start = 0
+        for length in lengths:
+            random_string = self.prefix + chars[start:start + length] + self.suffix
+            start += length
+            if self.allow_blank and rng.random() < 0.5:
+                random_string = ''
+            values.append(random_string)
+        return values
 
 
 class IntegerField(Field):
@@ -195,8 +252,7 @@ class IntegerField(Field):
         if self.min_value:
             self.register_invalid_provider(InvalidValueProvider.get_provider(InvalidDataType.EXCEED_MIN_VALUE.value, self))
 
-    def fake_valid(self):
-
+    def get_range(self) -> Tuple[int, int]:
         min_value = self.min_value
         if self.min_value is None:
             min_value = -1000
@@ -205,7 +261,14 @@ class IntegerField(Field):
             max_value = 1000
 
         assert max_value >= min_value, "Maximum value must be greater than or equal to minimum value"
-        return random.randint(min_value, max_value)
+        return min_value, max_value
+
+    def fake_valid(self, rng=None):
+        return (rng or random).randint(*self.get_range())
+
+    def fake_valid_values(self, count: int, rng=None) -> List[Any]:
+        min_value, max_value = self.get_range()
+        return (rng or random).choices(range(min_value, max_value + 1), k=count)
 
 
 class ChoiceField(Field):
@@ -244,8 +307,11 @@ class ChoiceField(Field):
                 )
             )
 
-    def fake_valid(self):
-        return random.choice(self.choices)
+    def fake_valid(self, rng=None):
+        return (rng or random).choice(self.choices)
+
+    def fake_valid_values(self, count: int, rng=None) -> List[Any]:
+        return (rng or random).choices(self.choices, k=count)
 
 
 class FloatField(IntegerField):
@@ -255,17 +321,13 @@ class FloatField(IntegerField):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    def fake_valid(self):
-
-        min_value = self.min_value
-        if self.min_value is None:
-            min_value = -1000
-        max_value = self.max_value
-        if self.max_value is None:
-            max_value = 1000
+    def fake_valid(self, rng=None):
+        return round((rng or random).uniform(*self.get_range()), 2)
 
-        assert max_value >= min_value, "Maximum value must be greater than or equal to minimum value"
-        return round(random.uniform(min_value, max_value), 2)
+    def fake_valid_values(self, count: int, rng=None) -> List[Any]:
+        rng = rng or random
+        min_value, max_value = self.get_range()
+        return [round(rng.uniform(min_value, max_value), 2) for _ in range(count)]
 
 
 class DictField(Field):
@@ -297,12 +359,22 @@ class DictField(Field):
             )
         )
 
-    def fake_valid(self):
+    def fake_valid(self, rng=None):
         return {
-            field_name: field_instance.valid_value
+            field_name: field_instance.fake_valid(rng)
             for field_name, field_instance in self.fields.items()
         }
 
+    def fake_valid_values(self, count: int, rng=None) -> List[Any]:
+        columns = {
+            field_name: field_instance.fake_valid_values(count, rng)
+            for field_name, field_instance in self.fields.items()
+        }
+        return [
+            {field_name: column[index] for field_name, column in columns.items()}
+            for index in range(count)
+        ]
+
 
 class ListField(Field):
 
@@ -333,9 +405,9 @@ class ListField(Field):
 
         assert self.max_length >= self.min_length, "Maximum length must be greater than or equal to minimum length"
 
-    def fake_valid(self):
-        random_length = self.length or random.randint(self.min_length, self.max_length)
+    def fake_valid(self, rng=None):
+        random_length = self.length or (rng or random).randint(self.min_length, self.max_length)
         return [
-            field.valid_value
+            field.fake_valid(rng)
             for field in self.fields
         ][:random_length]
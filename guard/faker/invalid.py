@@ -1,9 +1,10 @@
-import copy
 import inspect
 import abc
+import random
 from typing import Type, Dict
 from collections import namedtuple
 from guard.faker.enums import InvalidDataType
+from guard.http.payload import JsonOverlay
 from guard.utils import generate_random_string
 
 
@@ -15,6 +16,19 @@ class InvalidDictValue(namedtuple('InvalidValue', ['value', 'type', 'sub_field']
     __slots__ = ()
 
 
+class PlannedInvalidValue(namedtuple('PlannedInvalidValue', ['path', 'type', 'removed', 'value', 'provider'])):
+    """
+    An invalid value of a field planned ahead, at `path` in the value of the field, `()` for the field itself.
+    It is removed, or replaced by `value`, or by a value drawn from `provider` when it depends on the random generator.
+    """
+    __slots__ = ()
+
+    def resolve(self, rng=None):
+        if self.provider is None:
+            return self.value
+        return self.provider.get_invalid_value(rng or random)
+
+
 class StrategyMeta(abc.ABCMeta):
 
     provider_registry: Dict[str, Type['InvalidValueProvider']] = {}
@@ -31,17 +45,28 @@ class InvalidValueProvider(metaclass=StrategyMeta):
 
     invalid_data_type: InvalidDataType = None
     invalid_value: str = None
+    # Whether `get_invalid_value()` always returns the same value, `plan()` then computes it once.
+    constant: bool = False
 
     def __init__(self, field):
         self.field = field
 
-    def provide(self):
+    def plan(self):
+        """
+        Plan the invalid values provided, see `Field.get_invalid_plan()`.
+        Providers overriding `provide()` must override it too.
+        """
+        if self.constant:
+            return [PlannedInvalidValue((), self.invalid_data_type, False, self.get_invalid_value(), None)]
+        return [PlannedInvalidValue((), self.invalid_data_type, False, None, self)]
+
+    def provide(self, rng=None):
         return [InvalidValue(
-            self.get_invalid_value(),
+            self.get_invalid_value(rng or random),
             self.invalid_data_type
         )]
 
-    def get_invalid_value(self):
+    def get_invalid_value(self, rng=random):
         return self.invalid_value
 
     @classmethod
@@ -55,22 +80,24 @@ class NullValueProvider(InvalidValueProvider):
 
     invalid_data_type = InvalidDataType.NULL.value
     invalid_value = None
+    constant = True
 
 
 class BlankValueProvider(InvalidValueProvider):
 
     invalid_data_type = InvalidDataType.BLANK.value
     invalid_value = ''
+    constant = True
 
 
 class InvalidChoiceValueProvider(InvalidValueProvider):
 
     invalid_data_type = InvalidDataType.INVALID_CHOICE.value
 
-    def get_invalid_value(self):
+    def get_invalid_value(self, rng=random):
         assert self.field.choices is not None, "Field must have choices"
         while True:
-            random_string = generate_random_string()
+            random_string = generate_random_string(rng=rng)
             if random_string not in self.field.choices:
                 return random_string
 
@@ -78,8 +105,9 @@ class InvalidChoiceValueProvider(InvalidValueProvider):
 class InvalidTypeValueProvider(InvalidValueProvider):
 
     invalid_data_type = InvalidDataType.INVALID_TYPE.value
+    constant = True
 
-    def get_invalid_value(self):
+    def get_invalid_value(self, rng=random):
         pass
 
 
@@ -87,25 +115,26 @@ class ExceedMaxLengthValueProvider(InvalidValueProvider):
 
     invalid_data_type = InvalidDataType.EXCEED_MAX_LENGTH.value
 
-    def get_invalid_value(self):
+    def get_invalid_value(self, rng=random):
         assert self.field.max_length is not None, "Field must have max_length"
-        return generate_random_string(self.field.max_length + 1)
+        return generate_random_string(self.field.max_length + 1, rng=rng)
 
 
 class ExceedMinLengthValueProvider(InvalidValueProvider):
 
     invalid_data_type = InvalidDataType.EXCEED_MIN_LENGTH.value
 
-    def get_invalid_value(self):
+    def get_invalid_value(self, rng=random):
         assert self.field.min_length is not None, "Field must have min_length"
-        return generate_random_string(self.field.min_length - 1)
+        return generate_random_string(self.field.min_length - 1, rng=rng)
 
 
 class ExceedMaxValueValueProvider(InvalidValueProvider):
 
     invalid_data_type = InvalidDataType.EXCEED_MAX_VALUE.value
+    constant = True
 
-    def get_invalid_value(self):
+    def get_invalid_value(self, rng=random):
         assert self.field.max_value is not None, "Field must have max_value"
         return self.field.max_value + 1
 
@@ -113,26 +142,30 @@ class ExceedMaxValueValueProvider(InvalidValueProvider):
 class ExceedMinValueValueProvider(InvalidValueProvider):
 
     invalid_data_type = InvalidDataType.EXCEED_MIN_VALUE.value
+    constant = True
 
-    def get_invalid_value(self):
+    def get_invalid_value(self, rng=random):
         assert self.field.min_value is not None, "Field must have min_value"
         return self.field.min_value - 1
 
 
 class InvalidDictValueProvider(InvalidValueProvider):
+    """
+    Provides the dicts with one invalid sub field, as `JsonOverlay` objects on the valid value of the field.
+    """
 
     invalid_data_type = InvalidDataType.INVALID_DICT.value
 
-    def provide(self):
+    def provide(self, rng=None):
         field = self.field
         values = []
+        base = JsonOverlay(field.valid_value)
 
         for field_name, field_instance in field.fields.items():
 
             # If field is required, remove it from the dict
             if field_instance.required:
-                valid = copy.deepcopy(field.fake_valid())
-                del valid[field_name]
+                valid = base.remove((field_name,))
                 values.append(
                     InvalidDictValue(
                         value=valid,
@@ -141,9 +174,8 @@ class InvalidDictValueProvider(InvalidValueProvider):
                     )
                 )
 
-            for invalid_value in field_instance.fake_invalid():
-                valid = copy.deepcopy(field.fake_valid())
-                valid[field_name] = invalid_value.value
+            for invalid_value in field_instance.fake_invalid(rng):
+                valid = base.replace((field_name,), invalid_value.value)
                 values.append(
                     InvalidDictValue(
                         value=valid,
@@ -153,3 +185,14 @@ class InvalidDictValueProvider(InvalidValueProvider):
                 )
 
         return values
+
+    def plan(self):
+        planned = []
+        for field_name, field_instance in self.field.fields.items():
+            if field_instance.required:
+                planned.append(PlannedInvalidValue((field_name,), InvalidDataType.MISSING_REQUIRE, True, None, None))
+
+            for item in field_instance.get_invalid_plan():
+                planned.append(item._replace(path=(field_name,) + item.path))
+
+        return planned
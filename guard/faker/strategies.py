@@ -0,0 +1,167 @@
+import abc
+import inspect
+import itertools
+import random
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+from guard.faker.enums import InvalidStrategyType
+
+
+class Mutation(namedtuple('Mutation', ['field_name', 'whole_field', 'type', 'value', 'removed'])):
+    """
+    A change making one field of the valid data invalid: its value replaced by `value`, or removed.
+    """
+    __slots__ = ()
+
+
+class StrategyMeta(abc.ABCMeta):
+
+    strategy_registry: Dict[str, Type['InvalidStrategy']] = {}
+
+    def __new__(cls, name, bases, class_attrs, **kwargs):
+        new_cls = super().__new__(cls, name, bases, class_attrs, **kwargs)
+        if not inspect.isabstract(new_cls):
+            cls.strategy_registry[new_cls.strategy_type] = new_cls
+        return new_cls
+
+
+class InvalidStrategy(metaclass=StrategyMeta):
+    """
+    A strategy combining the mutations of the fields into invalid data.
+
+    Every combination it generates is a tuple of mutations of distinct fields, applied together to the valid data.
+    """
+
+    strategy_type: str = None
+
+    @abc.abstractmethod
+    def combine(self, mutations: Dict[str, List[Mutation]]) -> Iterator[Tuple[Mutation, ...]]:
+        """
+        Generate the combinations of the mutations, keyed by field name in declaration order.
+        """
+
+    def with_seed(self, seed: Optional[int]) -> 'InvalidStrategy':
+        """
+        Get the strategy to use with the random generator seeded with `seed`, e.g. the seed of a `Faker`.
+        Strategies not drawing at random are returned as is.
+        """
+        return self
+
+    @classmethod
+    def get_strategy(cls, strategy_type, **kwargs):
+        if strategy_type not in cls.strategy_registry:
+            raise ValueError(f'Invalid strategy_type: {strategy_type}')
+        return cls.strategy_registry[strategy_type](**kwargs)
+
+
+class OneAtATimeStrategy(InvalidStrategy):
+    """
+    Every mutation alone, one field invalid at a time.
+    """
+
+    strategy_type = InvalidStrategyType.ONE_AT_A_TIME.value
+
+    def combine(self, mutations: Dict[str, List[Mutation]]) -> Iterator[Tuple[Mutation, ...]]:
+        for field_mutations in mutations.values():
+            for mutation in field_mutations:
+                yield (mutation,)
+
+
+class NWiseStrategy(InvalidStrategy):
+    """
+    A covering array of strength `n`: every combination of mutations of `n` distinct fields
+    is applied together in at least one case, with far fewer cases than the cross product.
+
+    The array is built greedily, every case covering as many of the combinations not covered yet as it can,
+    the fields that would not cover any of them are left valid.
+
+    Args:
+        n (int, optional): The number of fields combined. Defaults to 2, pairwise.
+    """
+
+    strategy_type = InvalidStrategyType.N_WISE.value
+
+    def __init__(self, n: int = 2) -> None:
+        assert n >= 1, '`n` must be greater than or equal to 1.'
+        self.n = n
+
+    def combine(self, mutations: Dict[str, List[Mutation]]) -> Iterator[Tuple[Mutation, ...]]:
+        fields = [field_mutations for field_mutations in mutations.values() if field_mutations]
+        n = min(self.n, len(fields))
+        if n <= 1:
+            yield from OneAtATimeStrategy().combine(mutations)
+            return
+
+        # A combination is a sorted tuple of `(field index, mutation index)` pairs.
+        uncovered = {
+            combination
+            for indices in itertools.combinations(range(len(fields)), n)
+            for combination in itertools.product(*([(index, value) for value in range(len(fields[index]))] for index in indices))
+        }
+        while uncovered:
+            row = dict(min(uncovered))
+            for index in range(len(fields)):
+                if index in row:
+                    continue
+                best, best_count = None, 0
+                for value in range(len(fields[index])):
+                    if (count := self._count_covered(uncovered, row, index, value, n)) > best_count:
+                        best, best_count = value, count
+                if best is not None:
+                    row[index] = best
+
+            for combination in itertools.combinations(sorted(row.items()), n):
+                uncovered.discard(combination)
+            yield tuple(fields[index][value] for index, value in sorted(row.items()))
+
+    @staticmethod
+    def _count_covered(uncovered: set, row: Dict[int, int], index: int, value: int, n: int) -> int:
+        count = 0
+        for others in itertools.combinations(row.items(), n - 1):
+            if tuple(sorted(others + ((index, value),))) in uncovered:
+                count += 1
+        return count
+
+
+class RandomStrategy(InvalidStrategy):
+    """
+    `budget` distinct combinations drawn at random, each of 1 to `max_fields` fields,
+    reproducible with a `seed`. Without one, a `Faker` seeds it with its own seed.
+
+    Args:
+        budget (int, optional): The number of combinations. Defaults to 100.
+        seed (int, optional): The seed of the random draws.
+        max_fields (int, optional): The maximum number of fields combined. Defaults to 2.
+    """
+
+    strategy_type = InvalidStrategyType.RANDOM.value
+
+    # The number of draws per combination before giving up, when there are fewer combinations than the budget.
+    MAX_ATTEMPTS = 10
+
+    def __init__(self, budget: int = 100, seed: Optional[int] = None, max_fields: int = 2) -> None:
+        assert budget >= 0, '`budget` must be greater than or equal to 0.'
+        assert max_fields >= 1, '`max_fields` must be greater than or equal to 1.'
+        self.budget = budget
+        self.seed = seed
+        self.max_fields = max_fields
+
+    def with_seed(self, seed: Optional[int]) -> 'RandomStrategy':
+        if self.seed is not None or seed is None:
+            return self
+        return RandomStrategy(budget=self.budget, seed=seed, max_fields=self.max_fields)
+
+    def combine(self, mutations: Dict[str, List[Mutation]]) -> Iterator[Tuple[Mutation, ...]]:
+        fields = [field_mutations for field_mutations in mutations.values() if field_mutations]
+        if not fields:
+            return
+        rng = random.Random(self.seed)
+        seen = set()
+        for _ in range(self.budget * self.MAX_ATTEMPTS):
+            if len(seen) >= self.budget:
+                return
+            indices = sorted(rng.sample(range(len(fields)), rng.randint(1, min(self.max_fields, len(fields)))))
+            combination = tuple((index, rng.randrange(len(fields[index]))) for index in indices)
+            if combination not in seen:
+                seen.add(combination)
+                yield tuple(fields[index][value] for index, value in combination)
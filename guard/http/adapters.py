@@ -0,0 +1,83 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from guard.http.response import JsonResponse
+from guard.http.timing import get_connect_time, reset_connect_time, timed_pool_classes_by_scheme
+
+
+class HttpAdapter(HTTPAdapter):
+    """
+    An HTTP adapter that can close keep-alive connections left idle for too long.
+    Its responses are `JsonResponse` objects, which decode their body only once.
+    The time spent opening connections and sending the request is recorded on them,
+    in `connect_time` and `send_time`.
+
+    Gateways and load balancers drop idle connections on their side after a while,
+    reusing such a connection fails or stalls the request. With `keep_alive_timeout`,
+    the pooled connections to a host that has not been used for that many seconds
+    are closed before the next request, so a fresh connection is opened instead.
+
+    Args:
+        keep_alive_timeout (float, optional): Seconds a connection may stay idle in the pool.
+            Defaults to None, connections are kept until the server closes them.
+        **kwargs: Keyword arguments for `requests.adapters.HTTPAdapter`,
+            e.g. `pool_connections`, `pool_maxsize`, `pool_block` and `max_retries`.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['keep_alive_timeout']
+
+    def __init__(self, keep_alive_timeout: Optional[float] = None, **kwargs: Any) -> None:
+        self.keep_alive_timeout = keep_alive_timeout
+        self._last_used: Dict[Tuple[str, str, Optional[int]], float] = {}
+        super().__init__(**kwargs)
+
+    def __setstate__(self, state):
+        self._last_used = {}
+        super().__setstate__(state)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = timed_pool_classes_by_scheme
+
+    def send(self, request, **kwargs):
+        reset_connect_time()
+        start = time.perf_counter()
+        response = self._send(request, **kwargs)
+        response.send_time = time.perf_counter() - start
+        response.connect_time = get_connect_time()
+        return response
+
+    def _send(self, request, **kwargs):
+        if self.keep_alive_timeout is None:
+            return super().send(request, **kwargs)
+
+        url = urlparse(request.url)
+        host = (url.scheme, url.hostname, url.port)
+        last_used = self._last_used.get(host)
+        if last_used is not None and time.monotonic() - last_used > self.keep_alive_timeout:
+            self.close_idle_connections(self._get_pool(request, **kwargs))
+
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            self._last_used[host] = time.monotonic()
+
+    def build_response(self, req, resp):
+        return JsonResponse.from_response(super().build_response(req, resp))
+
+    def _get_pool(self, request, verify=True, cert=None, proxies=None, **kwargs):
+        # `get_connection_with_tls_context` replaced `get_connection` in requests 2.32.
+        if hasattr(self, 'get_connection_with_tls_context'):
+            return self.get_connection_with_tls_context(request, verify, proxies=proxies, cert=cert)
+        return self.get_connection(request.url, proxies)
+
+    @staticmethod
+    def close_idle_connections(pool) -> None:
+        """
+        This method is used to close the idle connections of a connection pool.
+        Closed connections stay in the pool and reconnect when they are used again.
+        """
+        for conn in list(pool.pool.queue if pool.pool is not None else []):
+            if conn is not None:
+                conn.close()
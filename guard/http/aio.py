@@ -0,0 +1,151 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Optional
+from requests.hooks import dispatch_hook
+from requests.models import PreparedRequest, Request, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from guard.http.client import HttpClient, BearerAuthenticatedHttpClient
+from guard.http.hooks import log_response
+from guard.http.response import JsonResponse
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncHttpClient:
+    """
+    This class is used to send HTTP requests on an asyncio event loop.
+
+    Requests are built by the wrapped `HttpClient`, so endpoint prefixing,
+    `Authentication.set_authentication`, session headers and cookies behave
+    exactly as in the blocking client. The transport is `httpx.AsyncClient`
+    and every response is converted to a `JsonResponse`, so assertions
+    and hooks work unchanged.
+
+    Args:
+        client (HttpClient, optional): The client used to build requests. Defaults to a new `HttpClient`.
+        concurrency (int, optional): The maximum number of requests in flight. Defaults to 100.
+
+    Examples:
+        >>> from guard.http.aio import AsyncHttpClient
+        >>> from guard.http.client import HttpClient
+        >>> client = AsyncHttpClient(HttpClient('http://xxx.com'), concurrency=200)
+        >>> await use_case.aexecute(client)
+    """
+
+    def __init__(self, client: Optional[HttpClient] = None, concurrency: int = 100) -> None:
+        if httpx is None:
+            raise ImportError('AsyncHttpClient requires `httpx`. Install it with `pip install api-guard[aio]`.')
+        assert concurrency >= 1, '`concurrency` must be greater than or equal to 1.'
+        self.client = client or HttpClient()
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._transport: Optional['httpx.AsyncClient'] = None
+
+    @property
+    def endpoint(self) -> Optional[str]:
+        return self.client.endpoint
+
+    @property
+    def authentication(self):
+        return self.client.authentication
+
+    def _get_transport(self) -> 'httpx.AsyncClient':
+        if self._transport is None:
+            self._transport = httpx.AsyncClient(
+                verify=self.client.verify,
+                cert=self.client.cert,
+                timeout=None,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                    keepalive_expiry=self.client.keep_alive_timeout,
+                ),
+            )
+        return self._transport
+
+    async def send_request(self, request: Request, **kwargs: Any) -> Response:
+        """
+        This method is used to send a request.
+        """
+        response = await self._send_request(request, **kwargs)
+
+        # If the response status code is 401, it means that the token has expired.
+        # Then we need to refresh the token and retry the request.
+        if response.status_code == 401 and isinstance(self.client, BearerAuthenticatedHttpClient):
+            await asyncio.to_thread(self.authentication.refresh_token, response.auth_generation)
+            response = await self._send_request(request, **kwargs)
+
+        return response
+
+    async def _send_request(
+        self,
+        request: Request,
+        timeout: Optional[float] = None,
+        allow_redirects: bool = True,
+        **kwargs: Any,
+    ) -> Response:
+        if self.endpoint and not request.url.startswith('http'):
+            request.url = self.endpoint + request.url
+
+        if self.authentication:
+            request = self.authentication.set_authentication(request)
+
+        prep = self.client.prepare_request(request)
+        transport = self._get_transport()
+        async with self._semaphore:
+            start = time.perf_counter()
+            res = await transport.request(
+                prep.method,
+                prep.url,
+                headers=dict(prep.headers),
+                content=prep.body,
+                follow_redirects=allow_redirects,
+                timeout=timeout,
+            )
+            elapsed = time.perf_counter() - start
+
+        for cookie in res.cookies.jar:
+            self.client.cookies.set_cookie(cookie)
+
+        response = self._build_response(prep, res, elapsed)
+        # The generation of the token the request was sent with, see `BearerTokenAuthentication.set_authentication`.
+        response.auth_generation = getattr(request, 'auth_generation', None)
+        response = dispatch_hook('response', prep.hooks, response)
+        log_response(response)
+        return response
+
+    @staticmethod
+    def _build_response(prep: PreparedRequest, res: 'httpx.Response', elapsed: float) -> Response:
+        response = JsonResponse()
+        response.status_code = res.status_code
+        response.reason = res.reason_phrase
+        response.headers = CaseInsensitiveDict(res.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = str(res.url)
+        response.request = prep
+        response.elapsed = timedelta(seconds=elapsed)
+        response._content = res.content
+        # httpx reads the body with the headers, connections are not timed.
+        response.send_time = elapsed
+        # The body is downloaded already, `iter_content` slices it.
+        response._content_consumed = True
+        return response
+
+    async def aclose(self) -> None:
+        """
+        This method is used to close the transport.
+        """
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+    async def __aenter__(self) -> 'AsyncHttpClient':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
@@ -1,14 +1,18 @@
 from requests.models import Request
+import base64
 import contextlib
 import requests
 import json
-from typing import Optional, Dict
-from jsonpath_rw import parse
+import threading
+import time
+from typing import Any, Optional, Dict, Tuple
 from guard.settings.bases import app_settings
+from guard.utils import compile_json_path
 from guard.exceptions import APIAuthFailedException
 from guard.logger import logger
 from guard.http.enums import HttpAuthType
 from guard.http.hooks import log_response
+from guard.http.token_store import TokenEntry, TokenStore, token_store as default_token_store
 
 
 class Authentication:
@@ -47,6 +51,7 @@ class BearerTokenAuthentication(Authentication):
         bearer_auth_headers_template: Optional[Dict[str, str]],
         token_file: Optional[str] = None,
         retry: Optional[int] = None,
+        token_store: Optional[TokenStore] = None,
     ):
         """
         Args:
@@ -56,8 +61,11 @@ class BearerTokenAuthentication(Authentication):
                 e.g.
                     {
                         "access_token": "$.tokens.access",  # Defines the jsonpath to get access_token value.
-                        "refresh_token": "$.tokens.refresh"  # Defines the jsonpath to get refresh_token value.
+                        "refresh_token": "$.tokens.refresh",  # Defines the jsonpath to get refresh_token value.
+                        "expires_in": "$.tokens.expires_in"  # Optional, the lifetime of the token in seconds.
                     }
+                If `expires_in` is not defined, the expiry is read from the `exp` claim
+                of the token when it is a JWT.
             bearer_auth_headers_template: bearer auth headers
                 e.g.
                     {
@@ -66,7 +74,8 @@ class BearerTokenAuthentication(Authentication):
                 access_token is the key in auth_variables.
                 It will be replaced by the real access_token value.
 
-            token_file: The file used to cache the token.
+            token_file: The file used to cache the token, shared by every identity.
+            token_store: The store of cached tokens. Defaults to the process-wide store.
         """
         self.token_url = token_url
         self.token_file = token_file
@@ -75,6 +84,11 @@ class BearerTokenAuthentication(Authentication):
 
         self.auth_body = auth_body
 
+        # Tokens are cached per identity, so that clients authenticating
+        # against different token endpoints or with different credentials don't clobber each other.
+        self.token_store = token_store or default_token_store
+        self.token_key = TokenStore.make_key(token_url, auth_body)
+
         self.auth_variables = auth_variables
 
         # The bearer auth headers template.
@@ -95,31 +109,107 @@ class BearerTokenAuthentication(Authentication):
         #   }
         self._authentication = {}
 
+        # The time the token expires at, None if unknown.
+        self._expires_at: Optional[float] = None
+
+        # Incremented every time a new token is fetched,
+        # so that concurrent callers can tell whether the token they used has been refreshed.
+        self.generation = 0
+        # The current token and its generation, replaced together so they can be read without the lock.
+        self._current: Tuple[Dict[str, str], int] = ({}, 0)
+        self._lock = threading.RLock()
+
         self.get_auth_headers()
 
     def set_authentication(self, request: Request) -> Request:
-        request.headers.update(self.get_auth_headers())
+        """
+        Set the auth headers of `request`, and the `generation` of their token as `request.auth_generation`,
+        to be passed to `refresh_token` when the token is rejected.
+        """
+        headers, request.auth_generation = self.get_authentication()
+        request.headers.update(headers)
         return request
 
+    def get_authentication(self) -> Tuple[Dict[str, str], int]:
+        """
+        This method is used to get the auth headers with the `generation` of their token.
+        """
+        authentication, generation = self._current
+        if authentication and not self.is_expired():
+            return authentication, generation
+        with self._lock:
+            return self.get_auth_headers(), self.generation
+
+    def is_expired(self) -> bool:
+        return (
+            self._expires_at is not None
+            and time.time() >= self._expires_at - app_settings.TOKEN_EXPIRY_LEEWAY
+        )
+
     def get_auth_headers(self) -> Dict[str, str]:
-        if not self._authentication:
-            self._authentication = self.fetch_token()
-        return self._authentication
+        if self._authentication and not self.is_expired():
+            return self._authentication
 
-    def refresh_token(self):
-        self._authentication = {}
-        logger.info('Refreshing token...')
-        with contextlib.suppress(FileNotFoundError):
-            with open(self.token_file, 'w') as f:
-                json.dump({}, f)
-        return self.get_auth_headers()
+        with self._lock:
+            if self._authentication and self.is_expired():
+                logger.info('The token is about to expire.')
+                self._authentication = {}
+                self._expires_at = None
+
+            if not self._authentication:
+                self._authentication = self.fetch_token()
+                self.generation += 1
+                self._current = (self._authentication, self.generation)
+            return self._authentication
+
+    def refresh_token(self, generation: Optional[int] = None) -> Dict[str, str]:
+        """
+        Discard the current token and fetch a new one.
+
+        Args:
+            generation (int, optional): The `generation` of the token that was rejected.
+                If the token has been refreshed since, by another thread,
+                the new token is returned without fetching again.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return self._authentication
+
+            logger.info('Refreshing token...')
+            # Only drop the cached token if it is the rejected one,
+            # another process may have stored a fresh token already.
+            self.token_store.invalidate(self.token_key, self.token_file, self._authentication)
+            self._authentication = {}
+            self._expires_at = None
+            return self.get_auth_headers()
+
+    @staticmethod
+    def _get_jwt_expiry(token: Any) -> Optional[float]:
+        if not isinstance(token, str) or token.count('.') != 2:
+            return None
+        payload = token.split('.')[1]
+        with contextlib.suppress(ValueError, TypeError):
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            if isinstance(claims, dict) and isinstance(claims.get('exp'), (int, float)):
+                return float(claims['exp'])
+        return None
 
     def fetch_token(self) -> Dict[str, str]:
-        with contextlib.suppress(FileNotFoundError):
-            with open(self.token_file, 'r') as f:
-                if auth_data := json.load(f):
-                    return auth_data
+        if entry := self.token_store.get(self.token_key, self.token_file):
+            self._expires_at = entry.expires_at
+            return entry.authentication
 
+        with self.token_store.fetching(self.token_key, self.token_file):
+            # Another process may have fetched the token while we were waiting.
+            if entry := self.token_store.get(self.token_key, self.token_file):
+                self._expires_at = entry.expires_at
+                return entry.authentication
+            return self.request_token()
+
+    def request_token(self) -> Dict[str, str]:
+        """
+        This method is used to get a new token from the token endpoint and save it to the token store.
+        """
         # Make a request to the token endpoint to get the new token
         retries = 0
         error_msg = None
@@ -141,22 +231,34 @@ class BearerTokenAuthentication(Authentication):
         res_data = response.json()
 
         # TODO Welcome to explore a more elegant way to achieve !!!
+        auth_values = {}
         for key, value in self.auth_variables.items():
-            json_path_expr = parse(value)
+            json_path_expr = compile_json_path(value)
             if match := json_path_expr.find(res_data):
-                auth_val = match[0].value
+                auth_values[key] = match[0].value
 
+        authentication = {}
+        for key, auth_val in auth_values.items():
             for header_key, header_format_string in self.bearer_auth_headers_template.items():
                 # Replace the format string with the real value.
                 format_key = f'{{{key}}}'
                 if format_key in header_format_string:
-                    self._authentication[header_key] = header_format_string.replace(format_key, auth_val)
+                    authentication[header_key] = header_format_string.replace(format_key, str(auth_val))
 
-        if self._authentication:
+        if 'expires_in' in auth_values:
+            self._expires_at = time.time() + float(auth_values['expires_in'])
+        else:
+            self._expires_at = next(
+                (expiry for value in auth_values.values() if (expiry := self._get_jwt_expiry(value))),
+                None,
+            )
+
+        if authentication:
             logger.info("get the token ok.")
-            with open(self.token_file, 'w') as f:
-                json.dump(self._authentication, f)
-                logger.info(f"save the token to {self.token_file}")
-            return self._authentication
+            self.token_store.set(
+                self.token_key, self.token_file, TokenEntry(authentication, self._expires_at, time.time()),
+            )
+            logger.info(f"save the token to {self.token_file}")
+            return authentication
         else:
             raise APIAuthFailedException("Failed to get the token. The token is empty.")
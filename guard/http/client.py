@@ -1,11 +1,17 @@
 import requests
 import abc
+import copy
 import inspect
-from typing import Any, Type, Dict, Optional
+from typing import Any, Type, Dict, Optional, Union
 from requests.models import Response, Request
+from urllib3.util.retry import Retry
+from guard.settings.bases import app_settings
 from guard.http.enums import HttpAuthType
 from guard.http.auth import Authentication
+from guard.http.adapters import HttpAdapter
+from guard.http.registry import session_registry
 from guard.http.hooks import show_response_table, log_response
+from guard.http.payload import JsonOverlay
 
 
 class StrategyMeta(abc.ABCMeta):
@@ -22,25 +28,107 @@ class StrategyMeta(abc.ABCMeta):
 class HttpClient(requests.Session, metaclass=StrategyMeta):
     """
     This class is used to send HTTP requests.
+
+    Args:
+        endpoint (str, optional): The prefix of relative request urls.
+        authentication (Authentication, optional): The authentication of every request.
+        pool_connections (int, optional): The number of hosts whose connection pools are cached.
+        pool_maxsize (int, optional): The maximum number of connections kept alive per host.
+        pool_block (bool, optional): Whether to wait for a free connection
+            instead of opening one beyond `pool_maxsize`.
+        max_retries (int | Retry, optional): The retry policy of failed connections.
+        host_pool_maxsize (dict, optional): `pool_maxsize` overrides per url prefix.
+            e.g.
+                {
+                    "https://gateway.example.com": 50,
+                }
+        keep_alive_timeout (float, optional): Seconds an idle keep-alive connection may be reused.
+
+        Options left to None default to the `HTTP_*` values of `app_settings`.
+
+    Every instantiation creates a new session. Use `get_session` to share one session
+    per endpoint and authentication in the current thread.
     """
-    _instance_ = {}
 
     auth_type: str = None
 
-    # This method is used to implement the singleton pattern.
-    # For the same `endpoint` it ensures that only one instance of the class is created.
-    # The instance is stored in the class variable _instance_.
-    def __new__(cls, endpoint: str = None, **kwargs: Any):
-        if not endpoint:
-            return super().__new__(cls)
-        if endpoint not in cls._instance_:
-            cls._instance_[endpoint] = super().__new__(cls)
-        return cls._instance_[endpoint]
-
-    def __init__(self, endpoint: str = None, authentication: Optional[Authentication] = None, **kwargs: Any):
+    def __init__(
+        self,
+        endpoint: str = None,
+        authentication: Optional[Authentication] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: Optional[bool] = None,
+        max_retries: Union[int, Retry, None] = None,
+        host_pool_maxsize: Optional[Dict[str, int]] = None,
+        keep_alive_timeout: Optional[float] = None,
+        **kwargs: Any
+    ):
         self.endpoint = endpoint
         self.authentication = authentication
         super().__init__(**kwargs)
+        self.pool_options = {
+            'pool_connections': pool_connections,
+            'pool_maxsize': pool_maxsize,
+            'pool_block': pool_block,
+            'max_retries': max_retries,
+            'host_pool_maxsize': host_pool_maxsize,
+            'keep_alive_timeout': keep_alive_timeout,
+        }
+        self.configure_pool(**self.pool_options)
+
+    @property
+    def keep_alive_timeout(self) -> Optional[float]:
+        return self.get_adapter('http://').keep_alive_timeout
+
+    def configure_pool(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: Optional[bool] = None,
+        max_retries: Union[int, Retry, None] = None,
+        host_pool_maxsize: Optional[Dict[str, int]] = None,
+        keep_alive_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        This method is used to mount the connection pool adapters.
+        """
+        options = {
+            'pool_connections': app_settings.HTTP_POOL_CONNECTIONS if pool_connections is None else pool_connections,
+            'pool_maxsize': app_settings.HTTP_POOL_MAXSIZE if pool_maxsize is None else pool_maxsize,
+            'pool_block': app_settings.HTTP_POOL_BLOCK if pool_block is None else pool_block,
+            'max_retries': app_settings.HTTP_MAX_RETRIES if max_retries is None else max_retries,
+            'keep_alive_timeout': app_settings.HTTP_KEEP_ALIVE_TIMEOUT if keep_alive_timeout is None else keep_alive_timeout,
+        }
+        self.mount('https://', HttpAdapter(**options))
+        self.mount('http://', HttpAdapter(**options))
+
+        # `requests` picks the adapter with the longest matching prefix.
+        if host_pool_maxsize is None:
+            host_pool_maxsize = app_settings.HTTP_HOST_POOL_MAXSIZE
+        for prefix, maxsize in host_pool_maxsize.items():
+            self.mount(prefix, HttpAdapter(**{**options, 'pool_maxsize': maxsize}))
+
+    @classmethod
+    def get_session(
+        cls,
+        endpoint: Optional[str] = None,
+        authentication: Optional[Authentication] = None,
+        **kwargs: Any
+    ) -> 'HttpClient':
+        """
+        This method is used to get the session of the current thread for `endpoint` and `authentication`.
+        The session is constructed once, later calls return the same object.
+        """
+        return session_registry.get_session(cls, endpoint, authentication, **kwargs)
+
+    @classmethod
+    def default_client(cls) -> 'HttpClient':
+        """
+        This method is used to get the shared client of the use cases executed without a client,
+        so that they reuse its pooled connections instead of opening new ones.
+        """
+        return HttpClient.get_session()
 
     @classmethod
     def get_client(cls, auth_type: Optional[str] = None, **kwargs: Any) -> 'HttpClient':
@@ -48,10 +136,26 @@ class HttpClient(requests.Session, metaclass=StrategyMeta):
         This method is used to get the client object.
         """
         if not auth_type:
-            return cls(**kwargs)
+            return cls.get_session(**kwargs)
         if auth_type not in cls.auth_registry:
             raise ValueError(f'Invalid auth type: {auth_type}')
-        return cls.auth_registry[auth_type](**kwargs)
+        return cls.auth_registry[auth_type].get_session(**kwargs)
+
+    def clone(self) -> 'HttpClient':
+        """
+        This method is used to create a new session with the same configuration.
+        The new session owns its own connection pool while sharing the `authentication` object.
+        """
+        client = type(self)(self.endpoint, self.authentication, **self.pool_options)
+        client.headers = self.headers.copy()
+        client.cookies = self.cookies.copy()
+        client.auth = self.auth
+        client.proxies = self.proxies.copy()
+        client.params = self.params.copy()
+        client.verify = self.verify
+        client.cert = self.cert
+        client.trust_env = self.trust_env
+        return client
 
     def request(
         self,
@@ -88,11 +192,19 @@ class HttpClient(requests.Session, metaclass=StrategyMeta):
         }
         send_kwargs |= settings
         res = self.send(prep, **send_kwargs)
+        res.auth_generation = getattr(req, 'auth_generation', None)
         if show_table:
             show_response_table(res, json_path, ignore_show_keys)
         log_response(res)
         return res
 
+    def prepare_request(self, request: Request):
+        # A `JsonOverlay` body is only built now, on a copy, the request keeps the overlay.
+        if isinstance(request.json, JsonOverlay):
+            request = copy.copy(request)
+            request.json = request.json.materialize()
+        return super().prepare_request(request)
+
     def send_request(self, request: Request, **kwargs: Any) -> Response:
         """
         This method is used to send a request.
@@ -106,6 +218,8 @@ class HttpClient(requests.Session, metaclass=StrategyMeta):
 
         prep = self.prepare_request(request)
         res = self.send(prep, **kwargs)
+        # The generation of the token the request was sent with, see `BearerTokenAuthentication.set_authentication`.
+        res.auth_generation = getattr(request, 'auth_generation', None)
         log_response(res)
         return res
 
@@ -165,8 +279,9 @@ class BearerAuthenticatedHttpClient(HttpClient):
 
         # If the response status code is 401, it means that the token has expired.
         # Then we need to refresh the token and retry the request.
+        # Only the first of the concurrent requests rejected with the same token refreshes it.
         if response.status_code == 401:
-            self.authentication.refresh_token()
+            self.authentication.refresh_token(response.auth_generation)
             response = super().request(method, url, **kwargs)
 
         return response
@@ -176,8 +291,11 @@ class BearerAuthenticatedHttpClient(HttpClient):
 
         # If the response status code is 401, it means that the token has expired.
         # Then we need to refresh the token and retry the request.
+        # Only the first of the concurrent requests rejected with the same token refreshes it.
         if response.status_code == 401:
-            self.authentication.refresh_token()
+            # Release the connection, the body may not have been read with `stream=True`.
+            response.close()
+            self.authentication.refresh_token(response.auth_generation)
             response = super().send_request(request, **kwargs)
 
         return response
@@ -1,5 +1,7 @@
 import contextlib
 from functools import singledispatch
+from typing import Union
+from jsonpath_rw import JSONPath
 from requests.models import Response
 from guard.logger import logger
 from guard.utils import get_value_from_json_path, show_data_table
@@ -19,7 +21,7 @@ def log_response(response: Response, *args, **kwargs) -> None:
 
 def show_response_table(
     response: Response,
-    response_data_json_path: str,
+    response_data_json_path: Union[str, JSONPath],
     ignore_keys=None,
     only_keys=None,
     *args, **kwaargs
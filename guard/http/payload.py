@@ -0,0 +1,124 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class _Removed:
+    """
+    The value of a removed key, a singleton even once unpickled.
+    """
+
+    def __reduce__(self) -> str:
+        return '_REMOVED'
+
+    def __repr__(self) -> str:
+        return '<removed>'
+
+
+_REMOVED = _Removed()
+
+
+class JsonOverlay(Mapping):
+    """
+    A JSON object defined as changes on a shared base object, only built when it is needed,
+    e.g. when the request it is the body of is sent.
+
+    Payloads differing from a valid payload by a few fields, like the invalid payloads of `UseCaseFaker`,
+    share the valid payload as their base instead of each holding a deep copy of it.
+    `materialize()` copies the objects along the changed paths only, the rest of the base is shared,
+    so neither the base nor the built object must be modified in place. Overlays are immutable,
+    `replace` and `remove` return new ones. Values may be overlays themselves, they are built as well.
+    The object is built once, the first time it is needed, and kept by the overlay.
+
+    Args:
+        base (dict): The base object.
+        changes (Iterable, optional): The changes, in order, as `(path, value)` pairs,
+            the path being the tuple of keys leading to the value.
+
+    Examples:
+        >>> from guard.http.payload import JsonOverlay
+        >>> overlay = JsonOverlay({'name': 'guard', 'owner': {'id': 1}}).replace(('owner', 'id'), None)
+        >>> overlay.materialize()
+        {'name': 'guard', 'owner': {'id': None}}
+        >>> overlay.remove(('name',)).materialize()
+        {'owner': {'id': None}}
+    """
+
+    __slots__ = ('base', 'changes', '_data')
+
+    def __init__(self, base: Dict[str, Any], changes: Iterable[Tuple[Tuple[str, ...], Any]] = ()) -> None:
+        self.base = base
+        self.changes = tuple(changes)
+        self._data: Optional[Dict[str, Any]] = None
+
+    def replace(self, path: Tuple[str, ...], value: Any) -> 'JsonOverlay':
+        """
+        This method is used to get a new overlay with the value at `path` replaced by `value`.
+        """
+        return JsonOverlay(self.base, self.changes + ((tuple(path), value),))
+
+    def remove(self, path: Tuple[str, ...]) -> 'JsonOverlay':
+        """
+        This method is used to get a new overlay without the key at `path`.
+        """
+        return JsonOverlay(self.base, self.changes + ((tuple(path), _REMOVED),))
+
+    def dump_changes(self) -> List[list]:
+        """
+        This method is used to get the changes as JSON-compatible lists, `[path]` for a removed key,
+        `[path, value]` for a replaced value, the values being built. See `load_changes`.
+        """
+        return [
+            [list(path)] if value is _REMOVED else [list(path), materialize(value)]
+            for path, value in self.changes
+        ]
+
+    @classmethod
+    def load_changes(cls, base: Dict[str, Any], changes: Iterable[list]) -> 'JsonOverlay':
+        """
+        This method is used to get the overlay on `base` of the changes dumped by `dump_changes`.
+        """
+        return cls(base, ((tuple(change[0]), change[1] if len(change) > 1 else _REMOVED) for change in changes))
+
+    def materialize(self) -> Dict[str, Any]:
+        """
+        This method is used to build the JSON object.
+        """
+        if self._data is not None:
+            return self._data
+
+        data = dict(self.base)
+        # The ids of the objects copied already, the objects along the changed paths are copied once, the others are shared.
+        copied = {id(data)}
+        for path, value in self.changes:
+            node = data
+            for key in path[:-1]:
+                child = node[key]
+                if id(child) not in copied:
+                    child = node[key] = dict(child)
+                    copied.add(id(child))
+                node = child
+            if value is _REMOVED:
+                node.pop(path[-1], None)
+            else:
+                node[path[-1]] = materialize(value)
+        self._data = data
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.materialize()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.materialize())
+
+    def __len__(self) -> int:
+        return len(self.materialize())
+
+    def __repr__(self) -> str:
+        return f'<JsonOverlay {len(self.changes)} changes>'
+
+
+def materialize(value: Optional[Any]) -> Optional[Any]:
+    """
+    This function is used to build `value` if it is a `JsonOverlay`, other values are returned as is.
+    """
+    return value.materialize() if isinstance(value, JsonOverlay) else value
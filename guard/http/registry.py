@@ -0,0 +1,94 @@
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple, Type, TYPE_CHECKING
+from guard.http.auth import Authentication
+
+if TYPE_CHECKING:
+    from guard.http.client import HttpClient
+
+
+class SessionRegistry:
+    """
+    A registry of `HttpClient` sessions keyed by (worker, client class, endpoint, authentication),
+    or by (worker, template client) for the sessions cloned by `get_worker_session`.
+
+    `requests.Session` is not thread-safe, so every worker (by default the current thread)
+    gets its own session, constructed once and reused afterwards. Sessions of different
+    workers share the same `Authentication` object, hence the same token.
+
+    Examples:
+        >>> from guard.http.registry import session_registry
+        >>> from guard.http.client import HttpClient
+        >>> client = session_registry.get_session(HttpClient, endpoint='http://xxx.com')
+        >>> client is session_registry.get_session(HttpClient, endpoint='http://xxx.com')
+        True
+    """
+
+    def __init__(self) -> None:
+        # The sessions by key, with the object whose id is part of the key, kept alive so the id can't be reused.
+        self._sessions: Dict[Tuple, Tuple['HttpClient', Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(
+        cls: Type['HttpClient'],
+        endpoint: Optional[str],
+        authentication: Optional[Authentication],
+        worker: Optional[Hashable],
+        options: Dict[str, Any],
+    ) -> Tuple:
+        if worker is None:
+            worker = threading.get_ident()
+        return worker, cls, endpoint, id(authentication), repr(sorted(options.items()))
+
+    def get_session(
+        self,
+        cls: Type['HttpClient'],
+        endpoint: Optional[str] = None,
+        authentication: Optional[Authentication] = None,
+        worker: Optional[Hashable] = None,
+        **kwargs: Any,
+    ) -> 'HttpClient':
+        """
+        This method is used to get the session of `worker`, constructing it on first use.
+
+        Args:
+            cls (type): The `HttpClient` class.
+            endpoint (str, optional): The endpoint of the session.
+            authentication (Authentication, optional): The authentication of the session.
+            worker (Hashable, optional): The worker owning the session. Defaults to the current thread.
+            **kwargs: Keyword arguments for `cls`.
+        """
+        key = self._key(cls, endpoint, authentication, worker, kwargs)
+        with self._lock:
+            if key not in self._sessions:
+                session = cls(endpoint=endpoint, authentication=authentication, **kwargs)
+                self._sessions[key] = (session, authentication)
+            return self._sessions[key][0]
+
+    def get_worker_session(self, client: 'HttpClient', worker: Optional[Hashable] = None) -> 'HttpClient':
+        """
+        This method is used to get the session of `worker` configured like `client`.
+
+        The session is cloned from `client` itself, so clients configured differently,
+        e.g. with other headers or proxies, never share a session.
+        """
+        if worker is None:
+            worker = threading.get_ident()
+        key = (worker, 'clone', id(client))
+        with self._lock:
+            if key not in self._sessions:
+                self._sessions[key] = (client.clone(), client)
+            return self._sessions[key][0]
+
+    def close(self, worker: Optional[Hashable] = None) -> None:
+        """
+        This method is used to close and forget the sessions of `worker`, or all sessions if `worker` is None.
+        """
+        with self._lock:
+            keys = [key for key in self._sessions if worker is None or key[0] == worker]
+            sessions = [self._sessions.pop(key)[0] for key in keys]
+        for session in sessions:
+            session.close()
+
+
+session_registry = SessionRegistry()
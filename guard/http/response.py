@@ -0,0 +1,137 @@
+import codecs
+import json
+import time
+from datetime import timedelta
+from typing import Any, Optional
+from requests.exceptions import JSONDecodeError
+from requests.models import Response
+from guard.settings.bases import app_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_MISSING = object()
+
+
+class JsonResponse(Response):
+    """
+    A `requests.Response` that decodes its JSON body only once.
+
+    Assertions, hooks and reports all call `json()` on the same response,
+    the first call decodes the body and the later ones get the same object back,
+    so callers must not modify it. Decoding errors are cached as well.
+    With `app_settings.USE_ORJSON`, UTF-8 bodies are decoded with `orjson` when it is installed,
+    and with `json` when `orjson` rejects them.
+
+    Timings, in seconds, are recorded when known: `connect_time` spent opening connections,
+    `send_time` spent sending the request and receiving the response, and `decode_time` spent decoding JSON.
+
+    `HttpClient` and `AsyncHttpClient` return `JsonResponse` objects.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._reset()
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._json = _MISSING
+        self.connect_time: Optional[float] = None
+        self.send_time: Optional[float] = None
+        self.decode_time = 0.0
+
+    @classmethod
+    def from_response(cls, response: Response) -> 'JsonResponse':
+        """
+        This method is used to turn a `requests.Response` into a `JsonResponse` in place.
+        """
+        if not isinstance(response, cls):
+            response.__class__ = cls
+            response._reset()
+        return response
+
+    def json(self, **kwargs: Any) -> Any:
+        # Custom decoding options bypass the cache.
+        if kwargs:
+            return super().json(**kwargs)
+
+        if self._json is _MISSING:
+            start = time.perf_counter()
+            try:
+                self._json = self._decode()
+            except JSONDecodeError as e:
+                self._json = e
+            self.decode_time += time.perf_counter() - start
+
+        if isinstance(self._json, JSONDecodeError):
+            raise self._json
+        return self._json
+
+    def _decode(self) -> Any:
+        if orjson is None or not app_settings.USE_ORJSON or not self.content or not self._is_utf8():
+            return super().json()
+        try:
+            return orjson.loads(self.content)
+        except orjson.JSONDecodeError:
+            # `json` accepts more than `orjson`, e.g. `NaN` and `Infinity`.
+            return super().json()
+
+    def _is_utf8(self) -> bool:
+        if self.encoding is None:
+            # `requests` guesses the encoding of the body, JSON is UTF-8 unless it has a BOM.
+            return not self.content.startswith((codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE))
+        try:
+            return codecs.lookup(self.encoding).name == 'utf-8'
+        except LookupError:
+            return False
+
+
+class ResponseSnapshot:
+    """
+    A lightweight copy of a response, kept once the response itself has been released.
+
+    The status, headers and request are kept, but only the first `max_size` bytes of the body.
+    A body that was never downloaded, e.g. one sent with `stream=True`, is only read that far.
+
+    Args:
+        response (Response): The response.
+        max_size (int): The maximum number of bytes of the body kept.
+    """
+
+    def __init__(self, response: Response, max_size: int) -> None:
+        self.status_code = response.status_code
+        self.reason = response.reason
+        self.url = response.url
+        self.headers = response.headers
+        self.encoding = response.encoding
+        self.request = response.request
+        self.elapsed: Optional[timedelta] = getattr(response, 'elapsed', None)
+
+        if response._content is False:
+            content = next(response.iter_content(max_size + 1), b'')
+            response.close()
+        else:
+            content = response.content or b''
+        self.truncated = len(content) > max_size
+        self.content = content[:max_size]
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self, **kwargs: Any) -> Any:
+        if self.truncated:
+            raise JSONDecodeError('The body of the response snapshot is truncated', self.text, len(self.text))
+        try:
+            return json.loads(self.content, **kwargs)
+        except json.JSONDecodeError as e:
+            raise JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+    def __repr__(self) -> str:
+        return f'<ResponseSnapshot [{self.status_code}]>'
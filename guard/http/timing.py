@@ -0,0 +1,58 @@
+import threading
+import time
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+_local = threading.local()
+
+
+def reset_connect_time() -> None:
+    """
+    This function is used to reset the time spent opening connections in the current thread.
+    """
+    _local.connect_time = 0.0
+
+
+def get_connect_time() -> float:
+    """
+    This function is used to get the time spent opening connections in the current thread since the last reset.
+    """
+    return getattr(_local, 'connect_time', 0.0)
+
+
+class TimedConnectionMixin:
+    """
+    Counts the time spent opening the connection, DNS lookup, TCP connect and TLS handshake included,
+    in the current thread. Reused keep-alive connections take no time.
+    """
+
+    def connect(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _local.connect_time = get_connect_time() + time.perf_counter() - start
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+# The `pool_classes_by_scheme` of the pool managers of `HttpAdapter`.
+timed_pool_classes_by_scheme = {
+    'http': TimedHTTPConnectionPool,
+    'https': TimedHTTPSConnectionPool,
+}
@@ -0,0 +1,138 @@
+import contextlib
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Dict, Optional
+from guard.settings.bases import app_settings
+from guard.utils import atomic_write_json, file_lock
+
+
+class TokenEntry(namedtuple('TokenEntry', ['authentication', 'expires_at', 'saved_at'])):
+    """
+    A cached token.
+
+    Args:
+        authentication (dict): The authentication headers.
+        expires_at (float): The time the token expires at, None if unknown.
+        saved_at (float): The time the token was fetched at.
+    """
+    __slots__ = ()
+
+    def is_valid(self, ttl: Optional[float] = None) -> bool:
+        now = time.time()
+        if self.expires_at is not None and now >= self.expires_at - app_settings.TOKEN_EXPIRY_LEEWAY:
+            return False
+        return ttl is None or now - self.saved_at < ttl
+
+
+class TokenStore:
+    """
+    A cache of bearer tokens keyed by identity, i.e. by token url and credentials.
+
+    Tokens are looked up in memory first, then in a JSON file shared by every process
+    on the machine and holding one entry per identity. The file is only read and
+    written under a file lock, and entries older than `ttl` seconds are ignored.
+
+    Args:
+        ttl (float, optional): Seconds a token without known expiry is reused.
+            Defaults to `app_settings.TOKEN_CACHE_TTL`.
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self.ttl = ttl
+        self._entries: Dict[str, TokenEntry] = {}
+        self._lock = threading.Lock()
+
+    def get_ttl(self) -> Optional[float]:
+        return app_settings.TOKEN_CACHE_TTL if self.ttl is None else self.ttl
+
+    @staticmethod
+    def make_key(token_url: str, auth_body: Any) -> str:
+        """
+        This method is used to get the key of an identity. Credentials are only stored hashed.
+        """
+        identity = json.dumps([token_url, auth_body], sort_keys=True, default=str)
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Dict[str, Any]]:
+        with contextlib.suppress(FileNotFoundError, json.JSONDecodeError):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            # Skip anything else, e.g. a cache written by an older version.
+            return {
+                key: value for key, value in data.items()
+                if isinstance(value, dict) and 'authentication' in value
+            } if isinstance(data, dict) else {}
+        return {}
+
+    def get(self, key: str, path: str) -> Optional[TokenEntry]:
+        """
+        This method is used to get the valid token of `key`, from memory or from the file at `path`.
+        """
+        ttl = self.get_ttl()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry.is_valid(ttl):
+            return entry
+
+        with file_lock(path):
+            value = self._read(path).get(key)
+        if value is None:
+            return None
+
+        entry = TokenEntry(value['authentication'], value.get('expires_at'), value.get('saved_at', 0))
+        if not entry.is_valid(ttl):
+            return None
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def set(self, key: str, path: str, entry: TokenEntry) -> None:
+        """
+        This method is used to save the token of `key` in memory and in the file at `path`.
+        Invalid entries of other identities are dropped from the file.
+        """
+        ttl = self.get_ttl()
+        with self._lock:
+            self._entries[key] = entry
+        with file_lock(path):
+            data = {
+                _key: value for _key, value in self._read(path).items()
+                if TokenEntry(value['authentication'], value.get('expires_at'), value.get('saved_at', 0)).is_valid(ttl)
+            }
+            data[key] = entry._asdict()
+            atomic_write_json(path, data)
+
+    def invalidate(self, key: str, path: str, authentication: Optional[Dict[str, str]] = None) -> None:
+        """
+        This method is used to drop the token of `key`.
+
+        Args:
+            authentication (dict, optional): Only drop the token if it is still this one,
+                so that a token refreshed meanwhile by another process is kept.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (authentication is None or entry.authentication == authentication):
+                del self._entries[key]
+        with file_lock(path):
+            data = self._read(path)
+            value = data.get(key)
+            if value is not None and (authentication is None or value['authentication'] == authentication):
+                del data[key]
+                atomic_write_json(path, data)
+
+    @contextlib.contextmanager
+    def fetching(self, key: str, path: str):
+        """
+        A lock held while the token of `key` is fetched,
+        so that concurrent processes authenticate only once per identity.
+        """
+        with file_lock(f'{path}.{key[:16]}'):
+            yield
+
+
+token_store = TokenStore()
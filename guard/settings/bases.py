@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from collections.abc import Mapping
 
 
@@ -55,5 +55,44 @@ class AppSettings:
 
     TOKEN_RETRY = 3
 
+    # Tokens are refreshed this many seconds before they expire.
+    TOKEN_EXPIRY_LEEWAY = 30
+
+    # Cached tokens without a known expiry are reused for this many seconds, None to reuse them forever.
+    TOKEN_CACHE_TTL: Optional[float] = 3600
+
+    # Connection pool defaults of `HttpClient`.
+    HTTP_POOL_CONNECTIONS = 10
+    HTTP_POOL_MAXSIZE = 10
+    HTTP_POOL_BLOCK = False
+    HTTP_MAX_RETRIES = 0
+    HTTP_HOST_POOL_MAXSIZE: Dict[str, int] = {}
+    HTTP_KEEP_ALIVE_TIMEOUT = None
+
+    # Decode UTF-8 JSON bodies with `orjson` when it is installed. It is faster, but integers wider than 64 bits
+    # may not decode to the same value as with `json`. Bodies `orjson` rejects, e.g. with `NaN`, are decoded with `json`.
+    USE_ORJSON = False
+
+    # The maximum number of compiled JSONPath expressions kept in memory, None for unbounded.
+    JSON_PATH_CACHE_SIZE: Optional[int] = 1024
+
+    # Check every assertion of a use case and record all the failures, False to stop at the first one.
+    EXHAUSTIVE_ASSERTIONS = False
+
+    # The number of seconds between the progress logs of a run, 0 to disable them.
+    RESULT_PROGRESS_INTERVAL: float = 5
+
+    # What the runner keeps of the response of a case once its result is evaluated:
+    # `all`, `failures` (failed cases only), `summary` (a `ResponseSnapshot`) or `none`.
+    # The responses of a case are kept until the cases depending on it have finished.
+    RESPONSE_RETENTION = 'all'
+    # The number of bytes of the body kept by a `summary` snapshot.
+    RESPONSE_SNAPSHOT_SIZE = 4096
+
+    # The seed of the fake data of every `Faker`, None for different data on every run.
+    FAKER_SEED: Optional[int] = None
+    # The directory the fake data sets are cached in, keyed by the schema of their `Faker`, None to disable the cache.
+    FAKER_CACHE_DIR: Optional[str] = None
+
 
 app_settings = AppSettings()
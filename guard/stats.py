@@ -0,0 +1,118 @@
+import math
+import time
+from typing import Dict, Iterable, Optional
+
+
+class LatencyHistogram:
+    """
+    A histogram of durations with a bounded relative error, in the spirit of HDR histograms.
+
+    Durations are counted in logarithmic buckets, so its size depends on the range of the
+    durations, never on their number, and percentiles are exact within `precision`.
+    Histograms recorded separately, e.g. in other threads or processes, can be merged.
+
+    Args:
+        precision (float, optional): The relative error of the percentiles. Defaults to 0.01, 1%.
+
+    Examples:
+        >>> from guard.stats import LatencyHistogram
+        >>> histogram = LatencyHistogram()
+        >>> for duration in (0.010, 0.012, 0.250):
+        >>>     histogram.record(duration)
+        >>> histogram.percentile(50)
+        0.012
+    """
+
+    # Durations are counted in microseconds, shorter ones fall in the first bucket.
+    UNIT = 1e-6
+
+    def __init__(self, precision: float = 0.01) -> None:
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, duration: float, count: int = 1) -> None:
+        """
+        This method is used to count `count` occurrences of `duration`, in seconds.
+        """
+        bucket = int(math.log(max(duration / self.UNIT, 1.0)) / self._log_base)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += count
+        self.total += duration * count
+        self.min = duration if self.min is None else min(self.min, duration)
+        self.max = duration if self.max is None else max(self.max, duration)
+
+    def extend(self, durations: Iterable[float]) -> None:
+        for duration in durations:
+            self.record(duration)
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """
+        This method is used to add the counts of `other`, recorded with the same precision, to this histogram.
+        """
+        assert other.precision == self.precision, 'Histograms with different precisions cannot be merged.'
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        This method is used to get the duration, in seconds, `percent` % of the durations are shorter than or equal to.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # The middle of the bucket, clamped to the recorded range.
+                value = math.exp((bucket + 0.5) * self._log_base) * self.UNIT
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class PhaseTimer:
+    """
+    A stopwatch splitting a duration into consecutive phases.
+
+    Examples:
+        >>> timer = PhaseTimer()
+        >>> execute_pre_hooks()
+        >>> timer.lap('pre_hooks')
+        >>> timer.timings
+        {'pre_hooks': 0.0012}
+    """
+
+    def __init__(self) -> None:
+        self.start = self._last = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    def lap(self, phase: str) -> float:
+        """
+        This method is used to end `phase`, which started at the end of the previous one.
+        """
+        now = time.perf_counter()
+        self.timings[phase] = now - self._last
+        self._last = now
+        return self.timings[phase]
+
+    @property
+    def elapsed(self) -> float:
+        return self._last - self.start
@@ -1,6 +1,6 @@
 from .bases import UseCase
 from .unit import UnitUseCase
-from .suitus import UseCaseSuite
+from .suitus import UseCaseSuite, LazyUseCaseSuite
 from .hooks import (
     show_usecase_table,
     setup_data,
@@ -13,6 +13,7 @@ __all__ = (
     'UseCase',
     'UnitUseCase',
     'UseCaseSuite',
+    'LazyUseCaseSuite',
     'show_usecase_table',
     'setup_data',
     'clean_up',
@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 from typing import Dict, List, Optional, Union, Callable
 from guard.logger import logger
@@ -13,12 +14,15 @@ class UseCase:
         name: str = None,
         pre_hooks: Optional[List[dict]] = None,
         post_hooks: Optional[List[dict]] = None,
+        depends_on: Optional[List['UseCase']] = None,
     ):
         self.name = name or self._name
         self.passed = True
         self.failed_reason = []
         self.pre_hooks = pre_hooks or []
         self.post_hooks = post_hooks or []
+        self.depends_on: List[UseCase] = []
+        self.extend_dependencies(depends_on or [])
 
     def add_pre_hook(self, hook: dict) -> None:
         """
@@ -69,25 +73,47 @@ class UseCase:
         for hook in hooks:
             self.add_post_hook(hook)
 
+    def add_dependency(self, usecase: 'UseCase') -> None:
+        """
+        This method is used to declare a use case that must finish before this one starts.
+        """
+        assert isinstance(usecase, UseCase), '`usecase` must be `UseCase`'
+        if usecase is not self and all(usecase is not dependency for dependency in self.depends_on):
+            self.depends_on.append(usecase)
+
+    def extend_dependencies(self, usecases: list) -> None:
+        """
+        This method is used to extend dependencies.
+        """
+        for usecase in usecases:
+            self.add_dependency(usecase)
+
     def do_fail(self):
         self.passed = False
 
     def add_failed_reason(self, reason: str):
         self.failed_reason.append(reason)
 
+    def _resolve_hook(self, hook: dict):
+        func = hook.get('func')
+        if func is None or not callable(func):
+            return None
+        args = hook.get('args', [])
+        kwargs = dict(hook.get('kwargs', {}))
+        func_signature = inspect.signature(func)
+        func_params = func_signature.parameters.keys()
+        if 'usecase' in func_params:
+            kwargs['usecase'] = self
+        return func, args, kwargs
+
     def execute_hooks(self, hooks):
         """
         This method is used to execute hooks.
         """
         for hook in hooks:
-            func = hook.get('func')
-            if func is not None and callable(func):
-                func_signature = inspect.signature(func)
-                func_params = func_signature.parameters.keys()
-                if 'usecase' in func_params:
-                    func(usecase=self, *hook.get('args', []), **hook.get('kwargs', {}))
-                else:
-                    func(*hook.get('args', []), **hook.get('kwargs', {}))
+            if resolved := self._resolve_hook(hook):
+                func, args, kwargs = resolved
+                func(*args, **kwargs)
 
     def execute_post_hooks(self) -> None:
         """
@@ -101,5 +127,33 @@ class UseCase:
         """
         self.execute_hooks(self.pre_hooks)
 
+    async def aexecute_hooks(self, hooks):
+        """
+        This method is used to execute hooks on the event loop.
+        Coroutine functions are awaited, blocking functions run in a worker thread.
+        """
+        for hook in hooks:
+            if resolved := self._resolve_hook(hook):
+                func, args, kwargs = resolved
+                if inspect.iscoroutinefunction(func):
+                    await func(*args, **kwargs)
+                else:
+                    await asyncio.to_thread(func, *args, **kwargs)
+
+    async def aexecute_post_hooks(self) -> None:
+        """
+        This method is used to execute post hooks on the event loop.
+        """
+        await self.aexecute_hooks(self.post_hooks)
+
+    async def aexecute_pre_hooks(self) -> None:
+        """
+        This method is used to execute pre hooks on the event loop.
+        """
+        await self.aexecute_hooks(self.pre_hooks)
+
     def execute(self, *args, **kwargs):
         raise NotImplementedError
+
+    async def aexecute(self, *args, **kwargs):
+        raise NotImplementedError
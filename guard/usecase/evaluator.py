@@ -1,40 +1,173 @@
-from typing import List, Union
-from guard.usecase.unit import UnitUseCase
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+from guard.logger import logger
+from guard.settings.bases import app_settings
+from guard.stats import LatencyHistogram
+from guard.usecase.unit import UnitUseCase, TIMING_PHASES
 from guard.usecase.suitus import UseCaseSuite
+from guard.usecase.result import CaseResult, collect_results
+from guard.usecase.sink import ResultSink
 from prettytable import PrettyTable
 from colorama import Fore
 import json
 
 
+# Path segments made of digits or long hexadecimal ids, replaced by `{id}` to group the endpoints.
+_ID_SEGMENT = re.compile(r'(?<=/)(?:\d+|[0-9a-fA-F-]{16,})(?=/|$)')
+
+# The percentiles shown in the latency tables.
+PERCENTILES = (50, 95, 99)
+
+
+def get_endpoint(url: str) -> str:
+    """
+    This function is used to get the endpoint of `url`, its path with the ids replaced by `{id}`.
+    """
+    return _ID_SEGMENT.sub('{id}', urlparse(url).path) or '/'
+
+
 class TestEvaluator:
+    """
+    A class to evaluate the results of the executed cases as they complete.
+
+    Results are pushed with `add_case` or `add_result`, counted and passed on to the sinks
+    right away. Only the failed results are kept for `show_test_result`.
+    Progress and throughput are logged every `progress_interval` seconds.
+    The durations of the cases and of their phases are aggregated into a `LatencyHistogram`
+    per method and endpoint, in `latencies`.
+
+    Args:
+        cases (list, optional): Cases or results to add right away.
+        total (int, optional): The number of results expected, shown in the progress. Defaults to None, unknown.
+        sinks (list, optional): The `ResultSink` every result is passed to.
+        progress_interval (float, optional): The number of seconds between progress logs, 0 to disable them.
+            Defaults to `app_settings.RESULT_PROGRESS_INTERVAL`.
 
-    def __init__(self, cases: List[Union[UnitUseCase, UseCaseSuite]]):
-        self.faliure_cases = []
-        self.cases = self._collect_unit_case(cases)
+    Examples:
+        >>> from guard.usecase.evaluator import TestEvaluator
+        >>> evaluator = TestEvaluator(total=len(cases))
+        >>> for case in cases:
+        >>>     case.execute()
+        >>>     evaluator.add_case(case)
+        >>> evaluator.close()
+        >>> evaluator.show_test_result()
+    """
 
-    def _collect_unit_case(self, cases):
-        new_cases = []
+    def __init__(
+        self,
+        cases: Optional[List[Union[UnitUseCase, UseCaseSuite, CaseResult]]] = None,
+        total: Optional[int] = None,
+        sinks: Optional[List[ResultSink]] = None,
+        progress_interval: Optional[float] = None,
+    ):
+        self.faliure_cases: List[CaseResult] = []
+        # {(method, endpoint): {'total' or phase: LatencyHistogram}}
+        self.latencies: Dict[Tuple[str, str], Dict[str, LatencyHistogram]] = defaultdict(
+            lambda: defaultdict(LatencyHistogram)
+        )
+        self.count = 0
+        self.total = total
+        self.sinks = list(sinks or [])
+        if progress_interval is None:
+            progress_interval = app_settings.RESULT_PROGRESS_INTERVAL
+        self.progress_interval = progress_interval
+        self.start_time = time.perf_counter()
+        self.end_time: Optional[float] = None
+        self._last_progress = self.start_time
+        self._lock = threading.Lock()
+        self.add_cases(cases or [])
+
+    def add_case(self, case: Union[UnitUseCase, UseCaseSuite, CaseResult]) -> None:
+        """
+        This method is used to add the results of an executed case, including the cases nested in suites.
+        """
+        for result in collect_results([case]):
+            self.add_result(result)
+
+    def add_cases(self, cases: Iterable[Union[UnitUseCase, UseCaseSuite, CaseResult]]) -> None:
         for case in cases:
-            if isinstance(case, UnitUseCase):
-                new_cases.append(case)
-                if not case.passed:
-                    self.faliure_cases.append(case)
-            if isinstance(case, UseCaseSuite):
-                new_cases.extend(case._cases)
-                for _case in case._cases:
-                    if not _case.passed:
-                        self.faliure_cases.append(_case)
-        return new_cases
+            self.add_case(case)
+
+    def add_result(self, result: CaseResult) -> None:
+        """
+        This method is used to add a single result.
+        """
+        with self._lock:
+            self.count += 1
+            if not result.passed:
+                self.faliure_cases.append(result)
+            self._record_latency(result)
+            for sink in self.sinks:
+                sink.add(result)
+            self._log_progress()
+
+    def _record_latency(self, result: CaseResult) -> None:
+        if result.duration is None:
+            return
+        histograms = self.latencies[(result.method, get_endpoint(result.url))]
+        histograms['total'].record(result.duration)
+        for phase, duration in (result.timings or {}).items():
+            histograms[phase].record(duration)
+
+    def get_phase_latencies(self) -> Dict[str, LatencyHistogram]:
+        """
+        This method is used to get the histograms of every phase, all the endpoints merged.
+        """
+        phases = defaultdict(LatencyHistogram)
+        for histograms in self.latencies.values():
+            for phase, histogram in histograms.items():
+                phases[phase].merge(histogram)
+        return {phase: phases[phase] for phase in ('total', *TIMING_PHASES) if phase in phases}
+
+    def _log_progress(self) -> None:
+        now = time.perf_counter()
+        if not self.progress_interval or now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        total = '?' if self.total is None else self.total
+        logger.info(
+            f'Progress: {self.count}/{total} cases, {len(self.faliure_cases)} failed, '
+            f'{self.throughput:.1f} cases/s.'
+        )
+
+    def close(self) -> None:
+        """
+        This method is used to close the sinks, the throughput stops counting.
+        """
+        if self.end_time is None:
+            self.end_time = time.perf_counter()
+        for sink in self.sinks:
+            sink.close()
 
     def get_not_passed_cases(self):
-        return [
-            case for case in self.cases
-            if not case.passed
-        ]
+        return list(self.faliure_cases)
+
+    @property
+    def throughput(self) -> float:
+        """
+        The number of results added per second.
+        """
+        elapsed = (self.end_time or time.perf_counter()) - self.start_time
+        return self.count / elapsed if elapsed > 0 else 0.0
 
     @property
     def pass_rate(self):
-        return 1 - len(self.faliure_cases) / len(self.cases) if self.cases else 0
+        return 1 - len(self.faliure_cases) / self.count if self.count else 0
+
+    @property
+    def failures_by_assertion(self) -> Dict[str, int]:
+        """
+        The number of failures of every assertion type, failures not raised by an assertion are counted as `Other`.
+        """
+        return Counter(
+            getattr(reason, 'assertion', None) or 'Other'
+            for case in self.faliure_cases
+            for reason in case.failed_reason
+        )
 
     @property
     def humen_pass_rate(self):
@@ -51,25 +184,49 @@ class TestEvaluator:
             for case in self.faliure_cases:
                 print(f'case_name | {Fore.RED}{case.name}')
                 print(f'status    | {Fore.RED}FAILURE')
-                if case.request.json:
-                    body = json.dumps(case.request.json)
+                if case.body:
+                    body = json.dumps(case.body)
                     print(f'body      | {Fore.RED}{body}')
                 reason = ''.join(f'<{error_message}>' for error_message in case.failed_reason)
                 print(f'reason    | {Fore.RED}{reason}')
+                print(f'response  | {Fore.RED}{case.response}')
+                print(Fore.RED+'-' * 150)
 
-                try:
-                    response = json.dumps(case.response.json())
-                except Exception:
-                    response = case.response.text
+        if failures := self.failures_by_assertion:
+            table = PrettyTable()
+            table.field_names = [f'{Fore.RED}assertion', 'failures']
+            for assertion, count in sorted(failures.items(), key=lambda item: -item[1]):
+                table.add_row([f'{Fore.RED}{assertion}', count])
+            print(table)
 
-                print(f'response  | {Fore.RED}{response}')
-                print(Fore.RED+'-' * 150)
+        if self.latencies:
+            self.show_latencies()
 
         table = PrettyTable()
         print(Fore.BLUE)
-        table.field_names = [f'{Fore.BLUE}total_cases', 'pass', 'faliure', 'pass_rate']
-        total = len(self.cases)
+        table.field_names = [f'{Fore.BLUE}total_cases', 'pass', 'faliure', 'pass_rate', 'cases/s']
+        total = self.count
         faliure = len(self.faliure_cases)
-        table.add_row([f'{Fore.BLUE}{total}', total-faliure, faliure, self.humen_pass_rate])
+        table.add_row([f'{Fore.BLUE}{total}', total-faliure, faliure, self.humen_pass_rate, f'{self.throughput:.1f}'])
         print(table)
         print(f'{Fore.RESET}')
+
+    def show_latencies(self):
+        """
+        This method is used to show the latency percentiles per endpoint and per phase, in milliseconds.
+        """
+        def row(histogram: LatencyHistogram) -> list:
+            return [histogram.count, *(f'{histogram.percentile(percent) * 1000:.1f}' for percent in PERCENTILES)]
+
+        percentiles = [f'p{percent} (ms)' for percent in PERCENTILES]
+        table = PrettyTable()
+        table.field_names = ['method', 'endpoint', 'cases', *percentiles]
+        for (method, endpoint), histograms in sorted(self.latencies.items(), key=lambda item: item[0][1]):
+            table.add_row([method, endpoint, *row(histograms['total'])])
+        print(table)
+
+        table = PrettyTable()
+        table.field_names = ['phase', 'cases', *percentiles]
+        for phase, histogram in self.get_phase_latencies().items():
+            table.add_row([phase, *row(histogram)])
+        print(table)
@@ -7,10 +7,13 @@ class UseCaseRegistry:
 
     def __init__(self) -> None:
         self._usecases = {}
+        # The names generated for the use cases registered without one.
+        self._generated_names = set()
 
     def register(self, usecase, name=None):
         if name is None:
             name = generate_random_string(20)
+            self._generated_names.add(name)
         if name not in self._usecases:
             self._usecases[name] = []
 
@@ -19,6 +22,15 @@ class UseCaseRegistry:
     def get_usecases(self):
         return [usecase for usecases in self._usecases.values() for usecase in usecases]
 
+    def get_named_usecases(self):
+        """
+        Get the use cases grouped by the name they were registered with, None for the ones registered without a name.
+        """
+        return [
+            (None if name in self._generated_names else name, usecases)
+            for name, usecases in self._usecases.items()
+        ]
+
 
 registry = UseCaseRegistry()
 
@@ -1,6 +1,8 @@
 import inspect
-from typing import List
+from typing import Dict, List
+from guard.usecase.bases import UseCase
 from guard.usecase.suitus import UseCaseSuite
+from guard.usecase.scheduler import CaseScheduler
 from guard.usecase.unit import UnitUseCase
 from guard.assertion.http import AssertHttpStatusCodeEqual, AssertHttpResponseListDict
 from guard.faker.bases import UseCaseFaker
@@ -199,6 +201,8 @@ class DeleteUseCaseMixin:
         if self.delete_pre_hooks:
             case.extend_pre_hooks(self.delete_pre_hooks)
 
+        return case
+
 
 class RetrieveUseCaseMixin:
 
@@ -341,7 +345,7 @@ class ListParamSearchUseCaseMixin:
 
                 cases.append(case)
 
-        return UseCaseSuite(cases)
+        return UseCaseSuite(cases, ordered=False)
 
 
 class ListParamFilterUseCaseMixin:
@@ -417,7 +421,7 @@ class ListParamFilterUseCaseMixin:
 
                 cases.append(case)
 
-        return UseCaseSuite(cases)
+        return UseCaseSuite(cases, ordered=False)
 
 
 class ListParamFilterAndSearchUseCaseMixin:
@@ -489,7 +493,7 @@ class ListParamFilterAndSearchUseCaseMixin:
 
                         cases.append(case)
 
-        return UseCaseSuite(cases)
+        return UseCaseSuite(cases, ordered=False)
 
 
 class RESTUseCaseSet(
@@ -512,6 +516,11 @@ class RESTUseCaseSet(
     enable = []
     disable = []
 
+    # The stages of a resource lifecycle, in the order they must run.
+    # Every stage depends on the previous stage that has use cases,
+    # so that e.g. the delete use cases never run before the create ones.
+    lifecycle = ('create', 'retrieve', 'update', 'partial_update', 'delete')
+
     def __init__(self, cases: List[UnitUseCase] | None = None):
         super().__init__(cases)
         self.discover_cases()
@@ -525,6 +534,7 @@ class RESTUseCaseSet(
         >>>     ...
         """
 
+        stages = {}
         for member_name, member in inspect.getmembers(self):
             if (
                 inspect.ismethod(member)
@@ -533,15 +543,36 @@ class RESTUseCaseSet(
                 and all(disable not in member_name for disable in self.disable)
             ):
                 if _cases := member():
-                    if isinstance(_cases, (list, tuple)):
-                        self.add_cases(_cases)
-                    else:
-                        self.add_case(_cases)
+                    if not isinstance(_cases, (list, tuple)):
+                        _cases = [_cases]
+                    self.add_cases(_cases)
+                    stages[member_name[len('add_'):-len('_use_cases')]] = _cases
+
+        self.chain_lifecycle(stages)
+
+    def chain_lifecycle(self, stages: Dict[str, List[UseCase]]) -> None:
+        """
+        This method is used to make every lifecycle stage depend on the previous one,
+        and to sort the use cases of the set in a valid execution order.
+        """
+        previous = []
+        for stage in self.lifecycle:
+            if cases := stages.get(stage):
+                for case in cases:
+                    case.extend_dependencies(previous)
+                previous = cases
+
+        scheduler = CaseScheduler(self._cases)
+        self._cases = [self._cases[index] for index in scheduler.static_order()]
 
 
 class FakerAutoRESTUseCaseSet(RESTUseCaseSet):
 
     def get_faker(self):
+        """
+        This method is used to get a new faker for a use case, its lazy suite keeps the valid data of the faker.
+        Creating it is cheap, the fields and invalid values are planned once per faker class.
+        """
         assert hasattr(self, 'faker_class'), 'You must define `faker_class` attribute in your class.'
         faker_class = self.faker_class
         assert isinstance(faker_class, type), '`faker_class` must be a class.'
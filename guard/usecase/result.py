@@ -0,0 +1,85 @@
+import json
+from collections import namedtuple
+from typing import List, Union
+from guard.assertion.bases import AssertionFailure
+from guard.http.payload import materialize
+from guard.usecase.bases import UseCase
+from guard.usecase.unit import UnitUseCase
+from guard.usecase.suitus import UseCaseSuite
+
+
+class CaseResult(namedtuple(
+    'CaseResult',
+    ['name', 'passed', 'failed_reason', 'method', 'url', 'body', 'response', 'duration', 'timings'],
+    defaults=[None, None],
+)):
+    """
+    The outcome of an executed `UnitUseCase`.
+
+    It only holds plain data, so it can be sent across processes
+    and kept after the use case itself has been released.
+    The request body and the response text are only kept for failed cases.
+    `duration` is the number of seconds the case took, None if it was not executed,
+    and `timings` its split into phases, see `UnitUseCase.timings`.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_usecase(cls, usecase: UnitUseCase) -> 'CaseResult':
+        body = response = None
+        if not usecase.passed:
+            body = materialize(usecase.request.json)
+            response = cls._dump_response(usecase.response)
+        return cls(
+            usecase.name,
+            usecase.passed,
+            list(usecase.failed_reason),
+            usecase.request.method,
+            usecase.request.url,
+            body,
+            response,
+            usecase.duration,
+            dict(usecase.timings),
+        )
+
+    def to_dict(self) -> dict:
+        """
+        This method is used to get the result as JSON-serializable data.
+        Assertion failures are also listed with their details under `failures`.
+        """
+        return {
+            'name': self.name,
+            'passed': self.passed,
+            'duration': self.duration,
+            'timings': self.timings,
+            'method': self.method,
+            'url': self.url,
+            'failed_reason': [str(reason) for reason in self.failed_reason],
+            'failures': [reason._asdict() for reason in self.failed_reason if isinstance(reason, AssertionFailure)],
+            'body': self.body,
+            'response': self.response,
+        }
+
+    @staticmethod
+    def _dump_response(response) -> str | None:
+        if response is None:
+            return None
+        try:
+            return json.dumps(response.json())
+        except Exception:
+            return response.text
+
+
+def collect_results(cases: List[Union[UseCase, CaseResult]]) -> List[CaseResult]:
+    """
+    This function is used to collect the results of unit use cases, including the ones nested in suites.
+    """
+    results = []
+    for case in cases:
+        if isinstance(case, CaseResult):
+            results.append(case)
+        elif isinstance(case, UnitUseCase):
+            results.append(CaseResult.from_usecase(case))
+        elif isinstance(case, UseCaseSuite):
+            results.extend(collect_results(case.get_cases()))
+    return results
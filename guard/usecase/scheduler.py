@@ -0,0 +1,103 @@
+from graphlib import TopologicalSorter, CycleError
+from typing import Dict, Iterator, List, Set
+from guard.usecase.bases import UseCase
+from guard.usecase.suitus import LazyUseCaseSuite, UseCaseSuite
+from guard.logger import logger
+
+
+def iter_usecases(usecase: UseCase, expand_lazy: bool = False) -> Iterator[UseCase]:
+    """
+    This function is used to iterate over a use case and, for suites, all nested use cases.
+
+    The cases of a `LazyUseCaseSuite` not generated yet are skipped,
+    unless `expand_lazy` is True, they are then generated for this iteration only.
+    """
+    yield usecase
+    if isinstance(usecase, LazyUseCaseSuite) and not usecase.materialized:
+        if expand_lazy:
+            for case in usecase.iter_cases():
+                yield from iter_usecases(case, expand_lazy)
+    elif isinstance(usecase, UseCaseSuite):
+        for case in usecase.get_cases():
+            yield from iter_usecases(case, expand_lazy)
+
+
+class CaseScheduler:
+    """
+    A class to schedule use cases according to their `depends_on`.
+
+    Every top-level case is a node of a DAG. A dependency on a case nested
+    in a suite is a dependency on the top-level case containing it, and
+    a dependency that is not part of the run is considered satisfied.
+
+    Args:
+        cases (list): The top-level use cases.
+
+    Examples:
+        >>> scheduler = CaseScheduler(cases)
+        >>> scheduler.prepare()
+        >>> while scheduler.is_active():
+        >>>     for index in scheduler.get_ready():
+        >>>         cases[index].execute()
+        >>>         scheduler.done(index)
+    """
+
+    def __init__(self, cases: List[UseCase]) -> None:
+        self.cases = cases
+        self.graph = self._build_graph()
+        self._sorter = None
+
+    def _build_graph(self) -> Dict[int, Set[int]]:
+        owners = {}
+        for index, case in enumerate(self.cases):
+            for member in iter_usecases(case):
+                owners[id(member)] = index
+
+        graph = {}
+        for index, case in enumerate(self.cases):
+            dependencies = set()
+            for member in iter_usecases(case):
+                for dependency in member.depends_on:
+                    owner = owners.get(id(dependency))
+                    if owner is None:
+                        logger.warning(f'`{member.name}` depends on `{dependency.name}` which is not scheduled.')
+                        continue
+                    if owner != index:
+                        dependencies.add(owner)
+            graph[index] = dependencies
+
+        try:
+            tuple(TopologicalSorter(graph).static_order())
+        except CycleError as e:
+            names = ' -> '.join(str(self.cases[index].name) for index in e.args[1])
+            raise ValueError(f'Circular dependency between use cases: {names}') from e
+        return graph
+
+    def static_order(self) -> List[int]:
+        """
+        This method is used to get the indexes of the cases in a valid execution order.
+        Among the cases that are ready at the same time, the original order is kept.
+        """
+        order = []
+        self.prepare()
+        while self.is_active():
+            for index in self.get_ready():
+                order.append(index)
+                self.done(index)
+        return order
+
+    def prepare(self) -> None:
+        self._sorter = TopologicalSorter(self.graph)
+        self._sorter.prepare()
+
+    def is_active(self) -> bool:
+        return self._sorter.is_active()
+
+    def get_ready(self) -> List[int]:
+        """
+        This method is used to get the indexes of the cases whose dependencies have all finished.
+        """
+        return sorted(self._sorter.get_ready())
+
+    def done(self, index: int) -> None:
+        self._sorter.done(index)
@@ -0,0 +1,140 @@
+import json
+import re
+import time
+from typing import Any
+from xml.sax.saxutils import escape, quoteattr
+from guard.usecase.result import CaseResult
+
+# The characters XML 1.0 does not allow, they are dropped from the reports.
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+class ResultSink:
+    """
+    The base of the destinations `TestEvaluator` passes every case result to as soon as it is added.
+
+    Sinks write each result as it comes instead of holding all of them,
+    so nothing is lost when a run is interrupted.
+    """
+
+    def add(self, result: CaseResult) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'ResultSink':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class JsonLinesSink(ResultSink):
+    """
+    A sink writing every result to a JSON Lines file, one object per line, flushed right away.
+
+    Args:
+        path (str): The path of the file, truncated when the sink is created.
+        failures_only (bool, optional): Only write the failed results. Defaults to False.
+    """
+
+    def __init__(self, path: str, failures_only: bool = False) -> None:
+        self.path = path
+        self.failures_only = failures_only
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def add(self, result: CaseResult) -> None:
+        if self.failures_only and result.passed:
+            return
+        self._file.write(json.dumps(result.to_dict(), default=str, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class FailureFileSink(JsonLinesSink):
+    """
+    A sink writing every failed result to a JSON Lines file, one object per line, flushed right away.
+
+    Args:
+        path (str): The path of the file, truncated when the sink is created.
+
+    Examples:
+        >>> from guard.usecase.evaluator import TestEvaluator
+        >>> from guard.usecase.sink import FailureFileSink
+        >>> evaluator = TestEvaluator(sinks=[FailureFileSink('failures.jsonl')])
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path, failures_only=True)
+
+
+def _xml_text(value: Any) -> str:
+    return _INVALID_XML_CHARS.sub('', str(value))
+
+
+class JUnitXmlSink(ResultSink):
+    """
+    A sink writing every result to a JUnit XML report as a `testcase`, flushed right away.
+    The timings of the case are written as `timing.<phase>` properties.
+
+    The report is only well-formed once the sink is closed. The `testsuite` element
+    has no totals, which are only known at the end, CI systems count the test cases.
+
+    Args:
+        path (str): The path of the report, truncated when the sink is created.
+        name (str, optional): The name of the test suite. Defaults to `api-guard`.
+    """
+
+    def __init__(self, path: str, name: str = 'api-guard') -> None:
+        self.path = path
+        self.name = name
+        self._file = open(path, 'w', encoding='utf-8')
+        timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<testsuites>\n<testsuite name={quoteattr(name)} timestamp="{timestamp}">\n'
+        )
+        self._file.flush()
+
+    def add(self, result: CaseResult) -> None:
+        attributes = f'name={quoteattr(_xml_text(result.name))} classname={quoteattr(_xml_text(f"{result.method} {result.url}"))}'
+        if result.duration is not None:
+            attributes += f' time="{result.duration:.6f}"'
+        children = self._properties(result)
+        if not result.passed:
+            children += self._failure(result)
+        if children:
+            self._file.write(f'  <testcase {attributes}>\n{children}  </testcase>\n')
+        else:
+            self._file.write(f'  <testcase {attributes}/>\n')
+        self._file.flush()
+
+    @staticmethod
+    def _properties(result: CaseResult) -> str:
+        if not result.timings:
+            return ''
+        properties = ''.join(
+            f'      <property name="timing.{phase}" value="{duration:.6f}"/>\n'
+            for phase, duration in result.timings.items()
+        )
+        return f'    <properties>\n{properties}    </properties>\n'
+
+    @staticmethod
+    def _failure(result: CaseResult) -> str:
+        reasons = [_xml_text(reason) for reason in result.failed_reason]
+        message = reasons[0] if reasons else ''
+        failure_type = getattr(result.failed_reason[0], 'assertion', 'AssertionError') if reasons else 'AssertionError'
+        details = escape('\n'.join(reasons))
+        text = f'    <failure message={quoteattr(message)} type={quoteattr(failure_type)}>{details}</failure>\n'
+        if result.response is not None:
+            text += f'    <system-out>{escape(_xml_text(result.response))}</system-out>\n'
+        return text
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.write('</testsuite>\n</testsuites>\n')
+            self._file.close()
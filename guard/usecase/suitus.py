@@ -1,13 +1,27 @@
+import asyncio
 import inspect
-from typing import List, Optional, Union, Callable, Dict, Any
+from typing import List, Optional, Union, Callable, Dict, Any, Iterable, Iterator
 from colorama import Fore
 from prettytable import PrettyTable
 import json
+from guard.http.payload import materialize
 from guard.usecase.unit import UnitUseCase
 from guard.usecase.bases import UseCase
 
 
 class UseCaseSuite(UseCase):
+    """
+    A suite of use cases.
+
+    Args:
+        cases (list): Use cases.
+        pre_hooks (list): Hooks executed before the cases.
+        post_hooks (list): Hooks executed after the cases.
+        ordered (bool): Whether the cases must run one after another.
+            If ordered is False, the cases are independent of each other
+            and may run concurrently.
+        depends_on (list): Use cases that must finish before this suite starts.
+    """
 
     show_result = False
     show_response_body = False
@@ -17,15 +31,24 @@ class UseCaseSuite(UseCase):
         cases: Optional[List[UnitUseCase]] = None,
         pre_hooks: Optional[List[dict]] = None,
         post_hooks: Optional[List[dict]] = None,
+        ordered: bool = True,
+        depends_on: Optional[List[UseCase]] = None,
     ):
         self._cases = cases or []
         self.pre_hooks = pre_hooks or []
         self.post_hooks = post_hooks or []
-        super().__init__()
+        self.ordered = ordered
+        super().__init__(depends_on=depends_on)
 
     def get_cases(self) -> List[UnitUseCase]:
         return self._cases
 
+    def iter_cases(self) -> Iterator[UseCase]:
+        """
+        This method is used to iterate over the cases of the suite.
+        """
+        return iter(self.get_cases())
+
     def add_case(self, case: UseCase) -> None:
         assert isinstance(case, UseCase), '`case` must be `UseCase`'
         self._cases.append(case)
@@ -35,8 +58,8 @@ class UseCaseSuite(UseCase):
             self.add_case(case)
 
     def show(self):
-        for case in self._cases:
-            body = json.dumps(case.request.json)
+        for case in self.get_cases():
+            body = json.dumps(materialize(case.request.json))
             if case.passed:
                 print(Fore.GREEN+'-' * 150)
                 print(f'case_name | {Fore.GREEN}{case.name}')
@@ -54,7 +77,7 @@ class UseCaseSuite(UseCase):
                 print(f'status    | {Fore.RED}FAILURE')
                 if case.request.json:
                     print(f'body      | {Fore.RED}{body}')
-                reason = ''.join(f'<{point.error_message}>' for point in case.failed_check_points)
+                reason = ''.join(f'<{error_message}>' for error_message in case.failed_reason)
                 print(f'reason    | {Fore.RED}{reason}')
                 if self.show_response_body:
                     try:
@@ -62,11 +85,89 @@ class UseCaseSuite(UseCase):
                     except Exception:
                         print(f'response  | {Fore.RED}{case.response.text}')
 
-    def execute(self, client=None) -> None:
+    def execute(self, client=None, exhaustive: Optional[bool] = None) -> None:
         self.execute_pre_hooks()
-        for test_case in self._cases:
-            test_case.execute(client)
+        for test_case in self.get_cases():
+            test_case.execute(client, exhaustive)
 
         if self.show_result:
             self.show()
         self.execute_post_hooks()
+
+    async def aexecute(self, client, exhaustive: Optional[bool] = None) -> None:
+        await self.aexecute_pre_hooks()
+        if self.ordered:
+            for test_case in self.get_cases():
+                await test_case.aexecute(client, exhaustive)
+        else:
+            await asyncio.gather(*(test_case.aexecute(client, exhaustive) for test_case in self.get_cases()))
+
+        if self.show_result:
+            self.show()
+        await self.aexecute_post_hooks()
+
+
+class LazyUseCaseSuite(UseCaseSuite):
+    """
+    A suite whose cases are generated when they are needed instead of being built up front.
+
+    `Runner` pulls the cases from `iter_cases()` as its workers become free, they are executed,
+    evaluated and dropped one after another, so only the cases in flight are held in memory.
+    `get_cases()` generates all the cases and keeps them, e.g. for a suite executed as a whole.
+    The post hooks of the suite, e.g. `clean_up`, read the cases that were executed: a suite with
+    post hooks keeps the cases `iter_cases()` yields, and `get_cases()` returns them afterwards.
+
+    Args:
+        factory (callable): Called without arguments, returns an iterable of new cases.
+        pre_hooks (list): Hooks executed before the cases.
+        post_hooks (list): Hooks executed after the cases.
+        ordered (bool): Whether the cases must run one after another. Defaults to False.
+        depends_on (list): Use cases that must finish before this suite starts.
+
+    Examples:
+        >>> from guard.usecase.suitus import LazyUseCaseSuite
+        >>> suite = LazyUseCaseSuite(lambda: (UnitUseCase('GET', f'http://xxx.com/{i}') for i in range(10000)))
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Iterable[UseCase]],
+        pre_hooks: Optional[List[dict]] = None,
+        post_hooks: Optional[List[dict]] = None,
+        ordered: bool = False,
+        depends_on: Optional[List[UseCase]] = None,
+    ):
+        super().__init__(pre_hooks=pre_hooks, post_hooks=post_hooks, ordered=ordered, depends_on=depends_on)
+        self.factory = factory
+        self._cases = None
+
+    @property
+    def materialized(self) -> bool:
+        """
+        Whether the cases have been generated and kept by `get_cases()`.
+        """
+        return self._cases is not None
+
+    def get_cases(self) -> List[UnitUseCase]:
+        if self._cases is None:
+            self._cases = list(self.factory())
+        return self._cases
+
+    def iter_cases(self) -> Iterator[UseCase]:
+        if self._cases is not None:
+            return iter(self._cases)
+        if self.post_hooks:
+            return self._iter_kept_cases()
+        return iter(self.factory())
+
+    def _iter_kept_cases(self) -> Iterator[UseCase]:
+        cases = []
+        for case in self.factory():
+            cases.append(case)
+            yield case
+        # Kept once they have all been generated, a partial iteration generates them anew.
+        self._cases = cases
+
+    def add_case(self, case: UseCase) -> None:
+        self.get_cases()
+        super().add_case(case)
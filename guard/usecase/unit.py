@@ -1,8 +1,19 @@
+import copy
 from typing import Optional, List, Dict, Any
 from requests.models import Request
+from guard.assertion.compiler import CompiledAssertions, compile_assertions
 from guard.http.client import HttpClient
+from guard.http.response import ResponseSnapshot
 from guard.usecase.bases import UseCase
 from guard.logger import logger
+from guard.settings.bases import app_settings
+from guard.stats import PhaseTimer
+
+
+RESPONSE_RETENTION_POLICIES = ('all', 'failures', 'summary', 'none')
+
+# The phases of the execution of a use case, in order, see `UnitUseCase.timings`.
+TIMING_PHASES = ('pre_hooks', 'prepare', 'connect', 'ttfb', 'download', 'decode', 'assertions', 'post_hooks')
 
 
 class UnitUseCase(UseCase):
@@ -15,6 +26,11 @@ class UnitUseCase(UseCase):
         name (str): Use case name.
         client (HttpClient): HTTP client.
         assertions (list): Assertions.
+        pre_hooks (list): Hooks executed before the request.
+        post_hooks (list): Hooks executed after the request.
+        depends_on (list): Use cases that must finish before this one starts.
+        exhaustive (bool): Check every assertion and record all the failures, False to stop at the first one.
+            Defaults to None, `app_settings.EXHAUSTIVE_ASSERTIONS`.
         **kwargs: Keyword arguments for requests.models.Request.
 
     Examples:
@@ -33,11 +49,13 @@ class UnitUseCase(UseCase):
         assertions: Optional[list] = None,
         pre_hooks: Optional[List[Dict[str, Any]]] = None,
         post_hooks: Optional[List[Dict[str, Any]]] = None,
+        depends_on: Optional[List[UseCase]] = None,
+        exhaustive: Optional[bool] = None,
         **kwargs
     ):
         if name is None:
             name = f'{method} {url}'
-        super().__init__(name)
+        super().__init__(name, depends_on=depends_on)
 
         self.client = client
         self.request = Request(method.upper(), url, **kwargs)
@@ -50,6 +68,28 @@ class UnitUseCase(UseCase):
         self.pre_hooks = pre_hooks or []
         self.post_hooks = post_hooks or []
         self.response = None
+        # The number of seconds the last execution took, hooks included, and its split into `TIMING_PHASES`.
+        self.duration: Optional[float] = None
+        self.timings: Dict[str, float] = {}
+        self.exhaustive = exhaustive
+        self.checker = compile_assertions(self.assertions)
+
+    @property
+    def stream(self) -> bool:
+        """
+        Whether the response body is streamed to the assertions instead of being downloaded first,
+        i.e. whether any assertion is in stream mode.
+        """
+        return self.get_checker().stream
+
+    def get_checker(self) -> CompiledAssertions:
+        """
+        This method is used to get the compiled assertions, they are compiled again if the assertions changed.
+        """
+        compiled = self.checker.assertions
+        if len(compiled) != len(self.assertions) or any(a is not b for a, b in zip(compiled, self.assertions)):
+            self.checker = compile_assertions(self.assertions)
+        return self.checker
 
     def set_name(self, name: str) -> None:
         """
@@ -143,42 +183,129 @@ class UnitUseCase(UseCase):
         """
         self.request.json = json
 
-    def execute(self, client=None) -> None:
+    def execute(self, client=None, exhaustive: Optional[bool] = None) -> None:
         """
         This method is used to execute the use case.
+
+        Args:
+            client (HttpClient, optional): The HTTP client.
+            exhaustive (bool, optional): Whether to check every assertion when the case does not set it,
+                see `check_assertions`.
         """
+        timer = PhaseTimer()
         self.execute_pre_hooks()
-        self.client = client
+        timer.lap('pre_hooks')
+        if client is not None:
+            self.client = client
         if self.client is None:
-            self.client = HttpClient()
-        response = self.client.send_request(self.request)
-        try:
-            for assertion in self.assertions:
-                assertion(response)
-        except AssertionError as e:
-            self.add_failed_reason(str(e))
+            self.client = HttpClient.default_client()
+        response = self.client.send_request(self.request, stream=self.stream)
+        timer.lap('request')
+        self.check_assertions(response, exhaustive)
+        timer.lap('assertions')
+        self.execute_post_hooks()
+        timer.lap('post_hooks')
+        self.record_timings(timer, response)
+
+    async def aexecute(self, client, exhaustive: Optional[bool] = None) -> None:
+        """
+        This method is used to execute the use case on the event loop.
+
+        Args:
+            client (AsyncHttpClient): The asynchronous HTTP client.
+            exhaustive (bool, optional): Whether to check every assertion when the case does not set it,
+                see `check_assertions`.
+        """
+        timer = PhaseTimer()
+        await self.aexecute_pre_hooks()
+        timer.lap('pre_hooks')
+        response = await client.send_request(self.request)
+        timer.lap('request')
+        self.check_assertions(response, exhaustive)
+        timer.lap('assertions')
+        await self.aexecute_post_hooks()
+        timer.lap('post_hooks')
+        self.record_timings(timer, response)
+
+    def record_timings(self, timer: PhaseTimer, response) -> None:
+        """
+        This method is used to split the execution time into `TIMING_PHASES`, with the timings recorded on the response.
+
+        `prepare` covers the authentication, the preparation of the request and its logging.
+        `connect` covers DNS, TCP connect and TLS handshake, it is missing when the client does not time connections.
+        `ttfb` runs until the headers are received. The body of a streamed response is read
+        by the assertions, so it counts in `assertions` rather than `download`.
+        """
+        timings = dict(timer.timings)
+        request = timings.pop('request')
+        send = getattr(response, 'send_time', None) or request
+        connect = getattr(response, 'connect_time', None)
+        elapsed = response.elapsed.total_seconds() if getattr(response, 'elapsed', None) is not None else send
+        decode = getattr(response, 'decode_time', 0.0)
+
+        timings['prepare'] = max(request - send, 0.0)
+        if connect is not None:
+            timings['connect'] = connect
+        timings['ttfb'] = max(elapsed - (connect or 0.0), 0.0)
+        timings['download'] = max(send - elapsed, 0.0)
+        timings['decode'] = decode
+        timings['assertions'] = max(timings['assertions'] - decode, 0.0)
+        self.timings = {phase: timings[phase] for phase in TIMING_PHASES if phase in timings}
+        self.duration = timer.elapsed
+
+    def check_assertions(self, response, exhaustive: Optional[bool] = None) -> None:
+        """
+        This method is used to check the assertions against the response.
+        In exhaustive mode every failure is recorded in `failed_reason` as an `AssertionFailure`,
+        otherwise checking stops at the first one, recorded as its error message.
+
+        Whether every assertion is checked is set by the case, else by `exhaustive`,
+        else by `app_settings.EXHAUSTIVE_ASSERTIONS`.
+        """
+        if self.exhaustive is not None:
+            exhaustive = self.exhaustive
+        elif exhaustive is None:
+            exhaustive = app_settings.EXHAUSTIVE_ASSERTIONS
+        if failures := self.get_checker()(response, fail_fast=not exhaustive):
+            for failure in failures:
+                self.add_failed_reason(failure if exhaustive else str(failure))
             self.do_fail()
         self.response = response
-        self.execute_post_hooks()
+
+    def release_response(self, policy: Optional[str] = None) -> None:
+        """
+        This method is used to release the response once it is not needed anymore.
+
+        Args:
+            policy (str, optional): What is kept of the response, one of `RESPONSE_RETENTION_POLICIES`:
+                `all` keeps it, `failures` keeps it only if the case failed,
+                `summary` replaces it with a `ResponseSnapshot` and `none` drops it.
+                Defaults to `app_settings.RESPONSE_RETENTION`.
+        """
+        policy = policy or app_settings.RESPONSE_RETENTION
+        assert policy in RESPONSE_RETENTION_POLICIES, f'Response retention policy {policy} is not supported.'
+        if self.response is None or isinstance(self.response, ResponseSnapshot):
+            return
+
+        if policy == 'summary':
+            self.response = ResponseSnapshot(self.response, app_settings.RESPONSE_SNAPSHOT_SIZE)
+        elif policy == 'none' or (policy == 'failures' and self.passed):
+            self.response = None
 
     def copy(self) -> 'UnitUseCase':
         """
         This method is used to copy the use case.
+
+        The request is copied shallowly, the copy shares its headers, body and other attributes
+        until they are set again, e.g. with `set_request_json`.
         """
-        return UnitUseCase(
+        case = UnitUseCase(
             self.request.method,
             self.request.url,
             self.name,
             self.client,
             self.assertions,
-            **{
-                'headers': getattr(self.request, 'headers', None),
-                'data': getattr(self.request, 'data', None),
-                'params': getattr(self.request, 'params', None),
-                'cookies': getattr(self.request, 'cookies', None),
-                'auth': getattr(self.request, 'auth', None),
-                'files': getattr(self.request, 'files', None),
-                'hooks': getattr(self.request, 'hooks', None),
-                'json': getattr(self.request, 'json', None)
-            }
+            exhaustive=self.exhaustive,
         )
+        case.request = copy.copy(self.request)
+        return case
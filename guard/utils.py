@@ -1,9 +1,22 @@
+import os
 import re
+import json
+import hashlib
 import string
 import random
+import tempfile
+import threading
+import contextlib
+from collections import OrderedDict, namedtuple
 from typing import Any, Dict, List, Union
-from jsonpath_rw import parse
+from jsonpath_rw import JSONPath, parse
 from prettytable import PrettyTable
+from guard.settings.bases import app_settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 
 def to_long_data(data):
@@ -12,11 +25,79 @@ def to_long_data(data):
     return '...' if len(str(data)) > 50 else data
 
 
+JsonPathCacheInfo = namedtuple('JsonPathCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class JsonPathCache:
+    """
+    A process-wide LRU cache of compiled JSONPath expressions.
+
+    `jsonpath_rw.parse` runs a PLY parser on every call, which costs far more
+    than evaluating the expression, so every JSONPath consumer compiles through this cache.
+
+    Args:
+        maxsize (int, optional): The maximum number of expressions kept.
+            Defaults to `app_settings.JSON_PATH_CACHE_SIZE`, None for unbounded.
+    """
+
+    def __init__(self, maxsize: int = None) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._expressions: 'OrderedDict[str, JSONPath]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_maxsize(self):
+        return app_settings.JSON_PATH_CACHE_SIZE if self.maxsize is None else self.maxsize
+
+    def compile(self, expr: str) -> JSONPath:
+        """
+        This method is used to get the compiled expression of `expr`.
+        """
+        with self._lock:
+            if (expression := self._expressions.get(expr)) is not None:
+                self._expressions.move_to_end(expr)
+                self.hits += 1
+                return expression
+            self.misses += 1
+
+        # Parse outside the lock, a concurrent miss on the same expression only costs a second parse.
+        expression = parse(expr)
+        with self._lock:
+            self._expressions[expr] = expression
+            maxsize = self.get_maxsize()
+            while maxsize is not None and len(self._expressions) > maxsize:
+                self._expressions.popitem(last=False)
+        return expression
+
+    def cache_info(self) -> JsonPathCacheInfo:
+        with self._lock:
+            return JsonPathCacheInfo(self.hits, self.misses, self.get_maxsize(), len(self._expressions))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expressions.clear()
+            self.hits = self.misses = 0
+
+
+json_path_cache = JsonPathCache()
+
+
+def compile_json_path(json_path_expr: Union[str, JSONPath]) -> JSONPath:
+    """
+    Get the compiled JSONPath expression of `json_path_expr` from the process-wide cache.
+    Already compiled expressions are returned as is.
+    """
+    if isinstance(json_path_expr, JSONPath):
+        return json_path_expr
+    return json_path_cache.compile(json_path_expr)
+
+
 def get_value_from_json_path(
     json_data: Union[Dict[str, Any], List[Any]],
-    json_path_expr: str,
+    json_path_expr: Union[str, JSONPath],
 ):
-    json_path_parser = parse(json_path_expr)
+    json_path_parser = compile_json_path(json_path_expr)
     return match[0].value if (match := json_path_parser.find(json_data)) else None
 
 
@@ -73,5 +154,63 @@ def is_valid_url(url):
         return False
 
 
-def generate_random_string(length=10, allow_string=string.ascii_letters+string.digits):
-    return ''.join(random.choice(allow_string) for _ in range(length))
+def generate_random_string(length=10, allow_string=string.ascii_letters+string.digits, rng=None):
+    return ''.join((rng or random).choices(allow_string, k=length))
+
+
+def generate_random_strings(count, length=10, allow_string=string.ascii_letters+string.digits, rng=None):
+    """
+    Generate `count` random strings of `length` characters, all the characters are drawn in one call.
+    """
+    chars = ''.join((rng or random).choices(allow_string, k=count * length))
+    return [chars[index:index + length] for index in range(0, count * length, length)]
+
+
+def stable_hash(value: str) -> int:
+    """
+    A hash of `value` that is the same in every process and on every machine,
+    unlike the builtin `hash` which is salted per process.
+    """
+    return int(hashlib.md5(value.encode('utf-8')).hexdigest()[:16], 16)
+
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """
+    An exclusive lock on `path` shared by every process of the machine.
+    It is held on a sibling `.lock` file, so `path` itself can be replaced while locked.
+    Without `fcntl` (e.g. on Windows) the lock is a no-op.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(f'{path}.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """
+    Write `data` as JSON to `path`, readers never see a partially written file.
+    """
+    atomic_write_bytes(path, json.dumps(data).encode('utf-8'))
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """
+    Write `data` to `path`, readers never see a partially written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
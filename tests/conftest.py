@@ -0,0 +1,86 @@
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# `guard.faker` can only be imported once `guard.usecase` is.
+import guard.usecase  # noqa: F401
+
+
+class Server:
+    """
+    A local HTTP server recording the requests it receives.
+
+    - `POST /items` creates an item and returns `{"id": <id>}` with 201.
+    - `DELETE /items/<id>` deletes it and returns 204.
+    - `GET /<status>` returns `status` with the JSON body `{"path": <path>}`,
+      after 0.1s when the query string contains `slow`.
+    """
+
+    def __init__(self) -> None:
+        self.requests = []
+        self.deleted = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.url = f'http://127.0.0.1:{self._httpd.server_address[1]}'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def _reply(self, status, body=None):
+                data = b'' if body is None else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _record(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                with server._lock:
+                    server.requests.append((self.command, self.path, body))
+
+            def do_POST(self):
+                self._record()
+                self._reply(201, {'id': next(server._ids)})
+
+            def do_DELETE(self):
+                self._record()
+                with server._lock:
+                    server.deleted.append(self.path)
+                self._reply(204)
+
+            def do_GET(self):
+                self._record()
+                path, _, query = self.path.partition('?')
+                if 'slow' in query:
+                    time.sleep(0.1)
+                status = path.strip('/').split('/')[0]
+                self._reply(int(status) if status.isdigit() else 200, {'path': path})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = Server()
+    server.start()
+    yield server
+    server.stop()
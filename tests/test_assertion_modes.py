@@ -0,0 +1,61 @@
+from guard.assertion.bases import AssertionFailure
+from guard.assertion.http import AssertHttpResponseValue, AssertHttpStatusCodeEqual
+from guard.bin.runner import Runner
+from guard.http.client import HttpClient
+from guard.settings.bases import app_settings
+from guard.usecase.unit import UnitUseCase
+
+
+def make_case(server, **kwargs):
+    return UnitUseCase(
+        'GET', f'{server.url}/404',
+        assertions=[AssertHttpStatusCodeEqual(200), AssertHttpResponseValue('$.path', '==', '/200')],
+        **kwargs,
+    )
+
+
+def test_stops_at_the_first_failure_by_default(server):
+    assert app_settings.EXHAUSTIVE_ASSERTIONS is False
+    case = make_case(server)
+
+    case.execute(HttpClient())
+
+    assert not case.passed
+    assert case.failed_reason == ['Assertion failed: invalid status code. Expected 200, but got 404.']
+    assert all(isinstance(reason, str) for reason in case.failed_reason)
+
+
+def test_exhaustive_records_every_failure(server):
+    case = make_case(server)
+
+    case.execute(HttpClient(), exhaustive=True)
+
+    assert not case.passed
+    assert len(case.failed_reason) == 2
+    assert all(isinstance(reason, AssertionFailure) for reason in case.failed_reason)
+    assert case.failed_reason[0].assertion == 'AssertHttpStatusCodeEqual'
+    assert case.failed_reason[1].json_path == '$.path'
+
+
+def test_case_setting_wins_over_the_argument(server):
+    case = make_case(server, exhaustive=False)
+
+    case.execute(HttpClient(), exhaustive=True)
+
+    assert len(case.failed_reason) == 1
+
+
+def test_setting_enables_exhaustive_mode(server, monkeypatch):
+    monkeypatch.setattr(app_settings, 'EXHAUSTIVE_ASSERTIONS', True)
+    case = make_case(server)
+
+    case.execute(HttpClient())
+
+    assert len(case.failed_reason) == 2
+
+
+def test_runner_options(tmp_path):
+    assert Runner(str(tmp_path)).exhaustive is None
+    assert Runner(str(tmp_path), exhaustive=True).exhaustive is True
+    assert Runner(str(tmp_path), fail_fast=True, exhaustive=True).exhaustive is False
+    assert app_settings.EXHAUSTIVE_ASSERTIONS is False
@@ -0,0 +1,79 @@
+import threading
+
+from requests.models import Request
+
+from guard.http.auth import BearerTokenAuthentication
+from guard.http.token_store import TokenStore
+
+
+def make_authentication(server, tmp_path, **auth_variables):
+    # Every POST to the test server returns a new id, used as the token.
+    return BearerTokenAuthentication(
+        token_url=f'{server.url}/items',
+        auth_body={'username': 'guard'},
+        auth_variables={'access_token': '$.id', **auth_variables},
+        bearer_auth_headers_template={'Authorization': 'Bearer {access_token}'},
+        token_file=str(tmp_path / 'token_cache.json'),
+        token_store=TokenStore(),
+    )
+
+
+def token_requests(server):
+    return sum(method == 'POST' for method, _, _ in server.requests)
+
+
+def test_refresh_is_single_flight(server, tmp_path):
+    authentication = make_authentication(server, tmp_path)
+    assert authentication.get_authentication() == ({'Authorization': 'Bearer 1'}, 1)
+
+    barrier = threading.Barrier(8)
+    results = []
+
+    def refresh():
+        barrier.wait()
+        results.append(authentication.refresh_token(generation=1))
+
+    threads = [threading.Thread(target=refresh) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert token_requests(server) == 2
+    assert authentication.generation == 2
+    assert results == [{'Authorization': 'Bearer 2'}] * 8
+
+
+def test_refresh_of_a_stale_generation_keeps_the_new_token(server, tmp_path):
+    authentication = make_authentication(server, tmp_path)
+    authentication.refresh_token(generation=1)
+
+    assert authentication.refresh_token(generation=1) == {'Authorization': 'Bearer 2'}
+    assert token_requests(server) == 2
+
+
+def test_refresh_without_generation_always_fetches(server, tmp_path):
+    authentication = make_authentication(server, tmp_path)
+    authentication.refresh_token()
+    authentication.refresh_token()
+
+    assert authentication.generation == 3
+    assert token_requests(server) == 3
+
+
+def test_request_carries_the_generation_of_its_token(server, tmp_path):
+    authentication = make_authentication(server, tmp_path)
+    request = authentication.set_authentication(Request('GET', f'{server.url}/200'))
+    authentication.refresh_token(request.auth_generation)
+    refreshed = authentication.set_authentication(Request('GET', f'{server.url}/200'))
+
+    assert (request.headers['Authorization'], request.auth_generation) == ('Bearer 1', 1)
+    assert (refreshed.headers['Authorization'], refreshed.auth_generation) == ('Bearer 2', 2)
+
+
+def test_expired_token_is_refreshed_proactively(server, tmp_path):
+    # The id of the first token is 1, it expires within the leeway.
+    authentication = make_authentication(server, tmp_path, expires_in='$.id')
+
+    assert authentication.is_expired()
+    assert authentication.get_auth_headers() == {'Authorization': 'Bearer 2'}
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from guard.bin.executor import CaseExecutor
+from guard.http.client import HttpClient
+from guard.usecase.suitus import UseCaseSuite
+from guard.usecase.unit import UnitUseCase
+
+
+def make_case(server, path, name, **kwargs):
+    return UnitUseCase('GET', f'{server.url}{path}', name=name, **kwargs)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_returns_the_cases_in_submission_order(server, workers):
+    cases = [make_case(server, f'/200?{"slow" if index % 2 else ""}', f'case {index}') for index in range(6)]
+
+    done = []
+    executed = CaseExecutor(HttpClient(), workers=workers, on_done=done.append).execute(cases)
+
+    assert [id(case) for case in executed] == [id(case) for case in cases]
+    assert sorted(map(id, done)) == sorted(map(id, cases))
+    assert all(case.response.status_code == 200 for case in cases)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_dependencies_finish_first(server, workers):
+    first = make_case(server, '/200?slow', 'first')
+    seen = {}
+    second = make_case(server, '/200', 'second', depends_on=[first])
+    second.add_pre_hook(lambda: seen.setdefault('first', first.response))
+    third = make_case(server, '/200', 'third', depends_on=[second])
+
+    done = []
+    CaseExecutor(HttpClient(), workers=workers, on_done=done.append).execute([third, second, first])
+
+    assert seen['first'] is not None
+    assert [case.name for case in done] == ['first', 'second', 'third']
+
+
+def test_dependency_on_a_suite_member(server):
+    member = make_case(server, '/200?slow', 'member')
+    suite = UseCaseSuite([member])
+    dependent = make_case(server, '/200', 'dependent', depends_on=[member])
+
+    done = []
+    CaseExecutor(HttpClient(), workers=4, on_done=done.append).execute([dependent, suite])
+
+    assert done.index(suite) < done.index(dependent)
+
+
+def test_independent_cases_run_concurrently(server):
+    cases = [make_case(server, '/200?slow', f'case {index}') for index in range(4)]
+
+    start = time.perf_counter()
+    CaseExecutor(HttpClient(), workers=4).execute(cases)
+
+    # Each case takes 0.1s, one after another they would take 0.4s.
+    assert time.perf_counter() - start < 0.35
+
+
+def test_workers_must_be_positive():
+    with pytest.raises(AssertionError):
+        CaseExecutor(HttpClient(), workers=0)
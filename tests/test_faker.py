@@ -0,0 +1,124 @@
+import os
+
+from guard.faker.bases import Faker
+from guard.faker.enums import InvalidDataType
+from guard.faker.fields import CharField, ChoiceField, DictField, IntegerField
+from guard.faker.strategies import RandomStrategy
+from guard.http.payload import materialize
+
+
+class UserFaker(Faker):
+    name = CharField(required=True, allow_null=False, max_length=20)
+    age = IntegerField(min_value=0, max_value=150)
+    role = ChoiceField(choices=['admin', 'user', 'guest'])
+    address = DictField(
+        required=True,
+        city=CharField(required=True, allow_null=False),
+        zip_code=IntegerField(min_value=10000, max_value=99999),
+    )
+
+
+class RandomUserFaker(UserFaker):
+
+    class Meta:
+        invalid_strategy = RandomStrategy(budget=5)
+
+
+def generate(faker):
+    valid = faker.fake_valid()
+    invalid = [
+        (materialize(item.data), item.field_name, item.type, item.whold_field)
+        for item in faker.iter_invalid_data()
+    ]
+    return valid, invalid
+
+
+def test_seeded_faker_is_reproducible():
+    first = generate(UserFaker(seed=7, cache_dir=''))
+
+    assert generate(UserFaker(seed=7, cache_dir='')) == first
+    assert generate(UserFaker(seed=8, cache_dir='')) != first
+
+
+def test_seeded_bulk_generation_is_reproducible():
+    assert UserFaker(seed=7, cache_dir='').fake_valid_many(5) == UserFaker(seed=7, cache_dir='').fake_valid_many(5)
+
+
+def test_unseeded_bulk_generation_draws_every_value():
+    data = UserFaker(cache_dir='').fake_valid_many(20)
+
+    assert len({item['name'] for item in data}) > 1
+    assert len({item['age'] for item in data}) > 1
+
+
+def test_invalid_data_do_not_modify_the_valid_data():
+    faker = UserFaker(seed=7, cache_dir='')
+    valid = faker.fake_valid()
+    invalid = [materialize(item.data) for item in faker.iter_invalid_data()]
+
+    assert generate(UserFaker(seed=7, cache_dir=''))[0] == valid
+    assert all(data != valid for data in invalid)
+
+
+def test_cache_round_trip(tmp_path):
+    cache_dir = str(tmp_path)
+    expected = generate(UserFaker(seed=7, cache_dir=''))
+
+    faker = UserFaker(seed=7, cache_dir=cache_dir)
+    assert generate(faker) == expected
+    assert os.path.exists(faker.get_cache_path())
+
+    cached = UserFaker(seed=7, cache_dir=cache_dir)
+    assert generate(cached) == expected
+    assert cached._cached_invalid_data is not None
+
+    # The type of a missing sub field of a dict is read back as an `InvalidDataType`.
+    missing = [item for item in cached._cached_invalid_data if item.whold_field == 'address.city']
+    assert any(isinstance(item.type, InvalidDataType) for item in missing)
+
+
+def test_cache_is_complete_when_iteration_stops_early(tmp_path):
+    cache_dir = str(tmp_path)
+    expected = generate(UserFaker(seed=7, cache_dir=''))
+
+    faker = UserFaker(seed=7, cache_dir=cache_dir)
+    faker.fake_valid()
+    next(faker.iter_invalid_data())
+
+    assert generate(UserFaker(seed=7, cache_dir=cache_dir)) == expected
+
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    expected = generate(UserFaker(seed=7, cache_dir=''))
+    path = UserFaker(seed=7, cache_dir=str(tmp_path)).get_cache_path()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"valid": ')
+
+    assert generate(UserFaker(seed=7, cache_dir=str(tmp_path))) == expected
+
+
+def test_cache_is_keyed_by_seed_and_schema(tmp_path):
+    cache_dir = str(tmp_path)
+
+    assert UserFaker(seed=7, cache_dir=cache_dir).get_cache_path() != UserFaker(seed=8, cache_dir=cache_dir).get_cache_path()
+    assert UserFaker(seed=7, cache_dir=cache_dir).get_schema_hash() != RandomUserFaker(seed=7, cache_dir=cache_dir).get_schema_hash()
+
+
+def test_empty_cache_dir_disables_the_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr('guard.settings.bases.app_settings.FAKER_CACHE_DIR', str(tmp_path))
+
+    assert UserFaker(seed=7).get_cache_path() is not None
+    faker = UserFaker(seed=7, cache_dir='')
+    generate(faker)
+    assert faker.get_cache_path() is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_random_strategy_is_seeded_by_the_faker():
+    first = generate(RandomUserFaker(seed=7, cache_dir=''))[1]
+
+    assert len(first) == 5
+    assert generate(RandomUserFaker(seed=7, cache_dir=''))[1] == first
+    assert generate(RandomUserFaker(seed=8, cache_dir=''))[1] != first
+    # The strategy declared on the class is left unseeded.
+    assert RandomUserFaker.Meta.invalid_strategy.seed is None
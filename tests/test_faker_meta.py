@@ -0,0 +1,64 @@
+from guard.faker.bases import Faker
+from guard.faker.enums import InvalidDataType, InvalidStrategyType
+from guard.faker.fields import BooleanField, CharField, IntegerField
+
+
+class BaseFaker(Faker):
+    name = CharField(required=True, allow_null=False)
+    age = IntegerField(min_value=0, max_value=150)
+
+
+class ActiveMixin(Faker):
+    active = BooleanField()
+
+
+class ChildFaker(BaseFaker):
+    age = IntegerField(min_value=18, max_value=65)
+    email = CharField()
+
+
+class GrandChildFaker(ChildFaker, ActiveMixin):
+    name = None
+
+    class Meta(ChildFaker.Meta):
+        invalid_strategy = InvalidStrategyType.N_WISE.value
+
+
+def test_fields_of_the_superclasses_are_merged():
+    assert list(ChildFaker._declared_fields) == ['name', 'age', 'email']
+    assert ChildFaker._declared_fields['name'] is BaseFaker._declared_fields['name']
+    # The field of the class replaces the one of its superclass.
+    assert ChildFaker._declared_fields['age'] is ChildFaker.__dict__['age']
+    assert ChildFaker._declared_fields['age'] is not BaseFaker._declared_fields['age']
+
+
+def test_fields_of_every_base_are_merged_and_none_removes_a_field():
+    assert list(GrandChildFaker._declared_fields) == ['active', 'age', 'email']
+    assert list(BaseFaker._declared_fields) == ['name', 'age']
+
+
+def test_schema_plan_is_built_once_per_class():
+    plan = BaseFaker(seed=1, cache_dir='').get_schema_plan()
+
+    assert BaseFaker(seed=2, cache_dir='').get_schema_plan() is plan
+    child_plan = ChildFaker(seed=1, cache_dir='').get_schema_plan()
+    assert child_plan is not plan
+    assert list(child_plan.fields) == ['name', 'age', 'email']
+    assert child_plan.schema_hash != plan.schema_hash
+
+
+def test_schema_plan_follows_the_meta_of_the_class():
+    plan = GrandChildFaker(seed=1, cache_dir='').get_schema_plan()
+
+    assert plan.invalid_strategy.strategy_type == InvalidStrategyType.N_WISE.value
+    assert ChildFaker(seed=1, cache_dir='').get_schema_plan().invalid_strategy.strategy_type == \
+        InvalidStrategyType.ONE_AT_A_TIME.value
+    # The rest of the `Meta` of the superclass is inherited.
+    assert GrandChildFaker(seed=1, cache_dir='').get_relation_constraints() == []
+
+
+def test_missing_required_values_are_planned_for_required_fields():
+    plan = BaseFaker(seed=1, cache_dir='').get_schema_plan()
+
+    assert plan.invalid_values['name'][0].type == InvalidDataType.MISSING_REQUIRE.value
+    assert all(planned.type != InvalidDataType.MISSING_REQUIRE.value for planned in plan.invalid_values['age'])
@@ -0,0 +1,69 @@
+from jsonpath_rw import parse
+
+from guard.utils import JsonPathCache, compile_json_path, get_value_from_json_path, json_path_cache
+
+
+def test_hits_and_misses():
+    cache = JsonPathCache(maxsize=10)
+
+    first = cache.compile('$.a')
+    assert cache.compile('$.a') is first
+    cache.compile('$.b')
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 2, 10, 2)
+
+
+def test_least_recently_used_is_evicted():
+    cache = JsonPathCache(maxsize=2)
+    first = cache.compile('$.a')
+    cache.compile('$.b')
+    # `$.a` is used again, `$.b` becomes the least recently used.
+    cache.compile('$.a')
+    cache.compile('$.c')
+
+    assert cache.cache_info().currsize == 2
+    assert cache.compile('$.a') is first
+    misses = cache.cache_info().misses
+    cache.compile('$.b')
+    assert cache.cache_info().misses == misses + 1
+
+
+def test_maxsize_defaults_to_the_setting(monkeypatch):
+    monkeypatch.setattr('guard.settings.bases.app_settings.JSON_PATH_CACHE_SIZE', 1)
+    cache = JsonPathCache()
+    cache.compile('$.a')
+    cache.compile('$.b')
+
+    assert cache.cache_info().currsize == 1
+
+
+def test_unbounded(monkeypatch):
+    monkeypatch.setattr('guard.settings.bases.app_settings.JSON_PATH_CACHE_SIZE', None)
+    cache = JsonPathCache()
+    for index in range(50):
+        cache.compile(f'$.a{index}')
+
+    assert cache.cache_info().currsize == 50
+
+
+def test_clear():
+    cache = JsonPathCache(maxsize=10)
+    cache.compile('$.a')
+    cache.clear()
+
+    assert cache.cache_info() == (0, 0, 10, 0)
+
+
+def test_compile_json_path_uses_the_process_wide_cache():
+    expression = compile_json_path('$.cached.path')
+
+    assert compile_json_path('$.cached.path') is expression
+    assert json_path_cache.compile('$.cached.path') is expression
+    compiled = parse('$.a')
+    assert compile_json_path(compiled) is compiled
+
+
+def test_get_value_from_json_path():
+    assert get_value_from_json_path({'a': {'b': [1, 2]}}, '$.a.b[1]') == 2
+    assert get_value_from_json_path({'a': 1}, '$.missing') is None
@@ -0,0 +1,64 @@
+from guard.bin.executor import CaseExecutor
+from guard.faker.bases import UseCaseFaker
+from guard.faker.fields import CharField, ChoiceField, IntegerField
+from guard.http.client import HttpClient
+from guard.usecase.hooks import clean_up
+from guard.usecase.suitus import LazyUseCaseSuite
+from guard.usecase.unit import UnitUseCase
+
+
+class ItemFaker(UseCaseFaker):
+    name = CharField(required=True, allow_null=False)
+    count = IntegerField(min_value=0, max_value=10)
+    kind = ChoiceField(choices=['a', 'b'])
+
+
+def make_suite(server, client):
+    suite = ItemFaker(seed=1, cache_dir='').fake_use_case(UnitUseCase('POST', f'{server.url}/items'))
+    suite.add_post_hook({
+        'func': clean_up,
+        'kwargs': {'client': client, 'get_pk_json_path': '$.id', 'url_template': f'{server.url}/items/{{pk}}'},
+    })
+    return suite
+
+
+def test_post_hooks_read_the_executed_cases(server):
+    client = HttpClient()
+    suite = make_suite(server, client)
+    assert isinstance(suite, LazyUseCaseSuite)
+
+    done = []
+    CaseExecutor(client, on_done=done.append).execute([suite])
+
+    assert done and all(case.response is not None for case in done)
+    assert [id(case) for case in suite.get_cases()] == [id(case) for case in done]
+    # The resource created by the valid case, the first one, is deleted.
+    assert server.deleted == ['/items/1']
+
+
+def test_post_hooks_with_workers(server):
+    client = HttpClient()
+    suite = make_suite(server, client)
+
+    CaseExecutor(client, workers=4).execute([suite])
+
+    posted = [path for method, path, _ in server.requests if method == 'POST']
+    assert len(suite.get_cases()) == len(posted)
+    assert len(server.deleted) == 1
+
+
+def test_suite_without_post_hooks_is_not_kept():
+    suite = LazyUseCaseSuite(lambda: (UnitUseCase('GET', f'http://127.0.0.1/{index}') for index in range(3)))
+
+    assert len(list(suite.iter_cases())) == 3
+    assert not suite.materialized
+
+
+def test_seeded_faker_generates_the_same_cases_on_every_pass(server):
+    suite = ItemFaker(seed=1, cache_dir='').fake_use_case(UnitUseCase('POST', f'{server.url}/items'))
+
+    first = [(case.name, dict(case.request.json or {})) for case in suite.iter_cases()]
+    second = [(case.name, dict(case.request.json or {})) for case in suite.iter_cases()]
+
+    assert len(first) > 1
+    assert first == second
@@ -0,0 +1,63 @@
+from types import MappingProxyType
+
+import pytest
+
+from guard.assertion.operator import extract_column, find_failed_indices
+
+
+def test_extract_column():
+    data = [{'id': 1}, {'id': 2}, {}]
+
+    assert list(extract_column(data, 'id')) == [1, 2, None]
+    assert list(extract_column(data, 'id', hook=lambda value, offset: (value or 0) + offset, offset=10)) == [11, 12, 10]
+
+
+def test_extract_column_from_mappings():
+    data = [MappingProxyType({'id': 1}), {'id': 2}]
+
+    assert list(extract_column(data, 'id')) == [1, 2]
+
+
+def test_extract_column_is_lazy():
+    def items():
+        yield {'id': 1}
+        raise AssertionError('read too far')
+
+    assert next(extract_column(items(), 'id')) == 1
+
+
+@pytest.mark.parametrize('operator_range, operator, expected, values, failed', [
+    ('all', '==', 1, [1, 1, 1], []),
+    ('all', '==', 1, [1, 2, 1, 3], [1, 3]),
+    ('all', '>', 0, [1, -1, 0], [1, 2]),
+    ('all', 'in', [1, 2], [1, 3], [1]),
+    ('any', '==', 3, [1, 2, 3], []),
+    ('any', '==', 4, [1, 2, 3], [0, 1, 2]),
+    ('all', '==', 1, [], []),
+])
+def test_find_failed_indices(operator_range, operator, expected, values, failed):
+    assert find_failed_indices(operator_range, operator, expected, values) == failed
+
+
+def test_find_failed_indices_limit_stops_reading():
+    read = []
+
+    def values():
+        for value in range(100):
+            read.append(value)
+            yield value
+
+    assert find_failed_indices('all', '<', 0, values(), limit=2) == [0, 1]
+    assert len(read) == 2
+
+
+def test_find_failed_indices_any_stops_at_the_first_passed_value():
+    values = iter([1, 2, 3, 4])
+
+    assert find_failed_indices('any', '==', 2, values) == []
+    assert list(values) == [3, 4]
+
+
+def test_find_failed_indices_rejects_unknown_operators():
+    with pytest.raises(AssertionError):
+        find_failed_indices('all', '~', 1, [1])
@@ -0,0 +1,91 @@
+import copy
+import json
+import pickle
+
+from guard.http.payload import JsonOverlay, materialize
+
+
+def make_base():
+    return {'name': 'guard', 'owner': {'id': 1, 'team': {'id': 2, 'tags': ['a']}}, 'items': [1, 2]}
+
+
+def test_materialize_does_not_mutate_the_base():
+    base = make_base()
+    snapshot = copy.deepcopy(base)
+    overlay = (
+        JsonOverlay(base)
+        .replace(('owner', 'team', 'id'), None)
+        .remove(('owner', 'id'))
+        .replace(('name',), 'other')
+        .remove(('items',))
+    )
+
+    assert overlay.materialize() == {'name': 'other', 'owner': {'team': {'id': None, 'tags': ['a']}}}
+    assert base == snapshot
+
+
+def test_unchanged_objects_are_shared():
+    base = make_base()
+    data = JsonOverlay(base).replace(('owner', 'team', 'id'), 3).materialize()
+
+    assert data['owner'] is not base['owner']
+    assert data['owner']['team'] is not base['owner']['team']
+    assert data['owner']['team']['tags'] is base['owner']['team']['tags']
+    assert data['items'] is base['items']
+
+
+def test_changes_under_the_same_parent_copy_it_once():
+    base = make_base()
+    data = JsonOverlay(base).replace(('owner', 'team', 'id'), 3).replace(('owner', 'team', 'name'), 'x').materialize()
+
+    assert data['owner']['team'] == {'id': 3, 'tags': ['a'], 'name': 'x'}
+
+
+def test_overlays_are_immutable():
+    overlay = JsonOverlay(make_base())
+    changed = overlay.replace(('name',), 'other')
+
+    assert overlay['name'] == 'guard'
+    assert changed['name'] == 'other'
+    assert changed.base is overlay.base
+
+
+def test_nested_overlays_are_built():
+    owner = JsonOverlay({'id': 1}).replace(('id',), 2)
+    overlay = JsonOverlay(make_base()).replace(('owner',), owner)
+
+    assert overlay.materialize()['owner'] == {'id': 2}
+    assert json.loads(json.dumps(materialize(overlay)))['owner'] == {'id': 2}
+
+
+def test_mapping_interface_builds_once():
+    overlay = JsonOverlay(make_base()).remove(('items',))
+
+    assert len(overlay) == 2
+    assert set(overlay) == {'name', 'owner'}
+    assert dict(overlay) == overlay.materialize()
+    assert overlay.materialize() is overlay.materialize()
+
+
+def test_dump_and_load_changes():
+    base = make_base()
+    overlay = JsonOverlay(base).replace(('owner', 'id'), JsonOverlay({'a': 1}).remove(('a',))).remove(('items',))
+
+    changes = json.loads(json.dumps(overlay.dump_changes()))
+    assert changes == [[['owner', 'id'], {}], [['items']]]
+    assert JsonOverlay.load_changes(base, changes).materialize() == overlay.materialize()
+
+
+def test_pickle():
+    overlay = JsonOverlay(make_base()).remove(('name',))
+
+    # Pickled before and after it is built.
+    assert pickle.loads(pickle.dumps(overlay)).materialize() == overlay.materialize()
+    assert pickle.loads(pickle.dumps(overlay)).materialize() == overlay.materialize()
+
+
+def test_materialize_other_values():
+    value = {'a': 1}
+
+    assert materialize(value) is value
+    assert materialize(None) is None
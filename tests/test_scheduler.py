@@ -0,0 +1,85 @@
+import pytest
+
+from guard.usecase.scheduler import CaseScheduler, iter_usecases
+from guard.usecase.suitus import LazyUseCaseSuite, UseCaseSuite
+from guard.usecase.unit import UnitUseCase
+
+
+def make_case(name, **kwargs):
+    return UnitUseCase('GET', f'http://127.0.0.1/{name}', name=name, **kwargs)
+
+
+def test_cycle_is_detected():
+    first = make_case('first')
+    second = make_case('second', depends_on=[first])
+    third = make_case('third', depends_on=[second])
+    first.add_dependency(third)
+
+    with pytest.raises(ValueError, match='Circular dependency between use cases'):
+        CaseScheduler([first, second, third])
+
+
+def test_cycle_through_suites_is_detected():
+    member = make_case('member')
+    other = make_case('other', depends_on=[member])
+    member.add_dependency(other)
+
+    with pytest.raises(ValueError):
+        CaseScheduler([UseCaseSuite([member]), UseCaseSuite([other])])
+
+
+def test_dependencies_inside_a_suite_are_not_a_cycle():
+    first = make_case('first')
+    second = make_case('second', depends_on=[first])
+
+    assert CaseScheduler([UseCaseSuite([first, second])]).graph == {0: set()}
+
+
+def test_self_dependency_is_ignored():
+    case = make_case('case')
+    case.add_dependency(case)
+
+    assert CaseScheduler([case]).graph == {0: set()}
+
+
+def test_static_order_keeps_the_original_order_of_ready_cases():
+    first = make_case('first')
+    second = make_case('second', depends_on=[first])
+    third = make_case('third')
+
+    assert CaseScheduler([second, first, third]).static_order() == [1, 2, 0]
+
+
+def test_dependency_on_a_suite_member_is_on_the_suite():
+    member = make_case('member')
+    dependent = make_case('dependent', depends_on=[member])
+
+    assert CaseScheduler([dependent, UseCaseSuite([member])]).graph == {0: {1}, 1: set()}
+
+
+def test_unscheduled_dependency_is_satisfied():
+    dependent = make_case('dependent', depends_on=[make_case('elsewhere')])
+
+    assert CaseScheduler([dependent]).graph == {0: set()}
+
+
+def test_get_ready_and_done():
+    first = make_case('first')
+    second = make_case('second', depends_on=[first])
+    scheduler = CaseScheduler([first, second])
+
+    scheduler.prepare()
+    assert scheduler.get_ready() == [0]
+    assert scheduler.get_ready() == []
+    scheduler.done(0)
+    assert scheduler.get_ready() == [1]
+    scheduler.done(1)
+    assert not scheduler.is_active()
+
+
+def test_iter_usecases_expands_lazy_suites_on_demand():
+    suite = LazyUseCaseSuite(lambda: [make_case('lazy')])
+
+    assert list(iter_usecases(suite)) == [suite]
+    assert [case.name for case in iter_usecases(suite, expand_lazy=True)][1:] == ['lazy']
+    assert not suite.materialized
@@ -0,0 +1,60 @@
+import pytest
+
+from guard.bin.runner import Runner
+from guard.usecase.unit import UnitUseCase
+
+
+def make_cases():
+    """
+    Cases with duplicate names, in several sources, some of them linked by `depends_on`.
+    """
+    cases, sources = [], {}
+    for source in ('a/test_users.yaml', 'b/test_users.yaml', 'test_items.py'):
+        for index in range(8):
+            case = UnitUseCase('GET', f'http://127.0.0.1/{index % 4}', name='list' if index % 2 else None)
+            cases.append(case)
+            sources[id(case)] = source
+    for index in range(0, len(cases) - 3, 5):
+        cases[index + 3].add_dependency(cases[index])
+    return cases, sources
+
+
+def shard(tmp_path, cases, sources, index, total):
+    runner = Runner(str(tmp_path))
+    runner.cases = list(cases)
+    runner.sources = dict(sources)
+    runner.select_shard(index, total)
+    return {id(case) for case in runner.cases}
+
+
+@pytest.mark.parametrize('total', [2, 3, 5])
+def test_split_does_not_depend_on_discovery_order(tmp_path, total):
+    cases, sources = make_cases()
+
+    splits = []
+    for ordered in (cases, cases[::-1], cases[1::2] + cases[::2]):
+        splits.append([shard(tmp_path, ordered, sources, index, total) for index in range(1, total + 1)])
+
+    assert splits[0] == splits[1] == splits[2]
+    selected = [case for shard_cases in splits[0] for case in shard_cases]
+    assert len(selected) == len(set(selected)) == len(cases)
+
+
+def test_dependencies_land_in_the_same_shard(tmp_path):
+    cases, sources = make_cases()
+
+    for index in range(1, 4):
+        selected = shard(tmp_path, cases, sources, index, 3)
+        for case in cases:
+            for dependency in case.depends_on:
+                assert (id(case) in selected) == (id(dependency) in selected)
+
+
+def test_shard_key_is_qualified_by_source_and_request(tmp_path):
+    runner = Runner(str(tmp_path))
+    first = UnitUseCase('GET', 'http://127.0.0.1/users', name='list')
+    second = UnitUseCase('POST', 'http://127.0.0.1/users', name='list')
+    runner.sources = {id(first): 'test_users.yaml', id(second): 'test_users.yaml'}
+
+    assert runner.get_shard_key(first) == 'test_users.yaml|list|GET http://127.0.0.1/users'
+    assert runner.get_shard_key(first) != runner.get_shard_key(second)
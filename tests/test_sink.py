@@ -0,0 +1,86 @@
+import json
+import xml.etree.ElementTree as ElementTree
+
+from guard.assertion.bases import AssertionFailure
+from guard.usecase.result import CaseResult
+from guard.usecase.sink import FailureFileSink, JsonLinesSink, JUnitXmlSink
+
+
+PASSED = CaseResult('list <users>', True, [], 'GET', 'http://127.0.0.1/users', None, None, 0.25, {'ttfb': 0.2})
+FAILED = CaseResult(
+    'create & "users"\x01',
+    False,
+    [AssertionFailure('AssertHttpStatusCodeEqual', None, 201, 400, 'invalid status code'), 'second reason'],
+    'POST',
+    'http://127.0.0.1/users',
+    {'name': None},
+    '{"error": "<name>"}',
+    0.5,
+)
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_json_lines(tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    with JsonLinesSink(path) as sink:
+        sink.add(PASSED)
+        # Every result is flushed as soon as it is added.
+        assert len(read_lines(path)) == 1
+        sink.add(FAILED)
+
+    passed, failed = read_lines(path)
+    assert passed['name'] == 'list <users>' and passed['passed'] and passed['timings'] == {'ttfb': 0.2}
+    assert failed['failed_reason'] == ['invalid status code', 'second reason']
+    assert failed['failures'] == [{
+        'assertion': 'AssertHttpStatusCodeEqual', 'json_path': None, 'expected': 201, 'actual': 400,
+        'message': 'invalid status code',
+    }]
+    assert failed['body'] == {'name': None}
+
+
+def test_failure_file_only_has_failures(tmp_path):
+    path = str(tmp_path / 'failures.jsonl')
+    with FailureFileSink(path) as sink:
+        sink.add(PASSED)
+        sink.add(FAILED)
+
+    assert [line['passed'] for line in read_lines(path)] == [False]
+
+
+def test_junit_xml(tmp_path):
+    path = str(tmp_path / 'results.xml')
+    sink = JUnitXmlSink(path, name='suite')
+    sink.add(PASSED)
+    sink.add(FAILED)
+    sink.close()
+    sink.close()
+
+    suite = ElementTree.parse(path).getroot().find('testsuite')
+    assert suite.get('name') == 'suite'
+    passed, failed = suite.findall('testcase')
+    assert passed.get('name') == 'list <users>'
+    assert passed.get('classname') == 'GET http://127.0.0.1/users'
+    assert passed.get('time') == '0.250000'
+    assert passed.find('failure') is None
+    assert passed.find('properties/property').attrib == {'name': 'timing.ttfb', 'value': '0.200000'}
+
+    # Characters XML does not allow are dropped.
+    assert failed.get('name') == 'create & "users"'
+    failure = failed.find('failure')
+    assert failure.get('message') == 'invalid status code'
+    assert failure.get('type') == 'AssertHttpStatusCodeEqual'
+    assert failure.text == 'invalid status code\nsecond reason'
+    assert failed.find('system-out').text == '{"error": "<name>"}'
+
+
+def test_junit_xml_with_string_reasons(tmp_path):
+    path = str(tmp_path / 'results.xml')
+    with JUnitXmlSink(path) as sink:
+        sink.add(FAILED._replace(failed_reason=['invalid status code']))
+
+    failure = ElementTree.parse(path).getroot().find('testsuite/testcase/failure')
+    assert failure.get('type') == 'AssertionError'
@@ -0,0 +1,90 @@
+import math
+import random
+import time
+
+import pytest
+
+from guard.stats import LatencyHistogram, PhaseTimer
+
+
+def exact_percentile(durations, percent):
+    ordered = sorted(durations)
+    return ordered[max(1, math.ceil(len(ordered) * percent / 100)) - 1]
+
+
+@pytest.mark.parametrize('percent', [1, 50, 90, 99, 99.9, 100])
+def test_percentiles_within_precision(percent):
+    rng = random.Random(1)
+    durations = [rng.lognormvariate(-4, 1.5) for _ in range(10000)]
+    histogram = LatencyHistogram(precision=0.01)
+    histogram.extend(durations)
+
+    expected = exact_percentile(durations, percent)
+    assert histogram.percentile(percent) == pytest.approx(expected, rel=0.01)
+
+
+def test_empty():
+    histogram = LatencyHistogram()
+
+    assert histogram.percentile(50) is None
+    assert histogram.mean is None
+    assert len(histogram) == 0
+
+
+def test_record_with_count():
+    histogram = LatencyHistogram()
+    histogram.record(0.1, count=3)
+    histogram.record(0.3)
+
+    assert len(histogram) == 4
+    assert histogram.mean == pytest.approx(0.15)
+    assert (histogram.min, histogram.max) == (0.1, 0.3)
+    assert histogram.percentile(75) == pytest.approx(0.1, rel=0.01)
+    assert histogram.percentile(100) == pytest.approx(0.3, rel=0.01)
+
+
+def test_percentiles_are_clamped_to_the_recorded_range():
+    histogram = LatencyHistogram()
+    # Durations shorter than a microsecond all fall in the first bucket.
+    histogram.record(0.0)
+    histogram.record(1e-9)
+
+    assert 0.0 <= histogram.percentile(50) <= 1e-9
+    assert histogram.percentile(100) == 1e-9
+
+
+def test_merge_is_the_histogram_of_all_the_durations():
+    rng = random.Random(2)
+    durations = [rng.uniform(0.001, 2) for _ in range(3000)]
+    whole = LatencyHistogram()
+    whole.extend(durations)
+    parts = [LatencyHistogram() for _ in range(3)]
+    for index, duration in enumerate(durations):
+        parts[index % 3].record(duration)
+
+    merged = LatencyHistogram()
+    for part in parts:
+        merged.merge(part)
+    merged.merge(LatencyHistogram())
+
+    assert merged.buckets == whole.buckets
+    assert (merged.count, merged.min, merged.max) == (whole.count, whole.min, whole.max)
+    assert merged.total == pytest.approx(whole.total)
+    for percent in (50, 95, 99):
+        assert merged.percentile(percent) == whole.percentile(percent)
+
+
+def test_merge_requires_the_same_precision():
+    with pytest.raises(AssertionError):
+        LatencyHistogram(0.01).merge(LatencyHistogram(0.001))
+
+
+def test_phase_timer():
+    timer = PhaseTimer()
+    time.sleep(0.01)
+    timer.lap('first')
+    timer.lap('second')
+
+    assert list(timer.timings) == ['first', 'second']
+    assert timer.timings['first'] >= 0.01
+    assert timer.elapsed == pytest.approx(sum(timer.timings.values()))
@@ -0,0 +1,105 @@
+import itertools
+import random
+
+import pytest
+
+# `guard.faker` can only be imported once `guard.usecase` is.
+import guard.usecase  # noqa: F401
+from guard.faker.strategies import InvalidStrategy, Mutation, NWiseStrategy, OneAtATimeStrategy, RandomStrategy
+
+
+def make_mutations(sizes):
+    """
+    The mutations of fields `f0`, `f1`, ..., field `fi` having `sizes[i]` of them.
+    """
+    return {
+        f'f{index}': [Mutation(f'f{index}', f'f{index}', f'type{value}', value, False) for value in range(size)]
+        for index, size in enumerate(sizes)
+    }
+
+
+def random_sizes(rng, count):
+    return [rng.randint(1, 4) for _ in range(count)]
+
+
+def to_rows(combinations):
+    rows = []
+    for combination in combinations:
+        row = {mutation.field_name: mutation.value for mutation in combination}
+        assert len(row) == len(combination), 'a combination mutates a field twice'
+        rows.append(row)
+    return rows
+
+
+def assert_covering(rows, mutations, n):
+    for fields in itertools.combinations(mutations, n):
+        for values in itertools.product(*(range(len(mutations[field])) for field in fields)):
+            assert any(
+                all(row.get(field) == value for field, value in zip(fields, values))
+                for row in rows
+            ), f'{dict(zip(fields, values))} is not covered'
+
+
+@pytest.mark.parametrize('n', [2, 3])
+@pytest.mark.parametrize('seed', range(5))
+def test_n_wise_covers_every_combination(n, seed):
+    rng = random.Random(seed)
+    mutations = make_mutations(random_sizes(rng, rng.randint(n, 6)))
+    rows = to_rows(NWiseStrategy(n=n).combine(mutations))
+
+    assert_covering(rows, mutations, n)
+    # Never more cases than the cross product.
+    assert len(rows) <= len(list(itertools.product(*mutations.values())))
+
+
+def test_n_wise_skips_fields_without_mutations():
+    mutations = make_mutations([2, 0, 3])
+    rows = to_rows(NWiseStrategy(n=2).combine(mutations))
+
+    assert all('f1' not in row for row in rows)
+    assert_covering(rows, {'f0': mutations['f0'], 'f2': mutations['f2']}, 2)
+
+
+def test_n_wise_with_fewer_fields_than_n_is_one_at_a_time():
+    mutations = make_mutations([3])
+
+    assert list(NWiseStrategy(n=3).combine(mutations)) == list(OneAtATimeStrategy().combine(mutations))
+
+
+def test_random_respects_budget_and_max_fields():
+    mutations = make_mutations([3, 3, 3, 3])
+    combinations = list(RandomStrategy(budget=20, seed=1, max_fields=2).combine(mutations))
+    rows = to_rows(combinations)
+
+    assert len(rows) == 20
+    assert all(1 <= len(row) <= 2 for row in rows)
+    assert len({tuple(sorted(row.items())) for row in rows}) == len(rows)
+
+
+def test_random_stops_when_combinations_run_out():
+    mutations = make_mutations([1, 1])
+    rows = to_rows(RandomStrategy(budget=100, seed=1).combine(mutations))
+
+    # {f0}, {f1} and {f0, f1}.
+    assert len(rows) == 3
+
+
+def test_random_is_reproducible_with_a_seed():
+    mutations = make_mutations([2, 3, 4])
+
+    assert list(RandomStrategy(seed=7).combine(mutations)) == list(RandomStrategy(seed=7).combine(mutations))
+    assert list(RandomStrategy(seed=7).combine(mutations)) != list(RandomStrategy(seed=8).combine(mutations))
+
+
+def test_random_with_seed_keeps_its_own_seed():
+    strategy = RandomStrategy(seed=1)
+
+    assert strategy.with_seed(2) is strategy
+    assert RandomStrategy().with_seed(2).seed == 2
+    assert OneAtATimeStrategy().with_seed(2).strategy_type == OneAtATimeStrategy.strategy_type
+
+
+def test_get_strategy_by_type():
+    assert isinstance(InvalidStrategy.get_strategy('n_wise', n=3), NWiseStrategy)
+    with pytest.raises(ValueError):
+        InvalidStrategy.get_strategy('unknown')
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+import requests
+
+from guard.assertion.stream import JsonStreamReader, open_stream, parse_stream_path
+
+
+DOCUMENT = {
+    'meta': {'next': 'a "quoted" \\ value ]}', 'pages': [1, [2, {'3': '}'}]], 'ok': True},
+    'count': -3e2,
+    'data': {
+        'skipped': None,
+        'items': [
+            {'id': 1, 'name': 'café ☃', 'tags': ['a,b', '[c]']},
+            -12.5e-3,
+            'esc\\aped \\"',
+            [],
+            {},
+            None,
+            False,
+            123456789012345678901234567890,
+        ],
+        'after': [1, 2, 3],
+    },
+}
+
+
+def chunked(data: bytes, size: int):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_items_across_every_chunk_boundary(indent):
+    data = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False).encode('utf-8')
+
+    for size in range(1, 40):
+        reader = JsonStreamReader(chunked(data, size))
+        assert list(reader.iter_items(['data', 'items'])) == DOCUMENT['data']['items'], size
+        assert reader.count == len(DOCUMENT['data']['items'])
+
+
+def test_top_level_list():
+    reader = JsonStreamReader(chunked(b' [1, {"a": [2]} , "x"] ', 3))
+
+    assert list(reader.iter_items([])) == [1, {'a': [2]}, 'x']
+
+
+@pytest.mark.parametrize('document, keys', [
+    ({'data': {'other': [1]}}, ['data', 'items']),
+    ({'data': {'items': 'not a list'}}, ['data', 'items']),
+    ({'data': []}, ['data']),
+    ([1, 2], ['data']),
+])
+def test_nothing_is_yielded_without_items(document, keys):
+    reader = JsonStreamReader([json.dumps(document).encode()])
+
+    assert list(reader.iter_items(keys)) == []
+
+
+def test_truncated_document_raises():
+    reader = JsonStreamReader(chunked(b'{"items": [{"id": 1}, {"id": ', 4))
+
+    with pytest.raises(json.JSONDecodeError):
+        list(reader.iter_items(['items']))
+
+
+def test_items_are_yielded_before_the_document_is_read():
+    def chunks():
+        yield b'{"items": [1, 2'
+        yield b', 3'
+        raise AssertionError('read too far')
+
+    items = JsonStreamReader(chunks()).iter_items(['items'])
+
+    assert next(items) == 1
+
+
+def test_encoding():
+    data = json.dumps({'items': ['éè']}, ensure_ascii=False).encode('latin-1')
+
+    assert list(JsonStreamReader(chunked(data, 1), 'latin-1').iter_items(['items'])) == ['éè']
+
+
+def test_parse_stream_path():
+    assert parse_stream_path('$') == []
+    assert parse_stream_path('$.results') == ['results']
+    assert parse_stream_path('$.data.items[*]') == ['data', 'items']
+    with pytest.raises(ValueError):
+        parse_stream_path('$.items[0]')
+
+
+def test_buffered_body_is_read_as_many_times_as_needed():
+    response = requests.models.Response()
+    response._content = b'{"items": [1, 2]}'
+    response._content_consumed = True
+    response.encoding = 'utf-8'
+
+    for _ in range(2):
+        with open_stream(response) as reader:
+            assert list(reader.iter_items(['items'])) == [1, 2]
@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from guard.http.token_store import TokenEntry, TokenStore
+from guard.utils import atomic_write_json, file_lock
+
+
+AUTHENTICATION = {'Authorization': 'Bearer token'}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'token_cache.json')
+
+
+def test_get_from_memory_then_file(path):
+    key = TokenStore.make_key('http://127.0.0.1/token', {'username': 'guard'})
+    TokenStore(ttl=60).set(key, path, TokenEntry(AUTHENTICATION, None, time.time()))
+
+    # A new store, e.g. in another process, reads the file.
+    entry = TokenStore(ttl=60).get(key, path)
+    assert entry.authentication == AUTHENTICATION
+    assert json.load(open(path))[key]['authentication'] == AUTHENTICATION
+
+
+def test_entries_older_than_ttl_are_ignored(path):
+    store = TokenStore(ttl=60)
+    store.set('old', path, TokenEntry(AUTHENTICATION, None, time.time() - 120))
+    store.set('new', path, TokenEntry(AUTHENTICATION, None, time.time()))
+
+    assert store.get('old', path) is None
+    assert store.get('new', path) is not None
+    # Invalid entries are dropped from the file when it is written.
+    store.set('other', path, TokenEntry(AUTHENTICATION, None, time.time()))
+    assert set(json.load(open(path))) == {'new', 'other'}
+
+
+def test_ttl_none_reuses_tokens_forever(path, monkeypatch):
+    monkeypatch.setattr('guard.settings.bases.app_settings.TOKEN_CACHE_TTL', None)
+    store = TokenStore()
+    store.set('key', path, TokenEntry(AUTHENTICATION, None, 0))
+
+    assert store.get('key', path) is not None
+
+
+def test_expiry_wins_over_ttl(path):
+    store = TokenStore(ttl=3600)
+    store.set('key', path, TokenEntry(AUTHENTICATION, time.time() + 1, time.time()))
+
+    # The token expires within the leeway.
+    assert store.get('key', path) is None
+
+
+def test_invalidate_only_drops_the_rejected_token(path):
+    store = TokenStore(ttl=60)
+    store.set('key', path, TokenEntry(AUTHENTICATION, None, time.time()))
+
+    store.invalidate('key', path, {'Authorization': 'Bearer other'})
+    assert store.get('key', path) is not None
+    store.invalidate('key', path, AUTHENTICATION)
+    assert store.get('key', path) is None
+
+
+def test_keys_hash_the_credentials():
+    key = TokenStore.make_key('http://127.0.0.1/token', {'password': 'secret'})
+
+    assert 'secret' not in key
+    assert key == TokenStore.make_key('http://127.0.0.1/token', {'password': 'secret'})
+    assert key != TokenStore.make_key('http://127.0.0.1/token', {'password': 'other'})
+
+
+def test_atomic_write_json_replaces_the_file(path):
+    atomic_write_json(path, {'a': 1})
+    atomic_write_json(path, {'b': 2})
+
+    assert json.load(open(path)) == {'b': 2}
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.startswith('.tmp-')]
+
+
+def test_atomic_write_json_keeps_the_file_on_error(path):
+    atomic_write_json(path, {'a': 1})
+
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {'a': object()})
+    assert json.load(open(path)) == {'a': 1}
+
+
+def test_file_lock_is_exclusive(path):
+    pytest.importorskip('fcntl')
+    events = []
+
+    def hold():
+        with file_lock(path):
+            events.append('second')
+
+    with file_lock(path):
+        thread = threading.Thread(target=hold)
+        thread.start()
+        thread.join(0.2)
+        events.append('first')
+        assert thread.is_alive()
+    thread.join()
+
+    assert events == ['first', 'second']